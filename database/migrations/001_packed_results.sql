@@ -0,0 +1,16 @@
+-- Results stored as packed float64 columns next to the JSON written before.
+-- schema.sql already contains these columns, apply this to databases created earlier:
+--   psql -h <host> -U <user> -d <database> -f database/migrations/001_packed_results.sql
+
+BEGIN;
+
+ALTER TABLE results ALTER COLUMN data DROP NOT NULL;
+
+ALTER TABLE results
+    ADD COLUMN IF NOT EXISTS encoding TEXT,
+    ADD COLUMN IF NOT EXISTS dimension INT,
+    ADD COLUMN IF NOT EXISTS solution BYTEA,
+    ADD COLUMN IF NOT EXISTS x_values BYTEA,
+    ADD COLUMN IF NOT EXISTS y_values BYTEA;
+
+COMMIT;
@@ -18,6 +18,11 @@ CREATE TABLE applications (
 CREATE TABLE results (
     id SERIAL PRIMARY KEY,
     application_id INT NOT NULL REFERENCES applications(id) ON DELETE CASCADE,
-    data JSONB NOT NULL,
+    data JSONB,
+    encoding TEXT,
+    dimension INT,
+    solution BYTEA,
+    x_values BYTEA,
+    y_values BYTEA,
     created_at TIMESTAMP NOT NULL DEFAULT NOW()
 );
\ No newline at end of file
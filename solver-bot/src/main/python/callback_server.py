@@ -0,0 +1,98 @@
+import hmac
+import os
+
+from aiohttp import web
+from logger import logger
+
+CALLBACK_HOST = "0.0.0.0"
+CALLBACK_PATH = "/api/callbacks/applications/{application_id}/status"
+CALLBACK_STATUSES = ("completed", "error")
+
+
+class CallbackServer:
+    """
+    Receives completion notifications pushed by the solver service
+    and hands them over to the completion watcher.
+    Requests must carry the shared secret, without one every request
+    is rejected.
+    """
+
+    def __init__(self, watcher, port, host=CALLBACK_HOST, secret=""):
+        self.watcher = watcher
+        self.port = port
+        self.host = host
+        self.secret = secret
+
+        self._runner = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post(CALLBACK_PATH, self._handle_status)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+        logger.info("Callback server listening on %s:%s", self.host, self.port)
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_status(self, request):
+        if not self.secret or not hmac.compare_digest(
+            request.headers.get("X-Callback-Secret", ""), self.secret
+        ):
+            raise web.HTTPForbidden()
+
+        try:
+            application_id = int(request.match_info["application_id"])
+            payload = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest()
+
+        status = payload.get("status") if isinstance(payload, dict) else None
+        if status not in CALLBACK_STATUSES:
+            raise web.HTTPBadRequest()
+
+        logger.info("Application %s reported status %s", application_id, status)
+        self.watcher.resolve(application_id, status)
+
+        return web.Response(status=204)
+
+
+server = None
+
+
+async def start_callback_server(watcher):
+    global server
+
+    port = os.getenv("CALLBACK_PORT")
+    if not port:
+        return False
+
+    secret = os.getenv("CALLBACK_SECRET", "")
+    if not secret:
+        logger.error("CALLBACK_SECRET is not set, not starting callback server")
+        return False
+
+    server = CallbackServer(watcher, int(port), secret=secret)
+    try:
+        await server.start()
+    except OSError as e:
+        logger.error("Failed to start callback server: %s", e)
+        server = None
+        return False
+
+    return True
+
+
+async def stop_callback_server():
+    global server
+
+    if server is None:
+        return
+
+    await server.stop()
+    server = None
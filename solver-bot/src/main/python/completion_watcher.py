@@ -0,0 +1,162 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+
+from logger import logger
+from spring_client import get_application_statuses
+
+POLL_INTERVAL = 1
+FALLBACK_POLL_INTERVAL = 10
+WATCH_TIMEOUT = 600
+MAX_BATCH_SIZE = 1000
+MAX_UNCLAIMED = 1000
+
+
+class CompletionWatcher:
+    """
+    Tracks every in-flight application and polls their statuses
+    in one batched request per tick, resolving the future of each
+    application once it reaches "completed" or "error".
+    The latest progress reported for applications being solved is kept
+    until they are resolved.
+    """
+
+    def __init__(self, poll_interval=POLL_INTERVAL, timeout=WATCH_TIMEOUT):
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+        self._pending = {}
+        self._progress = {}
+        self._unclaimed = OrderedDict()
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for future, _ in self._pending.values():
+            if not future.done():
+                future.set_result(False)
+        self._pending.clear()
+        self._progress.clear()
+
+    async def wait(self, application_id):
+        if application_id in self._unclaimed:
+            return self._unclaimed.pop(application_id) == "completed"
+
+        if application_id not in self._pending:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[application_id] = (future, time.monotonic() + self.timeout)
+            self._wakeup.set()
+
+        future, _ = self._pending[application_id]
+        return await asyncio.shield(future)
+
+    def resolve(self, application_id, status):
+        if status not in ("completed", "error"):
+            return
+
+        entry = self._pending.pop(application_id, None)
+        self._progress.pop(application_id, None)
+        if entry is None:
+            # A notification may arrive before anyone started waiting
+            self._unclaimed[application_id] = status
+            while len(self._unclaimed) > MAX_UNCLAIMED:
+                self._unclaimed.popitem(last=False)
+            return
+
+        future, _ = entry
+        if not future.done():
+            future.set_result(status == "completed")
+
+    def progress(self, application_id):
+        return self._progress.get(application_id)
+
+    def pending_count(self):
+        return len(self._pending)
+
+    async def _run(self):
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            try:
+                await self._poll()
+            except Exception as e:
+                logger.warning("Error while polling application statuses: %s", e)
+
+            await asyncio.sleep(self.poll_interval)
+
+    async def _poll(self):
+        now = time.monotonic()
+        for application_id, (_, deadline) in list(self._pending.items()):
+            if now > deadline:
+                logger.warning("Timed out waiting for application %s", application_id)
+                self.resolve(application_id, "error")
+
+        application_ids = list(self._pending)
+        for i in range(0, len(application_ids), MAX_BATCH_SIZE):
+            batch = application_ids[i : i + MAX_BATCH_SIZE]
+            statuses = await get_application_statuses(batch)
+
+            found = set()
+            for entry in statuses:
+                application_id = entry.get("id")
+                found.add(application_id)
+                if entry.get("progress") and application_id in self._pending:
+                    self._progress[application_id] = entry["progress"]
+                self.resolve(application_id, entry.get("status"))
+
+            for application_id in batch:
+                if application_id not in found:
+                    logger.warning("Application %s not found", application_id)
+                    self.resolve(application_id, "error")
+
+
+watcher = None
+
+
+def init_watcher(push_enabled=False):
+    global watcher
+
+    default_interval = FALLBACK_POLL_INTERVAL if push_enabled else POLL_INTERVAL
+
+    if watcher is None:
+        watcher = CompletionWatcher(
+            poll_interval=float(os.getenv("WATCHER_POLL_INTERVAL", default_interval)),
+            timeout=float(os.getenv("WATCHER_TIMEOUT", WATCH_TIMEOUT)),
+        )
+
+    watcher.start()
+    return watcher
+
+
+async def close_watcher():
+    global watcher
+
+    if watcher is None:
+        return
+
+    await watcher.stop()
+    watcher = None
+
+
+async def wait_for_application_completion(application_id):
+    return await (watcher or init_watcher()).wait(application_id)
+
+
+def application_progress(application_id):
+    return watcher.progress(application_id) if watcher is not None else None
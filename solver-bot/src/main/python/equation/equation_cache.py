@@ -0,0 +1,78 @@
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+PY_DIR = Path(__file__).parent
+corpus_path = PY_DIR / "corpus.txt"
+
+CACHE_SIZE = 1024
+
+
+class EquationCache:
+    """
+    LRU cache of formatted equations keyed by the normalized user input.
+    Failed parses are cached as well, so a repeated invalid equation
+    does not go through SymPy again.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key not in self._entries:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._entries[key]
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+
+equation_cache = EquationCache()
+
+
+def init_equation_cache():
+    global equation_cache
+
+    equation_cache = EquationCache(int(os.getenv("EQUATION_CACHE_SIZE", CACHE_SIZE)))
+    return equation_cache
+
+
+def get_equation_cache():
+    return equation_cache
+
+
+def load_corpus(path=corpus_path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def equation_cache_stats():
+    return equation_cache.stats()
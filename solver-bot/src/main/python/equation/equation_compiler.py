@@ -0,0 +1,144 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+from sympy.core.function import AppliedUndef
+
+PREFLIGHT_POINTS = 64
+
+# Functions and constants named the way the solver service evaluates them
+EQUATION_LOCALS = {
+    "e": sp.E,
+    "pi": sp.pi,
+    "log10": lambda arg: sp.log(arg, 10),
+    "log2": lambda arg: sp.log(arg, 2),
+    "abs": sp.Abs,
+}
+
+
+@lru_cache(maxsize=256)
+def compile_equation(formatted_equation, order):
+    """
+    Compiles the right-hand side produced by format_equation
+    into a NumPy function f(x, y) where y holds y[0]..y[order - 1].
+    Returns None if the expression can not be compiled.
+    """
+    x = sp.Symbol("x")
+    y_vars = sp.symbols(f"y_0:{order}")
+    expression = re.sub(r"y\[(\d+)\]", r"y_\1", formatted_equation).replace("^", "**")
+
+    try:
+        rhs = sp.sympify(
+            expression,
+            locals={"x": x, **EQUATION_LOCALS, **{str(v): v for v in y_vars}},
+        )
+    except (sp.SympifyError, TypeError, ValueError, SyntaxError):
+        return None
+
+    if rhs.atoms(AppliedUndef) or not rhs.free_symbols <= {x, *y_vars}:
+        return None
+
+    return sp.lambdify((x, y_vars), rhs, modules="numpy")
+
+
+def evaluate_equation(function, x_values, y_values):
+    """
+    Evaluates a compiled equation on arrays of points
+    and raises FloatingPointError on division by zero
+    or on values outside of the domain.
+    """
+    with np.errstate(divide="raise", invalid="raise", over="ignore"):
+        values = np.broadcast_to(function(x_values, y_values), x_values.shape)
+
+    if np.isnan(values).any():
+        raise FloatingPointError("Result is NaN")
+
+    return values
+
+
+def find_singular_point(
+    formatted_equation,
+    order,
+    initial_x,
+    initial_y,
+    reach_point,
+    points=PREFLIGHT_POINTS,
+):
+    """
+    Checks the equation before it is sent to the solver service.
+    It is evaluated at the initial point, for every set of initial values
+    of an ensemble, and, if it does not depend on y,
+    on a sparse grid up to the reach point.
+    Returns the first x where it can not be evaluated, otherwise None.
+    """
+    function = compile_equation(formatted_equation, int(order))
+    if function is None:
+        return None
+
+    initial_x = float(initial_x)
+    initial_y = np.atleast_2d(np.asarray(initial_y, dtype=float))
+
+    if "y[" in formatted_equation:
+        x_values = np.full(len(initial_y), initial_x)
+        y_values = list(initial_y.T)
+    else:
+        x_values = np.linspace(initial_x, float(reach_point), points)
+        y_values = [np.full_like(x_values, value) for value in initial_y[0]]
+
+    return find_first_failure(function, x_values, y_values)
+
+
+def find_suspect_point(
+    formatted_equation,
+    order,
+    initial_x,
+    initial_y,
+    reach_point,
+    points=PREFLIGHT_POINTS,
+):
+    """
+    Checks an equation that depends on y on the same grid as find_singular_point,
+    with y fixed at every set of initial values.
+    The solution moves away from them, so a failure is only a warning
+    that the equation may not be defined at that x.
+    Returns the first such x, otherwise None.
+    """
+    if "y[" not in formatted_equation:
+        return None
+
+    function = compile_equation(formatted_equation, int(order))
+    if function is None:
+        return None
+
+    initial_y = np.atleast_2d(np.asarray(initial_y, dtype=float))
+    grid = np.linspace(float(initial_x), float(reach_point), points)
+
+    # Sorted by x, so the first failure is the closest to the initial point
+    x_values = np.repeat(grid, len(initial_y))
+    y_values = [np.tile(values, points) for values in initial_y.T]
+
+    return find_first_failure(function, x_values, y_values)
+
+
+def find_first_failure(function, x_values, y_values):
+    """
+    Returns the first x where the compiled equation can not be evaluated,
+    otherwise None. The points are only evaluated one by one
+    if evaluating all of them at once fails.
+    """
+    try:
+        evaluate_equation(function, x_values, y_values)
+        return None
+    except (FloatingPointError, ZeroDivisionError):
+        pass
+
+    for i, x in enumerate(x_values):
+        try:
+            evaluate_equation(
+                function, x_values[i : i + 1], [y[i : i + 1] for y in y_values]
+            )
+        except (FloatingPointError, ZeroDivisionError):
+            return float(x)
+
+    return None
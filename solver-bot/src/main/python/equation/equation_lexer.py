@@ -0,0 +1,73 @@
+import re
+from collections import namedtuple
+
+NUMBER = "number"
+NAME = "name"
+DERIVATIVE = "derivative"
+LPAREN = "lparen"
+RPAREN = "rparen"
+EQUALS = "equals"
+OPERATOR = "operator"
+UNKNOWN = "unknown"
+
+TOKEN_PATTERN = re.compile(
+    rf"""
+    \s*(?:
+        (?P<{DERIVATIVE}>[yY](?:\s*\^\s*\(\s*\d+\s*\)|(?:\s*['`’])+))
+        |(?P<{NUMBER}>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+        |(?P<{NAME}>[a-zA-Z_]\w*)
+        |(?P<{LPAREN}>\()
+        |(?P<{RPAREN}>\))
+        |(?P<{EQUALS}>=)
+        |(?P<{OPERATOR}>\*\*|[-+*/^,])
+        |(?P<{UNKNOWN}>\S)
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+class Token(namedtuple("Token", "kind text position")):
+    """
+    A single lexeme of an equation and its offset in the source string.
+    """
+
+    __slots__ = ()
+
+    @property
+    def end(self):
+        return self.position + len(self.text)
+
+    @property
+    def derivative_order(self):
+        if "(" in self.text:
+            return int(re.search(r"\d+", self.text).group())
+        return len(re.findall(r"['`’]", self.text))
+
+
+def tokenize(equation):
+    """
+    Splits an equation into tokens in a single pass.
+    Derivatives written as y', y'' or y^(n) are kept as one token,
+    characters the lexer does not know are returned as unknown tokens.
+    """
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(equation):
+        kind = match.lastgroup
+        if kind is not None:
+            tokens.append(Token(kind, match.group(kind), match.start(kind)))
+    return tokens
+
+
+def find_closing_parenthesis(tokens, start, stop=None):
+    stop = len(tokens) if stop is None else stop
+
+    depth = 0
+    for i in range(start, stop):
+        if tokens[i].kind == LPAREN:
+            depth += 1
+        elif tokens[i].kind == RPAREN:
+            depth -= 1
+            if depth == 0:
+                return i
+    return None
@@ -1,6 +1,6 @@
-import re
 import sympy as sp
 
+from equation.equation_lexer import DERIVATIVE, EQUALS, tokenize
 from equation.function_replacer import replace_math_functions
 
 
@@ -12,6 +12,34 @@ def get_equation_order(eq):
     return max(d.derivative_count for d in derivatives)
 
 
+def solve_for_derivative(eq, derivative):
+    """
+    Isolates the derivative from the equation.
+    Equations linear in it, with a coefficient that does not vanish,
+    are solved directly as -(rest) / coefficient,
+    everything else falls back to sp.solve.
+    Higher derivatives, which can only appear on the right-hand side,
+    would be rewritten by the substitution as well,
+    so equations containing them also take the general path.
+    """
+    expr = eq.lhs - eq.rhs
+    if any(
+        d.derivative_count > derivative.derivative_count
+        for d in expr.atoms(sp.Derivative)
+    ):
+        return sp.solve(eq, derivative)[0]
+
+    coefficient = expr.diff(derivative)
+
+    if coefficient.diff(derivative) == 0 and coefficient.expand() != 0:
+        rest = expr.subs(derivative, 0)
+        if coefficient.is_number:
+            return -rest / coefficient
+        return sp.cancel(-rest / coefficient)
+
+    return sp.solve(eq, derivative)[0]
+
+
 def convert_to_first_order(eq, y, x):
     order = get_equation_order(eq)
     if order == 0:
@@ -22,26 +50,48 @@ def convert_to_first_order(eq, y, x):
     subs_dict[y] = y_vars[0]
 
     last_derivative = y.diff(x, order)
-    last_eq = sp.solve(eq, last_derivative)[0].subs(subs_dict)
+    last_eq = solve_for_derivative(eq, last_derivative).subs(subs_dict)
     last_equation = sp.Eq(sp.Symbol(f"y[{order - 1}]").diff(x), last_eq)
 
     return last_equation, order
 
 
-def parse_equation(eq):
+def normalize_equation(eq):
+    return eq.lower().replace(" ", "").replace("`", "'").replace("’", "'")
+
+
+def rewrite_derivatives(tokens):
+    """
+    Joins the tokens back into a SymPy expression,
+    replacing every derivative token with Derivative(y, x, n).
+    """
+    parts = []
+    for token in tokens:
+        if token.kind == DERIVATIVE:
+            parts.append(f"Derivative(y, x, {token.derivative_order})")
+        else:
+            parts.append(token.text.lower())
+    return "".join(parts)
+
+
+def parse_equation(eq, tokens=None):
     x = sp.Symbol("x")
     y = sp.Function("y")(x)
 
-    eq = eq.replace(" ", "").replace("`", "'").replace("’", "'")
-    eq = re.sub(r"y\^\((\d+)\)", lambda m: "y" + "'" * int(m.group(1)), eq)
-    eq = re.sub(r"y'{3,}", lambda m: f"Derivative(y, x, {len(m.group(0)) - 1})", eq)
-    eq = re.sub(r"y''", "Derivative(y, x, 2)", eq)
-    eq = re.sub(r"y'", "Derivative(y, x)", eq)
+    if tokens is None:
+        tokens = tokenize(eq)
+
+    sides = [[]]
+    for token in tokens:
+        if token.kind == EQUALS:
+            sides.append([])
+        else:
+            sides[-1].append(token)
 
-    if "=" in eq:
-        lhs_str, rhs_str = eq.split("=")
+    if len(sides) == 1:
+        lhs_str, rhs_str = rewrite_derivatives(sides[0]), "0"
     else:
-        lhs_str, rhs_str = eq, "0"
+        lhs_str, rhs_str = map(rewrite_derivatives, sides)
 
     lhs_expr = sp.sympify(lhs_str, locals={"y": y, "x": x, "Derivative": sp.Derivative})
     rhs_expr = sp.sympify(rhs_str, locals={"y": y, "x": x})
@@ -49,9 +99,9 @@ def parse_equation(eq):
     return sp.Eq(lhs_expr, rhs_expr), y, x
 
 
-def format_equation(eq):
+def format_equation(eq, tokens=None):
     try:
-        equation, y, x = parse_equation(eq.lower())
+        equation, y, x = parse_equation(eq, tokens)
         last_equation, order = convert_to_first_order(equation, y, x)
         rhs_str = str(last_equation.rhs).replace("**", "^")
         rhs_str = replace_math_functions(rhs_str)
@@ -0,0 +1,98 @@
+"""
+Benchmark of isolating the highest derivative in convert_to_first_order,
+solve_for_derivative against the plain sp.solve it replaced.
+Run from the bot source directory:
+
+    python -m equation.equation_parser_benchmark [--repeat N]
+"""
+
+import argparse
+import statistics
+import time
+from collections import defaultdict
+
+import sympy as sp
+from sympy.core.cache import clear_cache
+
+from equation.equation_cache import load_corpus
+from equation.equation_parser import (
+    get_equation_order,
+    parse_equation,
+    solve_for_derivative,
+)
+
+# The corpus stops at order 4, these cover order 5 and the general path
+EXTRA_EQUATIONS = [
+    "y^(4) + 2*y'' + y = sin(x)",
+    "y''' = x*y'' - y",
+    "y^(5) = -y",
+    "y^(5) + y''' = cos(x)",
+    "y^(5) = y^(4) - y' + x^2",
+    "y' = x*y''",
+    "y'' * x = y",
+    "y'^2 = x",
+    "(1+x^2)*y' = x*y",
+    "sin(x)*y'' + cos(x)*y' = y",
+    "exp(x)*y' = y^2 + 1",
+    "x^2*y''' + x*y' = sin(x)",
+]
+
+
+def isolate_with_solve(eq, derivative):
+    return sp.solve(eq, derivative)[0]
+
+
+def measure(isolate, eq, derivative, repeat):
+    """
+    Best time of isolating the derivative, in milliseconds.
+    The SymPy cache is cleared before every run,
+    as the bot sees each equation for the first time.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        clear_cache()
+        start = time.perf_counter()
+        result = isolate(eq, derivative)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = defaultdict(lambda: ([], []))
+    mismatches = []
+
+    for text in load_corpus() + EXTRA_EQUATIONS:
+        eq, y, x = parse_equation(text)
+        order = int(get_equation_order(eq))
+        derivative = y.diff(x, order)
+
+        solve_ms, expected = measure(isolate_with_solve, eq, derivative, args.repeat)
+        direct_ms, result = measure(solve_for_derivative, eq, derivative, args.repeat)
+
+        timings[order][0].append(solve_ms)
+        timings[order][1].append(direct_ms)
+        if str(result) != str(expected):
+            mismatches.append((text, expected, result))
+
+    print("order  equations  sp.solve ms  direct ms  speedup")
+    for order in sorted(timings):
+        solve_times, direct_times = timings[order]
+        solve_ms = statistics.mean(solve_times)
+        direct_ms = statistics.mean(direct_times)
+        print(
+            f"{order:>5}  {len(solve_times):>9}  {solve_ms:>11.2f}  "
+            f"{direct_ms:>9.2f}  {solve_ms / direct_ms:>6.1f}x"
+        )
+
+    for text, expected, result in mismatches:
+        print(f"Output differs for {text!r}: {expected} != {result}")
+    if not mismatches:
+        print("Output is identical for every equation")
+
+
+if __name__ == "__main__":
+    main()
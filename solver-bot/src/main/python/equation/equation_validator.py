@@ -1,8 +1,9 @@
-import re
 import json
 
 from pathlib import Path
 
+from equation.equation_lexer import LPAREN, NAME, RPAREN, UNKNOWN
+
 PY_DIR = Path(__file__).parent
 functions_path = PY_DIR / "functions.json"
 
@@ -10,31 +11,38 @@ with open(functions_path, "r", encoding="utf-8") as f:
     MATH_FUNCTIONS = json.load(f)
 
 
-def validate_symbols(equation):
+def validate_symbols(tokens):
+    """
+    Returns the first token that is neither a variable,
+    a known function nor a supported character.
+    """
     allowed_vars = {"x", "y", "X", "Y"}
-    symbols = re.findall(r"[a-zA-Z]+|\d+|\S", equation)
-    for symbol in symbols:
-        if (
-            symbol.isalpha()
-            and symbol not in allowed_vars
-            and symbol not in MATH_FUNCTIONS
+    for token in tokens:
+        if token.kind == UNKNOWN or (
+            token.kind == NAME
+            and token.text not in allowed_vars
+            and token.text not in MATH_FUNCTIONS
         ):
-            return False, symbol
+            return False, token
     return True, None
 
 
-def validate_parentheses(equation):
+def validate_parentheses(tokens):
+    """
+    Returns the first parenthesis that is unbalanced
+    or opens an empty pair.
+    """
     stack = []
-    for i, char in enumerate(equation):
-        if char == "(":
+    for i, token in enumerate(tokens):
+        if token.kind == LPAREN:
             stack.append(i)
-        elif char == ")":
+        elif token.kind == RPAREN:
             if not stack:
-                return False
+                return False, token
             start_index = stack.pop()
             if start_index + 1 == i:
-                return False
+                return False, tokens[start_index]
 
     if stack:
-        return False
-    return True
+        return False, tokens[stack[-1]]
+    return True, None
@@ -3,6 +3,15 @@ import json
 
 from pathlib import Path
 
+from equation.equation_lexer import (
+    LPAREN,
+    NAME,
+    OPERATOR,
+    RPAREN,
+    find_closing_parenthesis,
+    tokenize,
+)
+
 PY_DIR = Path(__file__).parent
 functions_path = PY_DIR / "functions.json"
 
@@ -10,18 +19,95 @@ with open(functions_path, "r", encoding="utf-8") as f:
     MATH_FUNCTIONS = json.load(f)
 
 
+def split_replacements(functions):
+    """
+    Splits the function table into plain aliases
+    and functions expanded through a template of their argument.
+    """
+    aliases = {}
+    templates = {}
+    for func, replacement in functions.items():
+        if "(" in replacement:
+            templates[func] = "(" + re.sub(r"\bx\b", "{0}", replacement) + ")"
+        elif replacement != func:
+            aliases[func] = replacement
+    return aliases, templates
+
+
+FUNCTION_ALIASES, FUNCTION_TEMPLATES = split_replacements(MATH_FUNCTIONS)
+
+# Operators that bind looser than the division in templates such as 1 / x
+LOOSE_OPERATORS = {"+", "-", "*", "/"}
+
+
 def replace_math_functions(equation):
     """
     The function accepts an equation
     and checks if there are trigonometric functions there,
-    if there are, it converts them.
+    if there are, it converts them in a single pass over its tokens.
+    Arguments of expanded functions are converted recursively,
+    so nested parentheses are kept intact, and are parenthesized
+    where the template would otherwise split them.
     """
-    for func, replacement in MATH_FUNCTIONS.items():
-        if func in ["coth", "cth"]:
-            equation = re.sub(rf"\b{func}\((.*?)\)", r"(cosh(\1) / sinh(\1))", equation)
-        elif func in ["acot", "actg", "arccot", "arcctg"]:
-            equation = re.sub(rf"\b{func}\((.*?)\)", r"(atan(1 / \1))", equation)
-        else:
-            equation = re.sub(rf"\b{func}\b", f"{replacement}", equation)
-
-    return equation
+    tokens = tokenize(equation)
+    return replace_tokens(equation, tokens, 0, len(tokens), 0, len(equation))
+
+
+def replace_tokens(equation, tokens, first, last, begin, end):
+    parts = []
+    position = begin
+
+    i = first
+    while i < last:
+        token = tokens[i]
+        if token.kind != NAME:
+            i += 1
+            continue
+
+        template = FUNCTION_TEMPLATES.get(token.text)
+        if (
+            template is not None
+            and i + 1 < last
+            and tokens[i + 1].kind == LPAREN
+            and tokens[i + 1].position == token.end
+        ):
+            close = find_closing_parenthesis(tokens, i + 1, last)
+            if close is not None:
+                argument = replace_tokens(
+                    equation,
+                    tokens,
+                    i + 2,
+                    close,
+                    tokens[i + 1].end,
+                    tokens[close].position,
+                )
+                if "({0})" not in template and has_loose_operator(tokens, i + 2, close):
+                    argument = f"({argument})"
+
+                parts.append(equation[position : token.position])
+                parts.append(template.format(argument))
+                position = tokens[close].end
+                i = close + 1
+                continue
+
+        alias = FUNCTION_ALIASES.get(token.text)
+        if alias is not None:
+            parts.append(equation[position : token.position])
+            parts.append(alias)
+            position = token.end
+        i += 1
+
+    parts.append(equation[position:end])
+    return "".join(parts)
+
+
+def has_loose_operator(tokens, first, last):
+    depth = 0
+    for token in tokens[first:last]:
+        if token.kind == LPAREN:
+            depth += 1
+        elif token.kind == RPAREN:
+            depth -= 1
+        elif depth == 0 and token.kind == OPERATOR and token.text in LOOSE_OPERATORS:
+            return True
+    return False
@@ -0,0 +1,84 @@
+"""
+Micro-benchmark of replace_math_functions against the previous
+implementation, which ran one re.sub per entry of functions.json.
+Run from the bot source directory:
+
+    python -m equation.function_replacer_benchmark [--number N]
+"""
+
+import argparse
+import re
+import timeit
+
+from equation.function_replacer import MATH_FUNCTIONS, replace_math_functions
+
+# Right-hand sides as they come out of format_equation
+EQUATIONS = [
+    "y[0]",
+    "x - y[0]",
+    "sin(x) - 3*y[1]",
+    "-y[0]*y[1] + cos(2*x)",
+    "tg(x)*y[0] + ctg(y[1])",
+    "arcsin(x/2) + arccos(y[0]/3) - arctg(y[1])",
+    "sh(x) + ch(y[0]) - th(y[1])",
+    "coth(x + 1) - y[0]",
+    "acot(y[0]) + arcctg(x)",
+    "coth(sin(x) + (y[0] + 1)) * y[1]",
+    "acot((x + 1)*(y[0] - 1)) + cth(tg(x))",
+    "ln(x^2 + 1) + lg(y[0]^2 + 1) + exp(-x)*sqrt(abs(y[1]))",
+]
+
+
+def replace_math_functions_per_entry(equation):
+    """
+    The implementation replaced by the single pass rewriter.
+    """
+    for func, replacement in MATH_FUNCTIONS.items():
+        if func in ["coth", "cth"]:
+            equation = re.sub(rf"\b{func}\((.*?)\)", r"(cosh(\1) / sinh(\1))", equation)
+        elif func in ["acot", "actg", "arccot", "arcctg"]:
+            equation = re.sub(rf"\b{func}\((.*?)\)", r"(atan(1 / \1))", equation)
+        else:
+            equation = re.sub(rf"\b{func}\b", f"{replacement}", equation)
+
+    return equation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print("per entry us  single pass us  speedup  equation")
+    total_before = total_after = 0.0
+    for equation in EQUATIONS:
+        before = timeit.timeit(
+            lambda: replace_math_functions_per_entry(equation), number=args.number
+        )
+        after = timeit.timeit(
+            lambda: replace_math_functions(equation), number=args.number
+        )
+        total_before += before
+        total_after += after
+
+        print(
+            f"{before / args.number * 1e6:>12.1f}  "
+            f"{after / args.number * 1e6:>14.1f}  "
+            f"{before / after:>6.1f}x  {equation}"
+        )
+
+    print(
+        f"{total_before / len(EQUATIONS) / args.number * 1e6:>12.1f}  "
+        f"{total_after / len(EQUATIONS) / args.number * 1e6:>14.1f}  "
+        f"{total_before / total_after:>6.1f}x  mean"
+    )
+
+    for equation in EQUATIONS:
+        before = replace_math_functions_per_entry(equation)
+        after = replace_math_functions(equation)
+        if before != after:
+            print(f"\nOutput differs for {equation!r}:\n  {before}\n  {after}")
+
+
+if __name__ == "__main__":
+    main()
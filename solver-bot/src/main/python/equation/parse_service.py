@@ -0,0 +1,125 @@
+import asyncio
+import os
+
+from equation.equation_cache import get_equation_cache
+from equation.equation_parser import format_equation, normalize_equation
+from logger import logger
+from worker_pool import WorkerDied, WorkerPool
+
+PARSE_WORKERS = 2
+PARSE_TIMEOUT = 5
+
+TIMED_OUT = "timed_out"
+
+
+class ParseService:
+    """
+    Formats equations in a pool of worker processes with a hard deadline.
+    SymPy can take arbitrarily long on adversarial input,
+    so a worker that misses the deadline is killed and replaced.
+    The deadline starts when a worker takes the equation,
+    only equations that ran out of time themselves are cached as timed out.
+    """
+
+    def __init__(self, workers=PARSE_WORKERS, timeout=PARSE_TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+
+        self._pool = WorkerPool(workers, preload=("equation.equation_parser",))
+        self._stats = {"parsed": 0, "timeouts": 0}
+
+    def start(self):
+        self._pool.start()
+
+    def stop(self):
+        self._pool.stop()
+
+    async def format(self, eq, tokens=None):
+        """
+        Returns the formatted equation and its order, (None, None)
+        if it can not be parsed, or raises asyncio.TimeoutError
+        if it takes longer than the deadline.
+        Tokens already produced by the lexer are passed on to the worker.
+        """
+        key = normalize_equation(eq)
+        equation_cache = get_equation_cache()
+
+        result = equation_cache.get(key)
+        if result is TIMED_OUT:
+            raise asyncio.TimeoutError()
+        if result is not None:
+            return result
+
+        try:
+            result = await self._format_in_pool(key, tokens)
+        except asyncio.TimeoutError:
+            equation_cache.put(key, TIMED_OUT)
+            raise
+
+        equation_cache.put(key, result)
+        return result
+
+    async def warm_up(self, equations):
+        for eq in equations:
+            try:
+                await self.format(eq)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self):
+        return {
+            **self._stats,
+            "restarts": self._pool.stats()["restarts"],
+            "workers": self.workers,
+            "timeout": self.timeout,
+        }
+
+    async def _format_in_pool(self, key, tokens=None):
+        try:
+            result = await self._pool.run(
+                format_equation, key, tokens, timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            logger.warning("Formatting of equation %r timed out", key)
+            raise
+        except WorkerDied:
+            # The equation took its worker down, it is rejected like a timeout
+            self._stats["timeouts"] += 1
+            logger.error("Formatting of equation %r crashed its worker", key)
+            raise asyncio.TimeoutError() from None
+
+        self._stats["parsed"] += 1
+        return result
+
+
+parse_service = None
+
+
+def init_parse_service():
+    global parse_service
+
+    if parse_service is None:
+        parse_service = ParseService(
+            workers=int(os.getenv("PARSE_WORKERS", PARSE_WORKERS)),
+            timeout=float(os.getenv("PARSE_TIMEOUT", PARSE_TIMEOUT)),
+        )
+
+    parse_service.start()
+    return parse_service
+
+
+def close_parse_service():
+    global parse_service
+
+    if parse_service is None:
+        return None
+
+    stats = parse_service.stats()
+    parse_service.stop()
+    parse_service = None
+    return stats
+
+
+async def format_equation_async(eq, tokens=None):
+    return await (parse_service or init_parse_service()).format(eq, tokens)
@@ -0,0 +1,98 @@
+"""
+Benchmark of formatting equations in the ParseService pool against
+formatting them inline on the event loop. A heartbeat task records
+how long the loop stalls, which is what other users wait for.
+Run from the bot source directory:
+
+    python -m equation.parse_service_benchmark [--workers N] [--timeout S]
+"""
+
+import argparse
+import asyncio
+import time
+
+from equation.equation_cache import init_equation_cache, load_corpus
+from equation.equation_parser import format_equation
+from equation.parse_service import ParseService
+
+HEARTBEAT_INTERVAL = 0.005
+
+# Evaluating this power takes SymPy far longer than any deadline
+ADVERSARIAL_EQUATION = "y' = 9^9^9^9 + y"
+
+
+async def heartbeat(lags):
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(time.perf_counter() - start - HEARTBEAT_INTERVAL)
+
+
+async def measure(run):
+    """
+    Runs the coroutine function next to the heartbeat
+    and returns its wall time and the worst loop stall, in milliseconds.
+    """
+    lags = []
+    task = asyncio.create_task(heartbeat(lags))
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await run()
+    elapsed = time.perf_counter() - start
+
+    task.cancel()
+    return elapsed * 1000, max(lags, default=0.0) * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+
+    async def inline():
+        for eq in corpus:
+            format_equation(eq)
+            await asyncio.sleep(0)
+
+    service = ParseService(workers=args.workers, timeout=args.timeout)
+    service.start()
+    # Spawning the workers and importing SymPy there is not part of a request
+    await service.format("y' = y")
+
+    async def pooled():
+        await asyncio.gather(*(service.format(eq) for eq in corpus))
+
+    async def adversarial():
+        try:
+            await service.format(ADVERSARIAL_EQUATION)
+        except asyncio.TimeoutError:
+            pass
+
+    init_equation_cache()
+    inline_ms, inline_lag = await measure(inline)
+    init_equation_cache()
+    pooled_ms, pooled_lag = await measure(pooled)
+    adversarial_ms, adversarial_lag = await measure(adversarial)
+    init_equation_cache()
+    after_ms, after_lag = await measure(pooled)
+
+    service.stop()
+
+    print(f"{len(corpus)} corpus equations, {args.workers} workers")
+    print("run                  wall ms  max loop stall ms")
+    for name, wall, lag in [
+        ("inline", inline_ms, inline_lag),
+        ("pool", pooled_ms, pooled_lag),
+        ("adversarial timeout", adversarial_ms, adversarial_lag),
+        ("pool after restart", after_ms, after_lag),
+    ]:
+        print(f"{name:<19}  {wall:>7.1f}  {lag:>17.1f}")
+    print(service.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+import numpy as np
+
+
+def downsample_minmax(x_values, y_values, max_points):
+    """
+    Reduces a trajectory to at most max_points points
+    by keeping the minimum and the maximum of every bucket,
+    which preserves the visible envelope of the curve.
+    """
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
+
+    n = len(y_values)
+
+    if max_points is None or n <= max_points or max_points < 4:
+        return x_values, y_values
+
+    buckets = (max_points - 2) // 2
+    bucket_size = -(-n // buckets)
+    padding = buckets * bucket_size - n
+
+    nan_mask = np.isnan(y_values)
+    low = np.pad(
+        np.where(nan_mask, np.inf, y_values), (0, padding), constant_values=np.inf
+    )
+    high = np.pad(
+        np.where(nan_mask, -np.inf, y_values), (0, padding), constant_values=-np.inf
+    )
+
+    offsets = np.arange(buckets) * bucket_size
+    min_indices = offsets + low.reshape(buckets, bucket_size).argmin(axis=1)
+    max_indices = offsets + high.reshape(buckets, bucket_size).argmax(axis=1)
+
+    indices = np.unique(np.concatenate(([0, n - 1], min_indices, max_indices)))
+    indices = indices[indices < n]
+
+    return x_values[indices], y_values[indices]
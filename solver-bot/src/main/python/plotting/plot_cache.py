@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from logger import logger
+
+MAX_MEMORY_BYTES = 64 * 1024 * 1024
+MAX_DISK_BYTES = 1024 * 1024 * 1024
+MAX_FILE_IDS = 10000
+
+
+def plot_key(application_id, order, language, max_points):
+    return f"{application_id}-{order}-{language}-{max_points}"
+
+
+class PlotCache:
+    """
+    Cache of rendered solution plots.
+    Completed applications never change, so a plot rendered once
+    is kept in an in-memory LRU and, optionally, on disk.
+    Telegram file ids of already uploaded plots are kept as well,
+    so the same photo does not have to be uploaded twice.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes=MAX_MEMORY_BYTES,
+        cache_dir=None,
+        max_disk_bytes=MAX_DISK_BYTES,
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._file_ids = OrderedDict()
+        self._stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "file_id_hits": 0,
+            "misses": 0,
+        }
+
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    async def get(self, key):
+        png = self._memory.get(key)
+        if png is not None:
+            self._memory.move_to_end(key)
+            self._stats["hits"] += 1
+            return png
+
+        if self.cache_dir is not None:
+            png = await asyncio.to_thread(self._read_disk, key)
+            if png is not None:
+                self._stats["disk_hits"] += 1
+                self._put_memory(key, png)
+                return png
+
+        self._stats["misses"] += 1
+        return None
+
+    async def put(self, key, png):
+        self._put_memory(key, png)
+
+        if self.cache_dir is not None:
+            try:
+                await asyncio.to_thread(self._write_disk, key, png)
+            except OSError as e:
+                logger.warning("Failed to write plot %s to disk cache: %s", key, e)
+
+    def get_file_id(self, key):
+        file_id = self._file_ids.get(key)
+        if file_id is not None:
+            self._file_ids.move_to_end(key)
+            self._stats["file_id_hits"] += 1
+        return file_id
+
+    def set_file_id(self, key, file_id):
+        self._file_ids[key] = file_id
+        self._file_ids.move_to_end(key)
+        while len(self._file_ids) > MAX_FILE_IDS:
+            self._file_ids.popitem(last=False)
+
+    def stats(self):
+        return {
+            **self._stats,
+            "entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "file_ids": len(self._file_ids),
+        }
+
+    def _put_memory(self, key, png):
+        if len(png) > self.max_memory_bytes:
+            return
+
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+
+        self._memory[key] = png
+        self._memory_bytes += len(png)
+
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _disk_path(self, key):
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.png"
+
+    def _read_disk(self, key):
+        path = self._disk_path(key)
+        try:
+            png = path.read_bytes()
+        except OSError:
+            return None
+        os.utime(path)
+        return png
+
+    def _write_disk(self, key, png):
+        path = self._disk_path(key)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_bytes(png)
+        temp_path.replace(path)
+
+        files = sorted(self.cache_dir.glob("*.png"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in files)
+        for file in files:
+            if total <= self.max_disk_bytes:
+                break
+            total -= file.stat().st_size
+            file.unlink(missing_ok=True)
+
+
+plot_cache = None
+
+
+def init_plot_cache():
+    global plot_cache
+
+    if plot_cache is None:
+        plot_cache = PlotCache(
+            max_memory_bytes=int(os.getenv("PLOT_CACHE_MAX_BYTES", MAX_MEMORY_BYTES)),
+            cache_dir=os.getenv("PLOT_CACHE_DIR"),
+            max_disk_bytes=int(os.getenv("PLOT_CACHE_MAX_DISK_BYTES", MAX_DISK_BYTES)),
+        )
+
+    return plot_cache
+
+
+def get_plot_cache():
+    return plot_cache or init_plot_cache()
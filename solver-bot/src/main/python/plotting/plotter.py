@@ -1,22 +1,57 @@
 import io
-import matplotlib.pyplot as plt
+import matplotlib
+import numpy as np
 
-from printing.printer import get_variable_name
+matplotlib.use("Agg")
 
+import matplotlib.pyplot as plt  # noqa: E402
 
-def plot_solution(x_values, y_values, order):
+from plotting.downsampler import downsample_minmax  # noqa: E402
+from printing.printer import get_variable_name  # noqa: E402
+
+MAX_PLOT_POINTS = 4000
+
+
+def plot_solution(x_values, y_values, order, max_points=MAX_PLOT_POINTS):
+    """
+    Renders the solution to a PNG buffer.
+    Every variable is downsampled to max_points points before plotting,
+    pass None to plot all of them.
+    Solutions of an ensemble are overlaid as a family of curves.
+    """
     plt.figure(figsize=(10, 6), dpi=200)
     plt.grid(True)
 
     variable_names = ["y"] + [get_variable_name(i) for i in range(1, order)]
 
-    is_multivariable = isinstance(y_values[0], (list, tuple))
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
 
-    if is_multivariable:
+    is_ensemble = y_values.ndim > 2
+    is_multivariable = y_values.ndim > 1
+
+    if is_ensemble:
+        # One color per variable, one curve per set of initial values
+        for i, var_name in enumerate(variable_names):
+            color = f"C{i}"
+            for j, trajectory in enumerate(y_values):
+                plt.plot(
+                    *downsample_minmax(x_values, trajectory[:, i], max_points),
+                    color=color,
+                    linewidth=1,
+                    label=var_name if j == 0 else None,
+                )
+    elif is_multivariable:
         for i, var_name in enumerate(variable_names):
-            plt.plot(x_values, [y[i] for y in y_values], label=var_name)
+            plt.plot(
+                *downsample_minmax(x_values, y_values[:, i], max_points),
+                label=var_name,
+            )
     else:
-        plt.plot(x_values, y_values, label=variable_names[0])
+        plt.plot(
+            *downsample_minmax(x_values, y_values, max_points),
+            label=variable_names[0],
+        )
 
     plt.legend()
 
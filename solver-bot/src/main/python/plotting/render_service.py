@@ -0,0 +1,154 @@
+import asyncio
+import io
+import os
+import time
+
+from logger import logger
+from plotting.plotter import MAX_PLOT_POINTS, plot_solution
+from worker_pool import WorkerPool
+
+RENDER_WORKERS = 2
+RENDER_CONCURRENCY = 4
+RENDER_TIMEOUT = 30
+
+
+def render_png(x_values, y_values, order, max_points):
+    buffer = plot_solution(x_values, y_values, order, max_points)
+    try:
+        return buffer.getvalue()
+    finally:
+        buffer.close()
+
+
+class RenderService:
+    """
+    Renders solution plots in a pool of worker processes,
+    so that matplotlib never blocks the bot's event loop.
+    A render that misses the deadline has its worker killed and replaced.
+    """
+
+    def __init__(
+        self,
+        workers=RENDER_WORKERS,
+        concurrency=RENDER_CONCURRENCY,
+        timeout=RENDER_TIMEOUT,
+        max_points=MAX_PLOT_POINTS,
+    ):
+        self.workers = workers
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_points = max_points
+
+        self._pool = WorkerPool(workers, preload=("plotting.render_service",))
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._stats = {
+            "queued": 0,
+            "running": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "total_render_time": 0.0,
+        }
+
+    def start(self):
+        self._pool.start()
+
+    def stop(self):
+        self._pool.stop()
+
+    async def render(self, x_values, y_values, order):
+        """
+        Returns the rendered plot as a PNG buffer,
+        or None if it could not be rendered in time.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+
+        self._stats["queued"] += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            logger.warning("Plot rendering timed out while waiting in the queue")
+            return None
+        finally:
+            self._stats["queued"] -= 1
+
+        self._stats["running"] += 1
+        started_at = time.monotonic()
+        try:
+            return await self._render_in_pool(x_values, y_values, order, deadline)
+        finally:
+            self._stats["running"] -= 1
+            self._stats["total_render_time"] += time.monotonic() - started_at
+            self._semaphore.release()
+
+    def stats(self):
+        return {
+            **self._stats,
+            "restarts": self._pool.stats()["restarts"],
+            "workers": self.workers,
+            "concurrency": self.concurrency,
+        }
+
+    async def _render_in_pool(self, x_values, y_values, order, deadline):
+        loop = asyncio.get_running_loop()
+
+        # Cancelling a render that is already running kills its worker,
+        # so it does not keep a worker busy past the deadline
+        try:
+            png = await asyncio.wait_for(
+                self._pool.run(render_png, x_values, y_values, order, self.max_points),
+                max(deadline - loop.time(), 0),
+            )
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            logger.warning("Plot rendering timed out after %s seconds", self.timeout)
+            return None
+        except Exception as e:
+            self._stats["failed"] += 1
+            logger.error("Error while rendering plot: %s", e)
+            return None
+
+        self._stats["completed"] += 1
+        return io.BytesIO(png)
+
+
+render_service = None
+
+
+def init_render_service():
+    global render_service
+
+    if render_service is None:
+        render_service = RenderService(
+            workers=int(os.getenv("RENDER_WORKERS", RENDER_WORKERS)),
+            concurrency=int(os.getenv("RENDER_CONCURRENCY", RENDER_CONCURRENCY)),
+            timeout=float(os.getenv("RENDER_TIMEOUT", RENDER_TIMEOUT)),
+            max_points=int(os.getenv("PLOT_MAX_POINTS", MAX_PLOT_POINTS)) or None,
+        )
+
+    render_service.start()
+    return render_service
+
+
+def close_render_service():
+    global render_service
+
+    if render_service is None:
+        return None
+
+    stats = render_service.stats()
+    render_service.stop()
+    render_service = None
+    return stats
+
+
+async def render_plot(x_values, y_values, order):
+    return await (render_service or init_render_service()).render(
+        x_values, y_values, order
+    )
+
+
+def plot_max_points():
+    return (render_service or init_render_service()).max_points
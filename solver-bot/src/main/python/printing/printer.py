@@ -30,3 +30,21 @@ def print_solution(result, order, rounding):
     )
 
     return f"x: {formatted_x}, {variables_str}"
+
+
+def print_ensemble_solution(results, order, rounding, max_length=None):
+    """
+    Prints the solution of every set of initial values on its own line.
+    Lines that do not fit into max_length characters are cut off.
+    """
+    lines = []
+    length = 0
+    for i, result in enumerate(results, start=1):
+        line = f"{i}) {print_solution(result, order, rounding)}"
+        if max_length is not None and length + len(line) + 2 > max_length:
+            lines.append("…")
+            break
+        lines.append(line)
+        length += len(line) + 1
+
+    return "\n".join(lines)
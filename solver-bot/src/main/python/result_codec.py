@@ -0,0 +1,158 @@
+import base64
+import json
+import struct
+import zlib
+
+import numpy as np
+
+ENCODING_RAW = "raw"
+ENCODING_DELTA_DEFLATE = "delta_deflate"
+
+# Binary representation of a result, see ResultEncoding.frame
+PACKED_MEDIA_TYPE = "application/vnd.solver.columns"
+FRAME_HEADER = struct.Struct("<4sBBxxIIII")
+FRAME_MAGIC = b"SOLV"
+FRAME_VERSION = 1
+FRAME_ENCODINGS = {0: ENCODING_RAW, 1: ENCODING_DELTA_DEFLATE}
+
+FLOAT64 = np.dtype("<f8")
+INT64 = np.dtype("<i8")
+
+CHUNK_SIZE = 64 * 1024
+
+
+def decode_column(payload, encoding=ENCODING_RAW):
+    """
+    Decodes a column packed by ResultEncoding.pack into a float64 array.
+    Raw columns are viewed in place without copying.
+    """
+    if encoding == ENCODING_DELTA_DEFLATE:
+        deltas = np.frombuffer(zlib.decompress(payload), dtype=INT64)
+        return np.cumsum(deltas, dtype=INT64).view(FLOAT64)
+    if encoding == ENCODING_RAW:
+        return np.frombuffer(payload, dtype=FLOAT64)
+
+    raise ValueError(f"Unknown result encoding: {encoding}")
+
+
+def decode_columns(solution, x_values, y_values, encoding, dimension):
+    """
+    Decodes the packed columns of a result.
+    Results requested without the trajectory have empty x and y columns
+    and only contain the solution.
+    """
+    data = {"solution": decode_column(solution)}
+    if len(x_values) == 0:
+        return data
+
+    x_values = decode_column(x_values, encoding)
+    y_values = decode_column(y_values, encoding)
+
+    data["xvalues"] = x_values
+    # Columns are stored one after another, the transpose is a view
+    data["yvalues"] = y_values.reshape(dimension, len(x_values)).T
+    return data
+
+
+def decode_result(result):
+    """
+    Turns a row of the results endpoint into the solution, x values
+    and y values. Packed columns become NumPy arrays,
+    results stored as JSON before are parsed as they are.
+    """
+    if result.get("x_values") is None:
+        return json.loads(result.get("data") or "{}")
+
+    encoding = result.get("encoding") or ENCODING_RAW
+    dimension = int(result["dimension"])
+
+    return decode_columns(
+        base64.b64decode(result["solution"]),
+        base64.b64decode(result["x_values"]),
+        base64.b64decode(result["y_values"]),
+        encoding,
+        dimension,
+    )
+
+
+async def read_frame(stream):
+    """
+    Reads a result sent as PACKED_MEDIA_TYPE from an aiohttp stream.
+    The columns are filled chunk by chunk into preallocated arrays,
+    so the body itself is never held in memory.
+    """
+    header = await stream.readexactly(FRAME_HEADER.size)
+    magic, version, encoding_id, dimension, solution_length, x_length, y_length = (
+        FRAME_HEADER.unpack(header)
+    )
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise ValueError("Unsupported result frame")
+
+    encoding = FRAME_ENCODINGS[encoding_id]
+
+    data = {"solution": await read_column(stream, solution_length)}
+    if x_length == 0:
+        return data
+
+    x_values = await read_column(stream, x_length, encoding)
+    y_values = await read_column(stream, y_length, encoding, len(x_values) * dimension)
+
+    data["xvalues"] = x_values
+    data["yvalues"] = y_values.reshape(dimension, len(x_values)).T
+    return data
+
+
+async def read_column(stream, length, encoding=ENCODING_RAW, size=None):
+    """
+    Reads a packed column of length bytes.
+    size is the number of values if it is known in advance,
+    otherwise the array of a compressed column grows as it is inflated.
+    """
+    if encoding == ENCODING_RAW:
+        values = np.empty(length // FLOAT64.itemsize, dtype=FLOAT64)
+        buffer = values.view(np.uint8)
+        filled = 0
+        while filled < length:
+            chunk = await stream.readexactly(min(CHUNK_SIZE, length - filled))
+            buffer[filled : filled + len(chunk)] = np.frombuffer(chunk, dtype=np.uint8)
+            filled += len(chunk)
+        return values
+
+    if encoding != ENCODING_DELTA_DEFLATE:
+        raise ValueError(f"Unknown result encoding: {encoding}")
+
+    deltas = np.empty(size if size is not None else CHUNK_SIZE, dtype=INT64)
+    filled = 0
+
+    def append(inflated):
+        nonlocal deltas, filled
+        end = filled + len(inflated)
+        if end > deltas.nbytes:
+            deltas = np.resize(deltas, max(2 * len(deltas), -(-end // INT64.itemsize)))
+        deltas.view(np.uint8)[filled:end] = np.frombuffer(inflated, dtype=np.uint8)
+        filled = end
+
+    decompressor = zlib.decompressobj()
+    remaining = length
+    while remaining:
+        chunk = await stream.readexactly(min(CHUNK_SIZE, remaining))
+        remaining -= len(chunk)
+        # Deltas of evenly spaced columns deflate very well, bound the output too
+        while chunk:
+            append(decompressor.decompress(chunk, CHUNK_SIZE))
+            chunk = decompressor.unconsumed_tail
+    append(decompressor.flush())
+
+    deltas = deltas[: filled // INT64.itemsize]
+    return np.cumsum(deltas, out=deltas).view(FLOAT64)
+
+
+def results_size(results):
+    """
+    Approximate memory held by decoded results, in bytes.
+    """
+    return sum(
+        getattr(values, "nbytes", 8 * len(values))
+        for result in results
+        for values in result.values()
+    )
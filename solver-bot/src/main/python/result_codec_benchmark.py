@@ -0,0 +1,198 @@
+"""
+Benchmark of the results endpoint formats: response size and
+fetch plus decode time of get_results for JSON, packed raw
+and packed delta_deflate results of 1k, 10k and 100k points.
+A local aiohttp server stands in for the solver service.
+Run from the bot source directory:
+
+    python result_codec_benchmark.py [--points N ...] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import zlib
+
+import numpy as np
+import spring_client
+from aiohttp import web
+from result_codec import (
+    ENCODING_DELTA_DEFLATE,
+    ENCODING_RAW,
+    FLOAT64,
+    FRAME_ENCODINGS,
+    FRAME_HEADER,
+    FRAME_MAGIC,
+    FRAME_VERSION,
+    INT64,
+    PACKED_MEDIA_TYPE,
+)
+
+HOST = "127.0.0.1"
+PORT = 8765
+WRITE_CHUNK_SIZE = 256 * 1024
+
+
+def pack(columns, encoding):
+    """
+    Packs columns like ResultEncoding.pack on the solver service.
+    """
+    values = np.concatenate([np.asarray(c, dtype=FLOAT64) for c in columns])
+    if encoding == ENCODING_RAW:
+        return values.tobytes()
+
+    deltas = np.diff(values.view(INT64), prepend=np.int64(0)).astype(INT64)
+    return zlib.compress(deltas.tobytes())
+
+
+def frame(encoding, solution, x_values, y_values):
+    """
+    Builds a response body like ResultEncoding.frame.
+    """
+    encoding_id = {v: k for k, v in FRAME_ENCODINGS.items()}[encoding]
+    dimension = y_values.shape[1]
+    solution = pack([solution], ENCODING_RAW)
+    x_values = pack([x_values], encoding)
+    y_values = pack(list(y_values.T), encoding)
+
+    header = FRAME_HEADER.pack(
+        FRAME_MAGIC,
+        FRAME_VERSION,
+        encoding_id,
+        dimension,
+        len(solution),
+        len(x_values),
+        len(y_values),
+    )
+    return header + solution + x_values + y_values
+
+
+def trajectory(points, order):
+    """
+    A smooth trajectory like the ones the solver service stores.
+    """
+    x_values = np.linspace(0, points * 0.01, points + 1)[1:]
+    y_values = np.column_stack(
+        [np.cos(x_values + k) * np.exp(-x_values / 100) for k in range(order)]
+    )
+    solution = np.array([x_values[-1], *y_values[-1]])
+    return solution, x_values, y_values
+
+
+def bodies(solution, x_values, y_values):
+    """
+    The response bodies of every format, keyed by format.
+    JSON is the format stored before the packed columns.
+    """
+    data = {
+        "solution": solution.tolist(),
+        "xvalues": x_values.tolist(),
+        "yvalues": y_values.tolist(),
+    }
+    result = {
+        "json": json.dumps([{"id": 1, "data": json.dumps(data)}]).encode(),
+    }
+    for encoding in (ENCODING_RAW, ENCODING_DELTA_DEFLATE):
+        result[encoding] = frame(encoding, solution, x_values, y_values)
+    return result
+
+
+class ResultsServer:
+    """
+    Serves prepared bodies on the results endpoint,
+    the application id selects the body.
+    """
+
+    def __init__(self, host=HOST, port=PORT):
+        self.host = host
+        self.port = port
+        self.bodies = {}
+
+        self._runner = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/applications/{application_id}/results", self._handle)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    async def _handle(self, request):
+        kind, body = self.bodies[request.match_info["application_id"]]
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": (
+                    "application/json" if kind == "json" else PACKED_MEDIA_TYPE
+                )
+            }
+        )
+        response.content_length = len(body)
+        await response.prepare(request)
+        for i in range(0, len(body), WRITE_CHUNK_SIZE):
+            await response.write(body[i : i + WRITE_CHUNK_SIZE])
+        return response
+
+
+async def start_benchmark_client(server):
+    """
+    Points spring_client at the server with the results cache disabled.
+    """
+    os.environ["CLIENT_API_URL"] = server.url
+    os.environ["RESULTS_CACHE_MAX_BYTES"] = "0"
+
+    await spring_client.init_client()
+
+
+def check(data, x_values, y_values):
+    assert np.array_equal(np.asarray(data["xvalues"], dtype=float), x_values)
+    assert np.array_equal(np.asarray(data["yvalues"], dtype=float), y_values)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--points", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--order", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    server = ResultsServer()
+    await server.start()
+    await start_benchmark_client(server)
+
+    print(f"order {args.order}, median of {args.repeat} fetches")
+    print(" points  format              bytes  fetch+decode ms")
+    for points in args.points:
+        solution, x_values, y_values = trajectory(points, args.order)
+        for kind, body in bodies(solution, x_values, y_values).items():
+            application_id = f"{points}-{kind}"
+            server.bodies[application_id] = (kind, body)
+
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                data = (await spring_client.get_results(application_id))[0]
+                times.append(time.perf_counter() - start)
+            check(data, x_values, y_values)
+
+            print(
+                f"{points:>7}  {kind:<13}  {len(body):>10}  "
+                f"{statistics.median(times) * 1000:>15.2f}"
+            )
+
+    await spring_client.close_client()
+    await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""
+Benchmark of the memory taken by fetching one result: tracemalloc
+peak and retained memory of reading packed frames from the response
+stream against reading the whole body first, and of JSON results.
+Run from the bot source directory:
+
+    python result_stream_benchmark.py [--points N] [--order N] [--concurrent N]
+"""
+
+import argparse
+import asyncio
+import json
+import tracemalloc
+
+import numpy as np
+import spring_client
+from result_codec import (
+    ENCODING_DELTA_DEFLATE,
+    ENCODING_RAW,
+    FRAME_ENCODINGS,
+    FRAME_HEADER,
+    FRAME_MAGIC,
+    FRAME_VERSION,
+    PACKED_MEDIA_TYPE,
+    decode_columns,
+    decode_result,
+    read_frame,
+)
+from result_codec_benchmark import (
+    ResultsServer,
+    bodies,
+    check,
+    start_benchmark_client,
+    trajectory,
+)
+
+
+def decode_buffered(body):
+    """
+    The decoding replaced by read_frame, which took the whole body.
+    """
+    magic, version, encoding_id, dimension, solution_length, x_length, y_length = (
+        FRAME_HEADER.unpack_from(body)
+    )
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise ValueError("Unsupported result frame")
+
+    view = memoryview(body)
+    solution_start = FRAME_HEADER.size
+    x_start = solution_start + solution_length
+    y_start = x_start + x_length
+
+    return decode_columns(
+        view[solution_start:x_start],
+        view[x_start:y_start],
+        view[y_start : y_start + y_length],
+        FRAME_ENCODINGS[encoding_id],
+        dimension,
+    )
+
+
+async def fetch(application_id, streamed):
+    client = await spring_client.get_client()
+    async with client.request(
+        "GET",
+        "results",
+        f"/applications/{application_id}/results",
+        headers={"Accept": f"{PACKED_MEDIA_TYPE}, application/json;q=0.5"},
+    ) as response:
+        response.raise_for_status()
+
+        if response.content_type != PACKED_MEDIA_TYPE:
+            return decode_result(json.loads(await response.read())[0])
+        if streamed:
+            return await read_frame(response.content)
+        return decode_buffered(await response.read())
+
+
+async def measure(application_id, streamed, concurrent):
+    """
+    Peak and retained memory of the fetches, in megabytes.
+    """
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+
+    results = await asyncio.gather(
+        *(fetch(application_id, streamed) for _ in range(concurrent))
+    )
+
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, (peak - base) / 1e6, (current - base) / 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--order", type=int, default=5)
+    parser.add_argument("--concurrent", type=int, default=1)
+    args = parser.parse_args()
+
+    server = ResultsServer()
+    await server.start()
+    await start_benchmark_client(server)
+
+    solution, x_values, y_values = trajectory(args.points, args.order)
+    for kind, body in bodies(solution, x_values, y_values).items():
+        server.bodies[kind] = (kind, body)
+    # Opening the connection is not part of a fetch
+    await fetch("json", streamed=False)
+
+    arrays = (x_values.nbytes + y_values.nbytes) / 1e6
+    print(
+        f"order {args.order}, {args.points} points, {args.concurrent} concurrent "
+        f"fetches, the arrays of one result take {arrays:.2f} MB"
+    )
+    print("format         read      body MB  peak MB  retained MB")
+    for kind, streamed in [
+        ("json", False),
+        (ENCODING_RAW, False),
+        (ENCODING_RAW, True),
+        (ENCODING_DELTA_DEFLATE, False),
+        (ENCODING_DELTA_DEFLATE, True),
+    ]:
+        results, peak, retained = await measure(kind, streamed, args.concurrent)
+        for data in results:
+            check(data, x_values, y_values)
+        del results
+
+        body = len(server.bodies[kind][1]) / 1e6
+        read = "stream" if streamed else "buffer"
+        print(f"{kind:<13}  {read:<6}  {body:>7.2f}  {peak:>7.2f}  {retained:>11.2f}")
+
+    await spring_client.close_client()
+    await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
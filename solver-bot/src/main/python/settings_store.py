@@ -0,0 +1,127 @@
+import asyncio
+import os
+
+from logger import logger
+from spring_client import get_user_settings, set_user_settings
+
+FLUSH_DELAY = 2
+SETTINGS_KEYS = ("method", "rounding", "language", "hints")
+
+
+class SettingsStore:
+    """
+    In-memory store of user settings.
+    Reads are served from memory after the first fetch,
+    writes are coalesced into one debounced request per user
+    and everything still dirty is flushed on shutdown.
+    """
+
+    def __init__(self, defaults, flush_delay=FLUSH_DELAY):
+        self.defaults = defaults
+        self.flush_delay = flush_delay
+
+        self._settings = {}
+        self._dirty = set()
+        self._timers = {}
+        self._stats = {"loads": 0, "writes": 0, "coalesced": 0, "failures": 0}
+
+    async def get(self, user_id):
+        settings = self._settings.get(user_id)
+        if settings is not None:
+            return dict(settings)
+
+        self._stats["loads"] += 1
+        fetched = await get_user_settings(user_id)
+
+        if user_id in self._settings:
+            return dict(self._settings[user_id])
+
+        if isinstance(fetched, dict):
+            settings = {
+                key: fetched.get(key, self.defaults[key]) for key in SETTINGS_KEYS
+            }
+        else:
+            # New users are persisted with the default settings
+            settings = dict(self.defaults)
+            if fetched is None:
+                self._mark_dirty(user_id)
+
+        self._settings[user_id] = settings
+        return dict(settings)
+
+    def update(self, user_id, **changes):
+        settings = self._settings.setdefault(user_id, dict(self.defaults))
+        settings.update(changes)
+        self._mark_dirty(user_id)
+
+    async def flush(self, user_id):
+        timer = self._timers.pop(user_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+        if user_id not in self._dirty:
+            return
+
+        self._dirty.discard(user_id)
+        settings = self._settings[user_id]
+
+        try:
+            self._stats["writes"] += 1
+            await set_user_settings(user_id, *(settings[key] for key in SETTINGS_KEYS))
+        except Exception as e:
+            self._stats["failures"] += 1
+            logger.error("Failed to save settings of user %s: %s", user_id, e)
+            self._mark_dirty(user_id)
+
+    async def flush_all(self):
+        for user_id in list(self._dirty):
+            await self.flush(user_id)
+
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+
+    def stats(self):
+        return {**self._stats, "users": len(self._settings), "dirty": len(self._dirty)}
+
+    def _mark_dirty(self, user_id):
+        if user_id in self._dirty:
+            self._stats["coalesced"] += 1
+
+        self._dirty.add(user_id)
+
+        timer = self._timers.pop(user_id, None)
+        if timer is not None:
+            timer.cancel()
+        self._timers[user_id] = asyncio.create_task(self._delayed_flush(user_id))
+
+    async def _delayed_flush(self, user_id):
+        await asyncio.sleep(self.flush_delay)
+        await self.flush(user_id)
+
+
+settings_store = None
+
+
+def init_settings_store(defaults):
+    global settings_store
+
+    if settings_store is None:
+        settings_store = SettingsStore(
+            defaults,
+            flush_delay=float(os.getenv("SETTINGS_FLUSH_DELAY", FLUSH_DELAY)),
+        )
+
+    return settings_store
+
+
+async def close_settings_store():
+    global settings_store
+
+    if settings_store is None:
+        return None
+
+    await settings_store.flush_all()
+    stats = settings_store.stats()
+    settings_store = None
+    return stats
@@ -1,21 +1,49 @@
 import asyncio
 import json
+import math
 import os
 from pathlib import Path
 
 import telegram
-from equation.equation_parser import format_equation
+from callback_server import start_callback_server, stop_callback_server
+from completion_watcher import (
+    application_progress,
+    close_watcher,
+    init_watcher,
+    wait_for_application_completion,
+)
+from equation.equation_cache import (
+    equation_cache_stats,
+    init_equation_cache,
+    load_corpus,
+)
+from equation.equation_compiler import find_singular_point, find_suspect_point
+from equation.equation_lexer import tokenize
 from equation.equation_validator import validate_parentheses, validate_symbols
+from equation.parse_service import (
+    close_parse_service,
+    format_equation_async,
+    init_parse_service,
+)
 from logger import logger
-from plotting.plotter import plot_solution
-from printing.printer import print_solution
+from plotting.plot_cache import get_plot_cache, init_plot_cache, plot_key
+from plotting.render_service import (
+    close_render_service,
+    init_render_service,
+    plot_max_points,
+    render_plot,
+)
+from printing.printer import print_ensemble_solution, print_solution
+from settings_store import close_settings_store, init_settings_store
+from solving.local_solver import is_local_job, solve_locally
 from spring_client import (
+    cache_stats,
+    close_client,
     get_recent_applications,
     get_results,
-    get_user_settings,
+    init_client,
+    save_solution,
     set_parameters,
-    set_user_settings,
-    wait_for_application_completion,
 )
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto, Update
 from telegram.ext import (
@@ -43,32 +71,34 @@ DEFAULT_LANGUAGE = "en"
 DEFAULT_HINTS = "true"
 
 MAX_CALCULATION_POINTS = 100000
+MAX_ENSEMBLE_SIZE = 25
+MAX_CAPTION_LENGTH = 1024
+
+# The adaptive method takes a tolerance instead of a step size
+# and reports the solution on a uniform grid of output points
+ADAPTIVE_METHOD = "dormand_prince_adaptive"
+ADAPTIVE_OUTPUT_POINTS = 1000
+MIN_TOLERANCE = 1e-12
+MAX_TOLERANCE = 0.1
+
+# The history only needs the final point when the plot is already cached
+SOLUTION_FIELDS = ("solution",)
+
+# Telegram rate limits message edits, so progress is shown every few seconds
+PROGRESS_EDIT_INTERVAL = 3
+PROGRESS_BAR_WIDTH = 10
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if update.edited_message:
         return MENU
 
-    user_settings = await get_user_settings(
-        update.effective_user.id,
-        DEFAULT_METHOD,
-        DEFAULT_ROUNDING,
-        DEFAULT_LANGUAGE,
-        DEFAULT_HINTS,
-    )
+    user_settings = await user_settings_store().get(update.effective_user.id)
 
-    context.user_data["method"] = user_settings.get("method", DEFAULT_METHOD)
-    context.user_data["rounding"] = user_settings.get("rounding", DEFAULT_ROUNDING)
-    context.user_data["language"] = user_settings.get("language", DEFAULT_LANGUAGE)
-    context.user_data["hints"] = user_settings.get("hints", DEFAULT_HINTS)
-
-    await set_user_settings(
-        update.effective_user.id,
-        context.user_data["method"],
-        context.user_data["rounding"],
-        context.user_data["language"],
-        context.user_data["hints"],
-    )
+    context.user_data["method"] = user_settings["method"]
+    context.user_data["rounding"] = user_settings["rounding"]
+    context.user_data["language"] = user_settings["language"]
+    context.user_data["hints"] = user_settings["hints"]
 
     current_state = context.user_data.get("state", None)
     current_language = context.user_data.get("language", DEFAULT_LANGUAGE)
@@ -191,13 +221,7 @@ async def method(update: Update, context: ContextTypes.DEFAULT_TYPE):
     current_method = query.data
     context.user_data["method"] = current_method
 
-    await set_user_settings(
-        update.effective_user.id,
-        context.user_data["method"],
-        context.user_data["rounding"],
-        context.user_data["language"],
-        context.user_data["hints"],
-    )
+    user_settings_store().update(update.effective_user.id, method=current_method)
 
     await settings_method(update, context)
 
@@ -209,7 +233,14 @@ async def settings_method(update: Update, context: ContextTypes.DEFAULT_TYPE):
     current_language = context.user_data.get("language", DEFAULT_LANGUAGE)
     current_method = context.user_data.get("method", DEFAULT_METHOD)
 
-    methods = ["euler", "midpoint", "heun", "runge_kutta", "dormand_prince"]
+    methods = [
+        "euler",
+        "midpoint",
+        "heun",
+        "runge_kutta",
+        "dormand_prince",
+        ADAPTIVE_METHOD,
+    ]
 
     numerical_texts = LANG_TEXTS[current_language]["numerical_methods"]
 
@@ -244,13 +275,7 @@ async def rounding(update: Update, context: ContextTypes.DEFAULT_TYPE):
     current_rounding = query.data
     context.user_data["rounding"] = current_rounding
 
-    await set_user_settings(
-        update.effective_user.id,
-        context.user_data["method"],
-        context.user_data["rounding"],
-        context.user_data["language"],
-        context.user_data["hints"],
-    )
+    user_settings_store().update(update.effective_user.id, rounding=current_rounding)
 
     await settings_rounding(update, context)
 
@@ -300,13 +325,7 @@ async def language(update: Update, context: ContextTypes.DEFAULT_TYPE):
     current_language = query.data
     context.user_data["language"] = current_language
 
-    await set_user_settings(
-        update.effective_user.id,
-        context.user_data["method"],
-        context.user_data["rounding"],
-        context.user_data["language"],
-        context.user_data["hints"],
-    )
+    user_settings_store().update(update.effective_user.id, language=current_language)
 
     await settings_language(update, context)
 
@@ -351,13 +370,7 @@ async def hints(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
     context.user_data["hints"] = current_hints
 
-    await set_user_settings(
-        update.effective_user.id,
-        context.user_data["method"],
-        context.user_data["rounding"],
-        context.user_data["language"],
-        context.user_data["hints"],
-    )
+    user_settings_store().update(update.effective_user.id, hints=current_hints)
 
     return await settings(update, context)
 
@@ -434,25 +447,36 @@ async def solve_history_details(update: Update, context: ContextTypes.DEFAULT_TY
 
     application = recent_applications[application_index]
     application_id = application.get("id")
-    results = await get_results(application_id)
 
     try:
         parameters = json.loads(application.get("parameters", "{}"))
         order = parameters.get("order", 1)
 
+        plot_graph = await cached_plot(application_id, order, current_language)
+        if plot_graph is None:
+            results = await get_results(application_id, max_points=plot_points(order))
+        else:
+            results = await get_results(application_id, fields=SOLUTION_FIELDS)
+
         method = parameters.get("method", "")
         user_equation = parameters.get("userEquation", "")
         initial_x = parameters.get("initialX", "")
         initial_y = parameters.get("initialY", "")
         reach_point = parameters.get("reachPoint", "")
         step_size = parameters.get("stepSize", "")
+        tolerance = parameters.get("relativeTolerance")
 
-        data = json.loads(results[0].get("data", "{}"))
-        x_values = data.get("xvalues", [])
-        y_values = data.get("yvalues", [])
+        data = results[0]
         solution = data.get("solution", "")
 
-        plot_graph = plot_solution(x_values, y_values, order)
+        if plot_graph is None:
+            plot_graph = await render_cached_plot(
+                application_id,
+                data.get("xvalues", []),
+                data.get("yvalues", []),
+                order,
+                current_language,
+            )
 
         if isinstance(initial_y, list):
             initial_y_str = ", ".join([str(y) for y in initial_y])
@@ -469,17 +493,29 @@ async def solve_history_details(update: Update, context: ContextTypes.DEFAULT_TY
             "dormandPrince": LANG_TEXTS[current_language]["numerical_methods"][
                 "dormand_prince"
             ],
+            "dormandPrinceAdaptive": LANG_TEXTS[current_language]["numerical_methods"][
+                ADAPTIVE_METHOD
+            ],
         }
 
         method_display = method_mapping.get(method, method)
 
+        if tolerance is not None:
+            step_line = (
+                f"<b>{LANG_TEXTS[current_language]['tolerance']}:</b> {tolerance}\n\n"
+            )
+        else:
+            step_line = (
+                f"<b>{LANG_TEXTS[current_language]['step_size']}:</b> {step_size}\n\n"
+            )
+
         details_text = (
             f"<b>{LANG_TEXTS[current_language]['method']}:</b> {method_display}\n"
             f"<b>{LANG_TEXTS[current_language]['equation']}:</b> {user_equation}\n"
             f"<b>{LANG_TEXTS[current_language]['initial_x']}:</b> {initial_x}\n"
             f"<b>{LANG_TEXTS[current_language]['initial_y']}:</b> {initial_y_str}\n"
             f"<b>{LANG_TEXTS[current_language]['reach_point']}:</b> {reach_point}\n"
-            f"<b>{LANG_TEXTS[current_language]['step_size']}:</b> {step_size}\n\n"
+            f"{step_line}"
             f"<b>{LANG_TEXTS[current_language]['solution']}:</b>\n"
             f"{print_solution(solution, order, current_rounding)}"
         )
@@ -493,17 +529,29 @@ async def solve_history_details(update: Update, context: ContextTypes.DEFAULT_TY
             ]
         ]
 
+        if plot_graph is None:
+            await query.edit_message_text(
+                details_text,
+                reply_markup=InlineKeyboardMarkup(keyboard),
+                parse_mode="HTML",
+            )
+            return MENU
+
         media = InputMediaPhoto(
             media=plot_graph, caption=details_text, parse_mode="HTML"
         )
 
         try:
-            await query.edit_message_media(
+            sent_message = await query.edit_message_media(
                 media=media,
                 reply_markup=InlineKeyboardMarkup(keyboard),
                 write_timeout=60,
                 pool_timeout=30,
             )
+            remember_plot_file_id(
+                plot_key(application_id, order, current_language, plot_max_points()),
+                sent_message,
+            )
         except telegram.error.TimedOut:
             logger.warning(
                 "Timeout while sending media for user %s, falling back to text only",
@@ -512,8 +560,6 @@ async def solve_history_details(update: Update, context: ContextTypes.DEFAULT_TY
             await query.edit_message_text(
                 details_text, reply_markup=InlineKeyboardMarkup(keyboard)
             )
-        finally:
-            plot_graph.close()
 
     except Exception as e:
         logger.error(f"Error displaying application details: {e}")
@@ -588,26 +634,51 @@ async def equation(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     current_language = context.user_data.get("language", DEFAULT_LANGUAGE)
 
-    is_valid_symbols, error_message = validate_symbols(update.message.text)
+    tokens = tokenize(update.message.text)
+
+    is_valid_symbols, error_token = validate_symbols(tokens)
     if not is_valid_symbols:
-        logger.info("User %s used unsupported symbol: %s", user.id, error_message)
+        logger.info(
+            "User %s used unsupported symbol: %s at %s",
+            user.id,
+            error_token.text,
+            error_token.position,
+        )
         await update.message.reply_text(
             LANG_TEXTS[current_language]["symbols_error"]
-            + f"{error_message}. "
+            + f"{error_token.text} ("
+            + LANG_TEXTS[current_language]["error_position"]
+            + f"{error_token.position + 1}). "
             + LANG_TEXTS[current_language]["try_again"],
         )
         return EQUATION
 
-    if not validate_parentheses(update.message.text):
-        logger.info("User %s used incorrect parentheses", user.id)
+    is_valid_parentheses, error_token = validate_parentheses(tokens)
+    if not is_valid_parentheses:
+        logger.info(
+            "User %s used incorrect parentheses at %s", user.id, error_token.position
+        )
         await update.message.reply_text(
             LANG_TEXTS[current_language]["parentheses_error"]
             + " "
+            + LANG_TEXTS[current_language]["error_position"]
+            + f"{error_token.position + 1}. "
             + LANG_TEXTS[current_language]["try_again"]
         )
         return EQUATION
 
-    formatted_equation, order = format_equation(update.message.text)
+    try:
+        formatted_equation, order = await format_equation_async(
+            update.message.text, tokens
+        )
+    except asyncio.TimeoutError:
+        logger.info("Equation of %s is too complex to format", user.id)
+        await update.message.reply_text(
+            LANG_TEXTS[current_language]["equation_too_complex"]
+            + " "
+            + LANG_TEXTS[current_language]["try_again"]
+        )
+        return EQUATION
 
     if formatted_equation is None or order is None or order == 0:
         logger.info("User %s used unsupported symbols", user.id)
@@ -671,15 +742,31 @@ async def initial_y(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.message.from_user
     user_input = update.message.text.strip()
 
-    if "," in user_input:
-        splitted_user_input = user_input.split(",")
-    else:
-        splitted_user_input = user_input.split()
+    # Several sets of initial values separated by ";" are solved as an ensemble
+    initial_sets = [
+        initial_set.split(",") if "," in initial_set else initial_set.split()
+        for initial_set in user_input.split(";")
+        if initial_set.strip()
+    ] or [[]]
+    splitted_user_input = [
+        value for initial_set in initial_sets for value in initial_set
+    ]
 
     order = int(context.user_data["order"])
 
     current_language = context.user_data.get("language", DEFAULT_LANGUAGE)
 
+    if len(initial_sets) > MAX_ENSEMBLE_SIZE:
+        logger.info("Too many initial sets by %s: %d", user.id, len(initial_sets))
+        await update.message.reply_text(
+            LANG_TEXTS[current_language]["too_many_initial_sets"]
+            + f"{len(initial_sets)}. "
+            + LANG_TEXTS[current_language]["max_points_allowed"]
+            + f"{MAX_ENSEMBLE_SIZE}. "
+            + LANG_TEXTS[current_language]["try_again"]
+        )
+        return INITIAL_Y
+
     try:
         [float(value) for value in splitted_user_input]
     except ValueError:
@@ -699,11 +786,24 @@ async def initial_y(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return INITIAL_Y
 
-    if len(splitted_user_input) != order:
+    if len(initial_sets) > 1 and context.user_data.get("method") == ADAPTIVE_METHOD:
+        logger.info("Ensemble with the adaptive method by %s", user.id)
+        await update.message.reply_text(
+            LANG_TEXTS[current_language]["ensemble_not_supported"]
+            + " "
+            + LANG_TEXTS[current_language]["try_again"]
+        )
+        return INITIAL_Y
+
+    invalid_set = next(
+        (initial_set for initial_set in initial_sets if len(initial_set) != order),
+        None,
+    )
+    if invalid_set is not None:
         logger.info("Invalid number of initial y values by %s: %s", user.id, user_input)
         await update.message.reply_text(
             LANG_TEXTS[current_language]["invalid_initial_y_count1"]
-            + f"{len(splitted_user_input)}. "
+            + f"{len(invalid_set)}. "
             + LANG_TEXTS[current_language]["invalid_initial_y_count2"]
             + f"{order}. "
             + LANG_TEXTS[current_language]["try_again"],
@@ -711,7 +811,11 @@ async def initial_y(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return INITIAL_Y
 
     logger.info("Initial y of %s: %s", user.id, user_input)
-    context.user_data["initial_y"] = splitted_user_input
+    context.user_data["initial_y"] = initial_sets[0]
+    if len(initial_sets) > 1:
+        context.user_data["ensemble"] = initial_sets
+    else:
+        context.user_data.pop("ensemble", None)
     context.user_data["state"] = REACH_POINT
 
     await send_localized_message(update, context, "enter_reach_point")
@@ -749,6 +853,15 @@ async def reach_point(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 + LANG_TEXTS[current_language]["try_again"]
             )
             return REACH_POINT
+        # The solvers only integrate forward
+        if reach_point_value < initial_x_value:
+            logger.info("Reach point before initial x for %s: %s", user.id, user_input)
+            await update.message.reply_text(
+                LANG_TEXTS[current_language]["reach_point_before_initial"]
+                + " "
+                + LANG_TEXTS[current_language]["try_again"]
+            )
+            return REACH_POINT
     except Exception as e:
         logger.error(
             "Error comparing reach point with initial x for %s: %s", user.id, e
@@ -758,7 +871,10 @@ async def reach_point(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data["reach_point"] = user_input
     context.user_data["state"] = STEP_SIZE
 
-    await send_localized_message(update, context, "enter_step_size")
+    if context.user_data.get("method") == ADAPTIVE_METHOD:
+        await send_localized_message(update, context, "enter_tolerance")
+    else:
+        await send_localized_message(update, context, "enter_step_size")
 
     return STEP_SIZE
 
@@ -769,8 +885,14 @@ async def step_size(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     current_language = context.user_data.get("language", DEFAULT_LANGUAGE)
 
+    if context.user_data.get("method") == ADAPTIVE_METHOD:
+        return await tolerance(update, context)
+    context.user_data.pop("tolerance", None)
+
     try:
         step_value = float(user_input)
+        if not 0 < step_value < math.inf:
+            raise ValueError(step_value)
     except ValueError:
         logger.info("Invalid step size input by %s: %s", user.id, user_input)
         await update.message.reply_text(
@@ -784,6 +906,7 @@ async def step_size(update: Update, context: ContextTypes.DEFAULT_TYPE):
         initial_x_value = float(context.user_data["initial_x"])
         reach_point_value = float(context.user_data["reach_point"])
         num_points = abs(reach_point_value - initial_x_value) / step_value
+        num_points *= len(context.user_data.get("ensemble", [None]))
 
         if num_points > MAX_CALCULATION_POINTS:
             logger.info(
@@ -807,6 +930,37 @@ async def step_size(update: Update, context: ContextTypes.DEFAULT_TYPE):
     return await solution(update, context)
 
 
+async def tolerance(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    user = update.message.from_user
+    user_input = update.message.text.strip()
+
+    current_language = context.user_data.get("language", DEFAULT_LANGUAGE)
+
+    try:
+        tolerance_value = float(user_input)
+        if not MIN_TOLERANCE <= tolerance_value <= MAX_TOLERANCE:
+            raise ValueError(tolerance_value)
+    except ValueError:
+        logger.info("Invalid tolerance input by %s: %s", user.id, user_input)
+        await update.message.reply_text(
+            LANG_TEXTS[current_language]["invalid_tolerance"]
+            + " "
+            + LANG_TEXTS[current_language]["try_again"]
+        )
+        return STEP_SIZE
+
+    # The step size of the adaptive method is the spacing of the output points
+    initial_x_value = float(context.user_data["initial_x"])
+    reach_point_value = float(context.user_data["reach_point"])
+    output_step = abs(reach_point_value - initial_x_value) / ADAPTIVE_OUTPUT_POINTS
+
+    logger.info("Tolerance of %s: %s", user.id, user_input)
+    context.user_data["tolerance"] = user_input
+    context.user_data["step_size"] = repr(output_step)
+
+    return await solution(update, context)
+
+
 async def solution(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if update.edited_message:
         return STEP_SIZE
@@ -816,17 +970,85 @@ async def solution(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     processing_message = await update.message.reply_text("⏳")
 
+    ensemble = context.user_data.get("ensemble")
+
+    singular_point = await asyncio.to_thread(
+        find_singular_point,
+        context.user_data["formatted_equation"],
+        context.user_data["order"],
+        context.user_data["initial_x"],
+        ensemble or context.user_data["initial_y"],
+        context.user_data["reach_point"],
+    )
+    if singular_point is not None:
+        logger.info("Equation of %s is undefined at x = %s", user.id, singular_point)
+        await save_user_settings(context)
+        await processing_message.edit_text(
+            LANG_TEXTS[current_language]["equation_undefined"]
+            + f"{singular_point:g}. "
+            + LANG_TEXTS[current_language]["try_again"],
+            reply_markup=solution_markup(current_language),
+        )
+        return MENU
+
+    # The solution may still avoid the point, so the job is not rejected
+    suspect_point = await asyncio.to_thread(
+        find_suspect_point,
+        context.user_data["formatted_equation"],
+        context.user_data["order"],
+        context.user_data["initial_x"],
+        ensemble or context.user_data["initial_y"],
+        context.user_data["reach_point"],
+    )
+    if suspect_point is not None:
+        logger.warning(
+            "Equation of %s may be undefined at x = %s", user.id, suspect_point
+        )
+        await update.message.reply_text(
+            LANG_TEXTS[current_language]["equation_may_be_undefined"]
+            + f"{suspect_point:g}."
+        )
+
+    initial_sets = ensemble or [context.user_data["initial_y"]]
+
+    if is_local_job(
+        context.user_data["method"],
+        context.user_data["order"],
+        context.user_data["formatted_equation"],
+        context.user_data["initial_x"],
+        context.user_data["reach_point"],
+        context.user_data["step_size"],
+        trajectories=len(initial_sets),
+    ):
+        asyncio.create_task(
+            local_solution_handle(
+                user.id, context, processing_message, current_language
+            )
+        )
+        return MENU
+
     try:
-        application_id = await set_parameters(
-            user_id=user.id,
-            method=context.user_data["method"],
-            order=context.user_data["order"],
-            user_equation=context.user_data["user_equation"],
-            formatted_equation=context.user_data["formatted_equation"],
-            initial_x=context.user_data["initial_x"],
-            initial_y=context.user_data["initial_y"],
-            reach_point=context.user_data["reach_point"],
-            step_size=context.user_data["step_size"],
+        # The user has to exist on the server before submitting an application
+        await user_settings_store().flush(user.id)
+
+        # The solver service takes one state, an ensemble too large for the bot
+        # is submitted as one application per set of initial values
+        application_ids = await asyncio.gather(
+            *(
+                set_parameters(
+                    user_id=user.id,
+                    method=context.user_data["method"],
+                    order=context.user_data["order"],
+                    user_equation=context.user_data["user_equation"],
+                    formatted_equation=context.user_data["formatted_equation"],
+                    initial_x=context.user_data["initial_x"],
+                    initial_y=initial_y,
+                    reach_point=context.user_data["reach_point"],
+                    step_size=context.user_data["step_size"],
+                    tolerance=context.user_data.get("tolerance"),
+                )
+                for initial_y in initial_sets
+            )
         )
     except Exception as e:
         logger.error("Error while setting parameters: %s", e)
@@ -839,18 +1061,31 @@ async def solution(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return MENU
 
-    asyncio.create_task(
-        solution_completion_handle(
-            application_id, context, processing_message, current_language
+    if ensemble is None:
+        asyncio.create_task(
+            solution_completion_handle(
+                application_ids[0], context, processing_message, current_language
+            )
+        )
+    else:
+        asyncio.create_task(
+            ensemble_completion_handle(
+                application_ids, context, processing_message, current_language
+            )
         )
-    )
 
     return MENU
 
 
 async def solution_completion_handle(application_id, context, message, lang):
     try:
-        is_completed = await wait_for_application_completion(application_id)
+        progress_task = asyncio.create_task(
+            show_progress(application_id, message, lang)
+        )
+        try:
+            is_completed = await wait_for_application_completion(application_id)
+        finally:
+            progress_task.cancel()
 
         if not is_completed:
             await message.edit_text(
@@ -861,7 +1096,9 @@ async def solution_completion_handle(application_id, context, message, lang):
             )
             return
 
-        results = await get_results(application_id)
+        results = await get_results(
+            application_id, max_points=plot_points(context.user_data["order"])
+        )
 
         if not results:
             await message.edit_text(
@@ -870,46 +1107,271 @@ async def solution_completion_handle(application_id, context, message, lang):
             )
             return
 
-        data = json.loads(results[0].get("data", "{}"))
+        data = results[0]
 
-        x_values = data.get("xvalues", [])
-        y_values = data.get("yvalues", [])
-        solution = data.get("solution", "")
+        await send_solution(application_id, data, context, message, lang)
 
-        if not solution:
+    except Exception as e:
+        logger.error("Unexpected error in background completion task: %s", e)
+        await message.edit_text(
+            LANG_TEXTS[lang]["server_error"] + " " + LANG_TEXTS[lang]["try_again"],
+            reply_markup=solution_markup(lang),
+        )
+
+
+async def ensemble_completion_handle(application_ids, context, message, lang):
+    """
+    Waits for the applications of an ensemble solved by the solver service
+    and sends their results together, like an ensemble solved in the bot.
+    """
+    try:
+        # The applications run side by side, the last one finishes last
+        progress_task = asyncio.create_task(
+            show_progress(application_ids[-1], message, lang)
+        )
+        try:
+            completed = await asyncio.gather(
+                *(wait_for_application_completion(i) for i in application_ids)
+            )
+        finally:
+            progress_task.cancel()
+
+        if not all(completed):
+            await message.edit_text(
+                LANG_TEXTS[lang]["processing_error"]
+                + " "
+                + LANG_TEXTS[lang]["try_again"],
+                reply_markup=solution_markup(lang),
+            )
+            return
+
+        # Decimation keeps different points of every trajectory,
+        # the curves of an ensemble have to share their x values
+        results = await asyncio.gather(*(get_results(i) for i in application_ids))
+
+        if not all(results):
             await message.edit_text(
                 LANG_TEXTS[lang]["data_error"] + " " + LANG_TEXTS[lang]["try_again"],
                 reply_markup=solution_markup(lang),
             )
             return
 
-        plot_graph = plot_solution(x_values, y_values, context.user_data["order"])
-        print_result = print_solution(
-            solution, context.user_data["order"], context.user_data["rounding"]
+        data = {
+            "solution": [result[0]["solution"] for result in results],
+            "xvalues": results[0][0]["xvalues"],
+            "yvalues": [result[0]["yvalues"] for result in results],
+        }
+
+        await send_solution(None, data, context, message, lang)
+
+    except Exception as e:
+        logger.error("Unexpected error in background ensemble task: %s", e)
+        await message.edit_text(
+            LANG_TEXTS[lang]["server_error"] + " " + LANG_TEXTS[lang]["try_again"],
+            reply_markup=solution_markup(lang),
         )
 
+
+async def show_progress(application_id, message, lang):
+    """
+    Edits the processing message with the progress reported by the solver
+    until the task is cancelled. The message is only edited when the text
+    changes and at most once per PROGRESS_EDIT_INTERVAL.
+    """
+    text = None
+    while True:
+        await asyncio.sleep(PROGRESS_EDIT_INTERVAL)
+
+        progress = application_progress(application_id)
+        if progress is None:
+            continue
+
+        new_text = progress_text(progress, lang)
+        if new_text == text:
+            continue
+
         try:
-            await message.edit_media(
-                media=InputMediaPhoto(plot_graph, caption=print_result),
+            await message.edit_text(new_text)
+            text = new_text
+        except telegram.error.TelegramError as e:
+            logger.warning("Failed to show progress of %s: %s", application_id, e)
+
+
+def progress_text(progress, lang):
+    fraction = min(max(float(progress.get("fraction") or 0), 0.0), 1.0)
+    filled = round(fraction * PROGRESS_BAR_WIDTH)
+    text = f"⏳ {'▰' * filled}{'▱' * (PROGRESS_BAR_WIDTH - filled)} {fraction:.0%}"
+
+    eta = progress.get("eta_seconds")
+    if eta is not None:
+        minutes, seconds = divmod(round(eta), 60)
+        text += f"\n{LANG_TEXTS[lang]['time_left']}: ~{minutes}:{seconds:02d}"
+    return text
+
+
+async def local_solution_handle(user_id, context, message, lang):
+    """
+    Solves a small job in the bot and stores it in the user's history
+    afterwards, so it shows up among the recent applications.
+    """
+    parameters = {
+        key: context.user_data[key]
+        for key in (
+            "method",
+            "order",
+            "user_equation",
+            "formatted_equation",
+            "initial_x",
+            "initial_y",
+            "reach_point",
+            "step_size",
+        )
+    }
+
+    ensemble = context.user_data.get("ensemble")
+
+    try:
+        data = await solve_locally(
+            parameters["method"],
+            parameters["order"],
+            parameters["formatted_equation"],
+            parameters["initial_x"],
+            ensemble or parameters["initial_y"],
+            parameters["reach_point"],
+            parameters["step_size"],
+            ensemble=ensemble is not None,
+        )
+
+        if data is None:
+            await message.edit_text(
+                LANG_TEXTS[lang]["processing_error"]
+                + " "
+                + LANG_TEXTS[lang]["try_again"],
                 reply_markup=solution_markup(lang),
-                write_timeout=60,
-                pool_timeout=30,
             )
-        except telegram.error.TimedOut:
-            await message.edit_text(print_result, reply_markup=solution_markup(lang))
-        finally:
-            plot_graph.close()
+            await save_user_settings(context)
+            return
 
-        await save_user_settings(context)
+        # Ensembles do not fit into the history and are not stored
+        application_id = None
+        if ensemble is None:
+            try:
+                await user_settings_store().flush(user_id)
+                application_id = await save_solution(user_id, data, **parameters)
+            except Exception as e:
+                logger.warning("Failed to store local solution of %s: %s", user_id, e)
+
+        await send_solution(application_id, data, context, message, lang)
 
     except Exception as e:
-        logger.error("Unexpected error in background completion task: %s", e)
+        logger.error("Unexpected error in local solution task: %s", e)
         await message.edit_text(
             LANG_TEXTS[lang]["server_error"] + " " + LANG_TEXTS[lang]["try_again"],
             reply_markup=solution_markup(lang),
         )
 
 
+async def send_solution(application_id, data, context, message, lang):
+    x_values = data.get("xvalues", [])
+    y_values = data.get("yvalues", [])
+    solution = data.get("solution", "")
+
+    if solution is None or len(solution) == 0:
+        await message.edit_text(
+            LANG_TEXTS[lang]["data_error"] + " " + LANG_TEXTS[lang]["try_again"],
+            reply_markup=solution_markup(lang),
+        )
+        return
+
+    plot_graph = await render_plot(x_values, y_values, context.user_data["order"])
+    if context.user_data.get("ensemble"):
+        print_result = print_ensemble_solution(
+            solution,
+            context.user_data["order"],
+            context.user_data["rounding"],
+            MAX_CAPTION_LENGTH,
+        )
+    else:
+        print_result = print_solution(
+            solution, context.user_data["order"], context.user_data["rounding"]
+        )
+
+    if plot_graph is None:
+        await message.edit_text(print_result, reply_markup=solution_markup(lang))
+        await save_user_settings(context)
+        return
+
+    cache_key = None
+    if application_id is not None:
+        cache_key = plot_key(
+            application_id, context.user_data["order"], lang, plot_max_points()
+        )
+        await get_plot_cache().put(cache_key, plot_graph.getvalue())
+
+    try:
+        sent_message = await message.edit_media(
+            media=InputMediaPhoto(plot_graph, caption=print_result),
+            reply_markup=solution_markup(lang),
+            write_timeout=60,
+            pool_timeout=30,
+        )
+        if cache_key is not None:
+            remember_plot_file_id(cache_key, sent_message)
+    except telegram.error.TimedOut:
+        await message.edit_text(print_result, reply_markup=solution_markup(lang))
+    finally:
+        plot_graph.close()
+
+    await save_user_settings(context)
+
+
+def plot_points(order):
+    """
+    Number of points to request for plotting a solution,
+    enough for every variable to be downsampled on its own.
+    """
+    max_points = plot_max_points()
+    return max_points * int(order) if max_points else None
+
+
+async def cached_plot(application_id, order, language):
+    """
+    Returns the plot of a completed application, preferring
+    an already uploaded Telegram file over the cached image.
+    Returns None if it has to be rendered again.
+    """
+    plot_cache = get_plot_cache()
+    cache_key = plot_key(application_id, order, language, plot_max_points())
+
+    file_id = plot_cache.get_file_id(cache_key)
+    if file_id is not None:
+        return file_id
+
+    return await plot_cache.get(cache_key)
+
+
+async def render_cached_plot(application_id, x_values, y_values, order, language):
+    """
+    Renders the plot of a completed application and keeps it in the plot cache.
+    """
+    plot_cache = get_plot_cache()
+    cache_key = plot_key(application_id, order, language, plot_max_points())
+
+    plot_graph = await render_plot(x_values, y_values, order)
+    if plot_graph is None:
+        return None
+
+    png = plot_graph.getvalue()
+    plot_graph.close()
+    await plot_cache.put(cache_key, png)
+    return png
+
+
+def remember_plot_file_id(cache_key, message):
+    if isinstance(message, telegram.Message) and message.photo:
+        get_plot_cache().set_file_id(cache_key, message.photo[-1].file_id)
+
+
 def solution_markup(language):
     return InlineKeyboardMarkup(
         [
@@ -959,6 +1421,17 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return current_state
 
 
+def user_settings_store():
+    return init_settings_store(
+        {
+            "method": DEFAULT_METHOD,
+            "rounding": DEFAULT_ROUNDING,
+            "language": DEFAULT_LANGUAGE,
+            "hints": DEFAULT_HINTS,
+        }
+    )
+
+
 async def save_user_settings(context: ContextTypes.DEFAULT_TYPE):
     keys_to_keep = ["method", "rounding", "language", "hints"]
     for key in list(context.user_data.keys()):
@@ -966,8 +1439,48 @@ async def save_user_settings(context: ContextTypes.DEFAULT_TYPE):
             del context.user_data[key]
 
 
+async def post_init(application: Application):
+    await init_client()
+    user_settings_store()
+    init_equation_cache()
+    application.create_task(init_parse_service().warm_up(load_corpus()))
+    watcher = init_watcher(
+        push_enabled=bool(os.getenv("CALLBACK_PORT") and os.getenv("CALLBACK_SECRET"))
+    )
+    if not await start_callback_server(watcher):
+        logger.info("Completion callbacks disabled, relying on status polling")
+    init_render_service()
+    init_plot_cache()
+
+
+async def post_shutdown(application: Application):
+    await stop_callback_server()
+    await close_watcher()
+    render_stats = close_render_service()
+    if render_stats:
+        logger.info("Render service statistics: %s", render_stats)
+    logger.info("Plot cache statistics: %s", get_plot_cache().stats())
+    settings_stats = await close_settings_store()
+    if settings_stats:
+        logger.info("Settings store statistics: %s", settings_stats)
+    parse_stats = close_parse_service()
+    if parse_stats:
+        logger.info("Parse service statistics: %s", parse_stats)
+    logger.info("Equation cache statistics: %s", equation_cache_stats())
+    logger.info("Spring client cache statistics: %s", cache_stats())
+    stats = await close_client()
+    if stats:
+        logger.info("Spring client pool statistics: %s", stats)
+
+
 def main() -> None:
-    application = Application.builder().token(os.getenv("CLIENT_API_KEY")).build()
+    application = (
+        Application.builder()
+        .token(os.getenv("CLIENT_API_KEY"))
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
 
     conv_handler = ConversationHandler(
         entry_points=[CommandHandler("start", start)],
@@ -987,7 +1500,9 @@ def main() -> None:
                 CallbackQueryHandler(settings_rounding, pattern="^settings_rounding$"),
                 CallbackQueryHandler(settings_language, pattern="^settings_language$"),
                 CallbackQueryHandler(
-                    method, pattern="^(euler|midpoint|heun|runge_kutta|dormand_prince)$"
+                    method,
+                    pattern="^(euler|midpoint|heun|runge_kutta|dormand_prince"
+                    "|dormand_prince_adaptive)$",
                 ),
                 CallbackQueryHandler(rounding, pattern="^(4|6|8|16)$"),
                 CallbackQueryHandler(language, pattern="^(en|ru|zh)$"),
@@ -0,0 +1,140 @@
+import asyncio
+import math
+import os
+
+import numpy as np
+
+from equation.equation_compiler import compile_equation
+from logger import logger
+from solving.numerical_methods import METHODS, create_equation_function
+
+LOCAL_SOLVE_MAX_COST = 10000
+LOCAL_SOLVE_MAX_STEPS = 100000
+REACH_TOLERANCE = 1e-10
+
+
+def solve_cost(method, order, initial_x, reach_point, step_size):
+    """
+    Estimates the work of a job as steps x stages x order.
+    Jobs that can not be estimated cost infinitely much,
+    as do jobs whose approximation point lies behind the initial x,
+    since both solvers only integrate forward.
+    """
+    step_size = float(step_size)
+    if method not in METHODS or not 0 < step_size < math.inf:
+        return math.inf
+
+    span = float(reach_point) - float(initial_x)
+    if not 0 <= span < math.inf:
+        return math.inf
+
+    steps = math.ceil(span / step_size)
+    return steps * METHODS[method][1] * int(order)
+
+
+def is_local_job(
+    method,
+    order,
+    formatted_equation,
+    initial_x,
+    reach_point,
+    step_size,
+    trajectories=1,
+):
+    """
+    Small jobs are solved in the bot, since a round trip to the solver service
+    costs far more than the integration itself.
+    An ensemble costs as much as all of its trajectories together.
+    """
+    max_cost = float(os.getenv("LOCAL_SOLVE_MAX_COST", LOCAL_SOLVE_MAX_COST))
+    cost = solve_cost(method, order, initial_x, reach_point, step_size)
+    if cost * trajectories > max_cost:
+        return False
+
+    return compile_equation(formatted_equation, int(order)) is not None
+
+
+def solve(
+    method, order, formatted_equation, initial_x, initial_y, reach_point, step_size
+):
+    """
+    Integrates the equation with the same loop as SolverService.
+    Returns the solution in the format stored by the solver service,
+    raises FloatingPointError if the equation can not be evaluated
+    and OverflowError if it takes more than LOCAL_SOLVE_MAX_STEPS steps.
+    """
+    order = int(order)
+    step, _ = METHODS[method]
+    f = create_equation_function(compile_equation(formatted_equation, order), order)
+
+    x = float(initial_x)
+    y = np.array(initial_y, dtype=float)
+    reach_point = float(reach_point)
+    h = float(step_size)
+
+    capacity = min(max(math.ceil((reach_point - x) / h) + 1, 1), LOCAL_SOLVE_MAX_STEPS)
+    x_values = np.empty(capacity)
+    y_values = np.empty((capacity, *y.shape))
+
+    count = 0
+    with np.errstate(divide="raise", invalid="raise", over="ignore"):
+        while x < reach_point - REACH_TOLERANCE:
+            if count == LOCAL_SOLVE_MAX_STEPS:
+                raise OverflowError(f"Too many steps required at x = {x}")
+
+            x, y = step(f, x, y, h)
+
+            if count == capacity:
+                capacity *= 2
+                x_values = np.resize(x_values, capacity)
+                y_values = np.resize(y_values, (capacity, *y.shape))
+
+            x_values[count] = x
+            y_values[count] = y
+            count += 1
+
+    return x, y, x_values[:count], y_values[:count]
+
+
+def solve_single(
+    method, order, formatted_equation, initial_x, initial_y, reach_point, step_size
+):
+    x, y, x_values, y_values = solve(
+        method, order, formatted_equation, initial_x, initial_y, reach_point, step_size
+    )
+
+    return {
+        "solution": [x, *y.tolist()],
+        "xvalues": x_values.tolist(),
+        "yvalues": y_values.tolist(),
+    }
+
+
+def solve_ensemble(
+    method, order, formatted_equation, initial_x, initial_ys, reach_point, step_size
+):
+    """
+    Integrates every set of initial values in one batched state array,
+    so each stage evaluates the equation once for the whole ensemble.
+    The solutions and y values are returned per trajectory.
+    """
+    initial_y = np.array(initial_ys, dtype=float).T
+    x, y, x_values, y_values = solve(
+        method, order, formatted_equation, initial_x, initial_y, reach_point, step_size
+    )
+
+    return {
+        "solution": [[x, *column] for column in y.T.tolist()],
+        "xvalues": x_values.tolist(),
+        "yvalues": y_values.transpose(2, 0, 1).tolist(),
+    }
+
+
+async def solve_locally(*args, ensemble=False):
+    try:
+        return await asyncio.to_thread(
+            solve_ensemble if ensemble else solve_single, *args
+        )
+    except (FloatingPointError, ZeroDivisionError, OverflowError) as e:
+        logger.info("Local solve failed: %s", e)
+        return None
@@ -0,0 +1,95 @@
+import numpy as np
+
+# Every stepper mirrors its counterpart in NumericalMethods.java,
+# including the order of the floating point operations,
+# so a local solution matches the one computed by the solver service.
+
+
+def create_equation_function(rhs, order):
+    """
+    Turns the compiled right-hand side of the highest derivative
+    into the first-order system dy/dx = f(x, y).
+    y may also hold a column of states per trajectory of an ensemble,
+    in which case all of them are evaluated at once.
+    """
+
+    def f(x, y):
+        value = rhs(x, y)
+        if np.isnan(value).any():
+            raise FloatingPointError(f"Result is NaN at x = {x}")
+
+        dydt = np.empty_like(y)
+        dydt[: order - 1] = y[1:]
+        dydt[order - 1] = value
+        return dydt
+
+    return f
+
+
+def euler(f, x_0, y_0, h):
+    k1 = f(x_0, y_0)
+    return x_0 + h, y_0 + h * k1
+
+
+def midpoint(f, x_0, y_0, h):
+    k1 = f(x_0, y_0)
+    temp = y_0 + (h / 2) * k1
+    k2 = f(x_0 + h / 2, temp)
+    return x_0 + h, y_0 + h * k2
+
+
+def heun(f, x_0, y_0, h):
+    k1 = f(x_0, y_0)
+    temp = y_0 + h * k1
+    k2 = f(x_0 + h, temp)
+    return x_0 + h, y_0 + (h / 2) * (k1 + k2)
+
+
+def runge_kutta(f, x_0, y_0, h):
+    k1 = h * f(x_0, y_0)
+    temp = y_0 + 0.5 * k1
+    k2 = h * f(x_0 + h / 2, temp)
+    temp = y_0 + 0.5 * k2
+    k3 = h * f(x_0 + h / 2, temp)
+    temp = y_0 + k3
+    k4 = h * f(x_0 + h, temp)
+    return x_0 + h, y_0 + (k1 + 2 * k2 + 2 * k3 + k4) / 6
+
+
+def dormand_prince(f, x_0, y_0, h):
+    k1 = h * f(x_0, y_0)
+    temp = y_0 + (1.0 / 5.0) * k1
+    k2 = h * f(x_0 + h / 5.0, temp)
+    temp = y_0 + ((3.0 / 40.0) * k1 + (9.0 / 40.0) * k2)
+    k3 = h * f(x_0 + h * 3.0 / 10.0, temp)
+    temp = y_0 + (((44.0 / 45.0) * k1 + (-56.0 / 15.0) * k2) + (32.0 / 9.0) * k3)
+    k4 = h * f(x_0 + h * 4.0 / 5.0, temp)
+    temp = y_0 + (
+        ((19372.0 / 6561.0) * k1 + ((-25360.0 / 2187.0) * k2 + (64448.0 / 6561.0) * k3))
+        + (-212.0 / 729.0) * k4
+    )
+    k5 = h * f(x_0 + h * 8.0 / 9.0, temp)
+    temp = y_0 + (
+        (
+            (9017.0 / 3168.0) * k1
+            + ((-355.0 / 33.0) * k2 + ((46732.0 / 5247.0) * k3 + (49.0 / 176.0) * k4))
+        )
+        + (-5103.0 / 18656.0) * k5
+    )
+    k6 = h * f(x_0 + h, temp)
+    return x_0 + h, y_0 + (
+        35.0 / 384.0 * k1
+        + 500.0 / 1113.0 * k3
+        + 125.0 / 192.0 * k4
+        - 2187.0 / 6784.0 * k5
+        + 11.0 / 84.0 * k6
+    )
+
+
+METHODS = {
+    "euler": (euler, 1),
+    "midpoint": (midpoint, 2),
+    "heun": (heun, 2),
+    "runge_kutta": (runge_kutta, 4),
+    "dormand_prince": (dormand_prince, 6),
+}
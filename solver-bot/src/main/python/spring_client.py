@@ -1,17 +1,269 @@
 import asyncio
 import json
 import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 
-from aiohttp import ClientError, ClientTimeout, ClientSession
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector, TraceConfig
+from result_codec import PACKED_MEDIA_TYPE, decode_result, read_frame, results_size
 
 REQUEST_TIMEOUT = 60
 MAX_RETRIES = 3
 RETRY_DELAY = 1
-MAX_DELAY = 10
 
+POOL_LIMIT = 100
+POOL_LIMIT_PER_HOST = 30
+KEEPALIVE_TIMEOUT = 30
 
-async def set_parameters(
-    user_id,
+RESULTS_CACHE_MAX_BYTES = 128 * 1024 * 1024
+APPLICATIONS_CACHE_TTL = 30
+
+METHOD_MAPPING = {
+    "euler": "euler",
+    "midpoint": "midpoint",
+    "heun": "heun",
+    "runge_kutta": "rungeKutta",
+    "dormand_prince": "dormandPrince",
+    "dormand_prince_adaptive": "dormandPrinceAdaptive",
+}
+
+ENDPOINT_TIMEOUTS = {
+    "solve": REQUEST_TIMEOUT,
+    "settings": 10,
+    "applications": 15,
+    "results": REQUEST_TIMEOUT,
+    "status": 5,
+}
+
+
+class SpringClient:
+    """
+    Long-lived HTTP client for the solver service.
+    A single pooled session is shared by all requests,
+    so connections are kept alive between calls.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        limit=POOL_LIMIT,
+        limit_per_host=POOL_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        timeouts=None,
+    ):
+        self.base_url = base_url
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeouts = {**ENDPOINT_TIMEOUTS, **(timeouts or {})}
+
+        self._session = None
+        self._stats = {
+            "requests": 0,
+            "failures": 0,
+            "in_flight": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+        }
+
+    async def start(self):
+        if self._session is not None:
+            return
+
+        trace_config = TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+
+        connector = TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        self._session = ClientSession(
+            connector=connector,
+            timeout=ClientTimeout(total=REQUEST_TIMEOUT),
+            trace_configs=[trace_config],
+        )
+
+    async def close(self):
+        if self._session is None:
+            return
+
+        await self._session.close()
+        self._session = None
+
+    @asynccontextmanager
+    async def request(self, method, endpoint, path, **kwargs):
+        if self._session is None:
+            await self.start()
+
+        timeout = ClientTimeout(total=self.timeouts.get(endpoint, REQUEST_TIMEOUT))
+
+        self._stats["requests"] += 1
+        self._stats["in_flight"] += 1
+        try:
+            async with self._session.request(
+                method, f"{self.base_url}{path}", timeout=timeout, **kwargs
+            ) as response:
+                yield response
+        except (ClientError, asyncio.TimeoutError):
+            self._stats["failures"] += 1
+            raise
+        finally:
+            self._stats["in_flight"] -= 1
+
+    def stats(self):
+        return {
+            **self._stats,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "keepalive_timeout": self.keepalive_timeout,
+        }
+
+    async def _on_connection_create(self, session, context, params):
+        self._stats["connections_created"] += 1
+
+    async def _on_connection_reuse(self, session, context, params):
+        self._stats["connections_reused"] += 1
+
+
+class ResultsCache:
+    """
+    LRU cache of completed application results.
+    Results never change once an application is completed,
+    so entries are only evicted when the byte budget is exceeded.
+    Entries are keyed by the application together with the requested
+    max_points and fields, since each of them returns different data.
+    """
+
+    def __init__(self, max_bytes=RESULTS_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, data, size):
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+
+        self._entries[key] = (data, size)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+
+class ApplicationsCache:
+    """
+    Short-lived per-user cache of the recent applications list.
+    """
+
+    def __init__(self, ttl=APPLICATIONS_CACHE_TTL):
+        self.ttl = ttl
+
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        entry = self._entries.get(user_id)
+        if entry is None or entry[1] < time.monotonic():
+            self._entries.pop(user_id, None)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry[0]
+
+    def put(self, user_id, applications):
+        self._entries[user_id] = (applications, time.monotonic() + self.ttl)
+
+    def invalidate(self, user_id):
+        self._entries.pop(user_id, None)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+        }
+
+
+results_cache = ResultsCache()
+applications_cache = ApplicationsCache()
+
+client = None
+
+
+async def init_client():
+    global client, results_cache, applications_cache
+
+    if client is None:
+        results_cache = ResultsCache(
+            int(os.getenv("RESULTS_CACHE_MAX_BYTES", RESULTS_CACHE_MAX_BYTES))
+        )
+        applications_cache = ApplicationsCache(
+            float(os.getenv("APPLICATIONS_CACHE_TTL", APPLICATIONS_CACHE_TTL))
+        )
+        client = SpringClient(
+            os.getenv("CLIENT_API_URL"),
+            limit=int(os.getenv("CLIENT_POOL_LIMIT", POOL_LIMIT)),
+            limit_per_host=int(
+                os.getenv("CLIENT_POOL_LIMIT_PER_HOST", POOL_LIMIT_PER_HOST)
+            ),
+            keepalive_timeout=float(
+                os.getenv("CLIENT_KEEPALIVE_TIMEOUT", KEEPALIVE_TIMEOUT)
+            ),
+        )
+
+    await client.start()
+    return client
+
+
+async def close_client():
+    global client
+
+    if client is None:
+        return None
+
+    stats = client.stats()
+    await client.close()
+    client = None
+    return stats
+
+
+async def get_client():
+    if client is None:
+        return await init_client()
+    return client
+
+
+def solver_request(
     method,
     order,
     user_equation,
@@ -20,17 +272,10 @@ async def set_parameters(
     initial_y,
     reach_point,
     step_size,
+    tolerance=None,
 ):
-    method_mapping = {
-        "euler": "euler",
-        "midpoint": "midpoint",
-        "heun": "heun",
-        "runge_kutta": "rungeKutta",
-        "dormand_prince": "dormandPrince",
-    }
-
-    payload = {
-        "method": method_mapping.get(method, "euler"),
+    request = {
+        "method": METHOD_MAPPING.get(method, "euler"),
         "order": int(order),
         "userEquation": user_equation,
         "formattedEquation": formatted_equation,
@@ -40,15 +285,47 @@ async def set_parameters(
         "stepSize": float(step_size),
     }
 
+    if tolerance is not None:
+        request["relativeTolerance"] = float(tolerance)
+        request["absoluteTolerance"] = float(tolerance)
+
+    return request
+
+
+async def set_parameters(
+    user_id,
+    method,
+    order,
+    user_equation,
+    formatted_equation,
+    initial_x,
+    initial_y,
+    reach_point,
+    step_size,
+    tolerance=None,
+):
+    payload = solver_request(
+        method,
+        order,
+        user_equation,
+        formatted_equation,
+        initial_x,
+        initial_y,
+        reach_point,
+        step_size,
+        tolerance,
+    )
+
+    spring_client = await get_client()
+
     for attempt in range(MAX_RETRIES):
         try:
-            timeout = ClientTimeout(total=REQUEST_TIMEOUT)
-            async with ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    f"{os.getenv('CLIENT_API_URL')}/users/{user_id}/solve", json=payload
-                ) as response:
-                    response.raise_for_status()
-                    return await response.json()
+            async with spring_client.request(
+                "POST", "solve", f"/users/{user_id}/solve", json=payload
+            ) as response:
+                response.raise_for_status()
+                applications_cache.invalidate(user_id)
+                return await response.json()
         except (ClientError, asyncio.TimeoutError) as e:
             if attempt < MAX_RETRIES - 1:
                 await asyncio.sleep(RETRY_DELAY)
@@ -56,6 +333,30 @@ async def set_parameters(
             raise e
 
 
+async def save_solution(user_id, data, **parameters):
+    """
+    Stores a solution computed by the bot in the user's history
+    and returns the id of the created application.
+    The parameters are the same as for set_parameters.
+    """
+    payload = {
+        "request": solver_request(**parameters),
+        "solution": {
+            "solution": data["solution"],
+            "xValues": data["xvalues"],
+            "yValues": data["yvalues"],
+        },
+    }
+
+    spring_client = await get_client()
+    async with spring_client.request(
+        "POST", "solve", f"/users/{user_id}/solutions", json=payload
+    ) as response:
+        response.raise_for_status()
+        applications_cache.invalidate(user_id)
+        return await response.json()
+
+
 async def set_user_settings(user_id, method, rounding, language, hints):
     payload = {
         "method": method,
@@ -64,95 +365,120 @@ async def set_user_settings(user_id, method, rounding, language, hints):
         "hints": hints,
     }
 
-    timeout = ClientTimeout(total=REQUEST_TIMEOUT)
-    async with ClientSession(timeout=timeout) as session:
-        async with session.post(
-            f"{os.getenv('CLIENT_API_URL')}/users/{user_id}/settings", params=payload
-        ) as response:
-            response.raise_for_status()
-            return await response.text()
-
-
-async def get_user_settings(user_id, method, rounding, language, hints):
-    timeout = ClientTimeout(total=REQUEST_TIMEOUT)
-    async with ClientSession(timeout=timeout) as session:
-        async with session.get(
-            f"{os.getenv('CLIENT_API_URL')}/users/{user_id}/settings"
-        ) as response:
-            if response.status == 404:
-                return {
-                    "method": method,
-                    "rounding": rounding,
-                    "language": language,
-                    "hints": hints,
-                }
-
-            response.raise_for_status()
-            text = await response.text()
-            try:
-                data = json.loads(text)
-            except json.JSONDecodeError:
-                return text
-            return data
+    spring_client = await get_client()
+    async with spring_client.request(
+        "POST", "settings", f"/users/{user_id}/settings", params=payload
+    ) as response:
+        response.raise_for_status()
+        return await response.text()
+
+
+async def get_user_settings(user_id):
+    spring_client = await get_client()
+    async with spring_client.request(
+        "GET", "settings", f"/users/{user_id}/settings"
+    ) as response:
+        if response.status == 404:
+            return None
+
+        response.raise_for_status()
+        text = await response.text()
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return text
+        return data
 
 
 async def get_recent_applications(user_id):
-    timeout = ClientTimeout(total=REQUEST_TIMEOUT)
-    async with ClientSession(timeout=timeout) as session:
-        async with session.get(
-            f"{os.getenv('CLIENT_API_URL')}/users/{user_id}/applications"
-        ) as response:
-            if response.status == 404:
-                return []
-
-            response.raise_for_status()
-            text = await response.text()
-            try:
-                data = json.loads(text)
-            except json.JSONDecodeError:
-                return text
-            return data
-
-
-async def get_results(application_id):
-    timeout = ClientTimeout(total=REQUEST_TIMEOUT)
-    async with ClientSession(timeout=timeout) as session:
-        async with session.get(
-            f"{os.getenv('CLIENT_API_URL')}/applications/{application_id}/results"
-        ) as response:
-            response.raise_for_status()
-            text = await response.text()
-            try:
-                data = json.loads(text)
-            except json.JSONDecodeError:
-                return text
-            return data
+    cached = applications_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    spring_client = await get_client()
+    async with spring_client.request(
+        "GET", "applications", f"/users/{user_id}/applications"
+    ) as response:
+        if response.status == 404:
+            applications_cache.put(user_id, [])
+            return []
+
+        response.raise_for_status()
+        text = await response.text()
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return text
+        applications_cache.put(user_id, data)
+        return data
+
+
+async def get_results(application_id, max_points=None, fields=None):
+    """
+    Returns the results of an application with the solution,
+    x values and y values decoded into NumPy arrays.
+    The packed binary representation is preferred over JSON.
+    max_points lets the solver service decimate the trajectory,
+    fields=("solution",) leaves the trajectory out entirely.
+    """
+    fields = tuple(fields) if fields else None
+    cache_key = (application_id, max_points, fields)
+
+    cached = results_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    params = {}
+    if max_points is not None:
+        params["max_points"] = max_points
+    if fields is not None:
+        params["fields"] = ",".join(fields)
+
+    spring_client = await get_client()
+    async with spring_client.request(
+        "GET",
+        "results",
+        f"/applications/{application_id}/results",
+        params=params,
+        headers={"Accept": f"{PACKED_MEDIA_TYPE}, application/json;q=0.5"},
+    ) as response:
+        response.raise_for_status()
+
+        if response.content_type == PACKED_MEDIA_TYPE:
+            data = [await read_frame(response.content)]
+        else:
+            data = [
+                decode_result(result) for result in json.loads(await response.read())
+            ]
+
+        if data:
+            results_cache.put(cache_key, data, results_size(data))
+        return data
 
 
 async def get_application_status(application_id):
-    timeout = ClientTimeout(total=REQUEST_TIMEOUT)
-    async with ClientSession(timeout=timeout) as session:
-        async with session.get(
-            f"{os.getenv('CLIENT_API_URL')}/applications/{application_id}/status"
-        ) as response:
-            response.raise_for_status()
-            return await response.text()
+    spring_client = await get_client()
+    async with spring_client.request(
+        "GET", "status", f"/applications/{application_id}/status"
+    ) as response:
+        response.raise_for_status()
+        return await response.text()
 
 
-async def wait_for_application_completion(application_id):
-    current_delay = RETRY_DELAY
+async def get_application_statuses(application_ids):
+    spring_client = await get_client()
+    async with spring_client.request(
+        "GET",
+        "status",
+        "/applications/status",
+        params={"ids": ",".join(map(str, application_ids))},
+    ) as response:
+        response.raise_for_status()
+        return await response.json()
 
-    for _ in range(REQUEST_TIMEOUT):
-        try:
-            status = await get_application_status(application_id)
-            if status == "completed":
-                return True
-            elif status == "in_progress":
-                current_delay = min(current_delay * 1.5, MAX_DELAY)
-            elif status == "error":
-                return False
-            await asyncio.sleep(current_delay)
-        except Exception:
-            await asyncio.sleep(current_delay)
-
-    return False
+
+def cache_stats():
+    return {
+        "results": results_cache.stats(),
+        "applications": applications_cache.stats(),
+    }
@@ -0,0 +1,202 @@
+import asyncio
+import importlib
+import multiprocessing
+import signal
+
+# Sent by a worker when it takes a job off its pipe
+STARTED = "started"
+
+# A job whose worker died before taking it is moved to another worker
+START_ATTEMPTS = 3
+
+
+class WorkerDied(Exception):
+    """
+    The worker process exited while running a job,
+    or every worker tried died before taking it.
+    """
+
+
+def serve(connection, preload):
+    """
+    Main loop of a worker process: runs one job at a time
+    and replies with STARTED, then with (True, result) or (False, error).
+    """
+    # The bot handles Ctrl+C and stops the workers itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for module in preload:
+        importlib.import_module(module)
+
+    while True:
+        try:
+            function, args = connection.recv()
+        except EOFError:
+            return
+
+        connection.send(STARTED)
+        try:
+            reply = (True, function(*args))
+        except Exception as e:
+            reply = (False, e)
+
+        try:
+            connection.send(reply)
+        except Exception as e:
+            # The result or the error could not be pickled
+            connection.send((False, RuntimeError(repr(e))))
+
+
+async def wait_started(call, started):
+    """
+    Waits until the worker takes the job, or raises the error
+    that ended the call before it did.
+    """
+    waiter = asyncio.ensure_future(started.wait())
+    try:
+        await asyncio.wait({call, waiter}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+
+    if not started.is_set():
+        call.result()
+
+
+class Worker:
+    """
+    A worker process and the parent's end of its pipe.
+    """
+
+    def __init__(self, context, preload):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=serve, args=(child, preload), daemon=True)
+        self.process.start()
+        child.close()
+
+    async def call(self, function, args, started):
+        """
+        Sends the job and returns the worker's reply,
+        started is set once the worker has taken the job.
+        """
+        await asyncio.to_thread(self.connection.send, (function, args))
+        if await asyncio.to_thread(self.connection.recv) != STARTED:
+            raise RuntimeError("Worker did not start the job")
+        started.set()
+
+        return await asyncio.to_thread(self.connection.recv)
+
+    def kill(self):
+        self.process.kill()
+
+    def close(self):
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool:
+    """
+    Runs jobs in a fixed number of worker processes, one job per worker.
+    A job that misses its deadline or is cancelled while running
+    has its own worker killed and replaced, other jobs are not affected.
+    Modules in preload are imported by every worker before its first job,
+    so that the import is not counted against the deadline.
+    """
+
+    def __init__(self, workers, preload=()):
+        self.workers = workers
+        self.preload = tuple(preload)
+
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = None
+        self._busy = set()
+        self._stats = {"restarts": 0}
+
+    def start(self):
+        if self._idle is not None:
+            return
+
+        self._idle = asyncio.Queue()
+        for _ in range(self.workers):
+            self._idle.put_nowait(Worker(self._context, self.preload))
+
+    def stop(self):
+        if self._idle is None:
+            return
+
+        while not self._idle.empty():
+            worker = self._idle.get_nowait()
+            worker.kill()
+            worker.close()
+        # Their jobs see the pipe close and clean up after themselves
+        for worker in self._busy:
+            worker.kill()
+
+        self._idle = None
+
+    def stats(self):
+        return {**self._stats, "workers": self.workers}
+
+    async def run(self, function, *args, timeout=None):
+        """
+        Returns function(*args) computed in a worker, re-raising its errors.
+        Raises asyncio.TimeoutError if the job itself ran longer than
+        timeout seconds, waiting for a free worker is not counted.
+        """
+        if self._idle is None:
+            self.start()
+        idle = self._idle
+
+        for _ in range(START_ATTEMPTS):
+            worker = await idle.get()
+            self._busy.add(worker)
+
+            started = asyncio.Event()
+            call = asyncio.ensure_future(worker.call(function, args, started))
+            try:
+                await wait_started(call, started)
+            except (EOFError, OSError):
+                # The worker died before taking the job, try another one
+                self._replace(worker, call, idle)
+                continue
+            except BaseException:
+                self._replace(worker, call, idle)
+                raise
+
+            try:
+                # The deadline starts when the worker takes the job
+                ok, value = await asyncio.wait_for(asyncio.shield(call), timeout)
+            except asyncio.TimeoutError:
+                # TimeoutError is an OSError, it must not look like a dead worker
+                self._replace(worker, call, idle)
+                raise
+            except (EOFError, OSError):
+                self._replace(worker, call, idle)
+                raise WorkerDied() from None
+            except BaseException:
+                # Cancelled by the caller
+                self._replace(worker, call, idle)
+                raise
+
+            self._busy.discard(worker)
+            idle.put_nowait(worker)
+
+            if not ok:
+                raise value
+            return value
+
+        raise WorkerDied()
+
+    def _replace(self, worker, call, idle):
+        self._busy.discard(worker)
+        worker.kill()
+
+        def cleanup(call):
+            if not call.cancelled():
+                call.exception()
+            worker.close()
+
+        # The call returns once the process is gone and its pipe is closed
+        call.add_done_callback(cleanup)
+
+        if self._idle is idle:
+            self._stats["restarts"] += 1
+            idle.put_nowait(Worker(self._context, self.preload))
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The bot runs from its source directory, which holds the top-level modules
+sys.path.insert(0, str(Path(__file__).parents[2] / "main" / "python"))
@@ -0,0 +1,97 @@
+import asyncio
+
+import callback_server
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from callback_server import CALLBACK_PATH, CallbackServer
+
+SECRET = "secret"
+PATH = "/api/callbacks/applications/7/status"
+
+
+class Watcher:
+    def __init__(self):
+        self.resolved = []
+
+    def resolve(self, application_id, status):
+        self.resolved.append((application_id, status))
+
+
+def post(secret, path=PATH, **kwargs):
+    """
+    Posts to a callback server with the given secret and returns
+    the response status and the statuses the watcher received.
+    """
+    watcher = Watcher()
+
+    async def run():
+        server = CallbackServer(watcher, port=0, secret=secret)
+        app = web.Application()
+        app.router.add_post(CALLBACK_PATH, server._handle_status)
+
+        async with TestClient(TestServer(app)) as client:
+            response = await client.post(path, **kwargs)
+            return response.status
+
+    return asyncio.run(run()), watcher.resolved
+
+
+def test_accepts_completed_status():
+    status, resolved = post(
+        SECRET, headers={"X-Callback-Secret": SECRET}, json={"status": "completed"}
+    )
+    assert status == 204
+    assert resolved == [(7, "completed")]
+
+
+@pytest.mark.parametrize("header", [None, "", "wrong"])
+def test_rejects_missing_or_wrong_secret(header):
+    headers = {} if header is None else {"X-Callback-Secret": header}
+    status, resolved = post(SECRET, headers=headers, json={"status": "completed"})
+    assert status == 403
+    assert resolved == []
+
+
+def test_rejects_everything_without_configured_secret():
+    status, resolved = post(
+        "", headers={"X-Callback-Secret": ""}, json={"status": "completed"}
+    )
+    assert status == 403
+    assert resolved == []
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"json": ["completed"]},
+        {"json": "completed"},
+        {"json": {}},
+        {"json": {"status": 1}},
+        {"json": {"status": "solving"}},
+        {"data": "not json"},
+    ],
+)
+def test_rejects_invalid_payload(kwargs):
+    status, resolved = post(SECRET, headers={"X-Callback-Secret": SECRET}, **kwargs)
+    assert status == 400
+    assert resolved == []
+
+
+def test_rejects_invalid_application_id():
+    status, resolved = post(
+        SECRET,
+        path="/api/callbacks/applications/abc/status",
+        headers={"X-Callback-Secret": SECRET},
+        json={"status": "completed"},
+    )
+    assert status == 400
+    assert resolved == []
+
+
+def test_does_not_start_without_secret(monkeypatch):
+    monkeypatch.setenv("CALLBACK_PORT", "0")
+    monkeypatch.delenv("CALLBACK_SECRET", raising=False)
+
+    assert not asyncio.run(callback_server.start_callback_server(Watcher()))
+    assert callback_server.server is None
@@ -0,0 +1,26 @@
+import pytest
+from equation.equation_compiler import find_singular_point, find_suspect_point
+
+
+def test_equation_of_x_is_checked_on_the_grid():
+    assert find_singular_point("1/(x - 1)", 1, 0, [1], 63) == 1.0
+    assert find_suspect_point("1/(x - 1)", 1, 0, [1], 63) is None
+
+
+def test_equation_of_y_is_only_rejected_at_the_initial_point():
+    assert find_singular_point("y[0]/x", 1, 0, [1], 2) == 0.0
+    assert find_singular_point("sqrt(1 - x)*y[0]", 1, 0, [1], 2) is None
+
+
+def test_equation_of_y_is_suspected_on_the_grid():
+    suspect = find_suspect_point("sqrt(1 - x)*y[0]", 1, 0, [1], 2)
+
+    assert suspect == pytest.approx(2 * 32 / 63)
+    assert find_suspect_point("x*y[0]", 1, 0, [1], 2) is None
+
+
+def test_ensemble_reports_the_closest_suspect_point():
+    # With y = 1 the equation fails above x = 1, with y = 0 it never does
+    suspect = find_suspect_point("sqrt(y[0] - y[0]*x)", 1, 0, [[0], [1]], 2)
+
+    assert suspect == pytest.approx(2 * 32 / 63)
@@ -0,0 +1,29 @@
+import pytest
+import sympy as sp
+from equation.equation_cache import load_corpus
+from equation.equation_parser import (
+    get_equation_order,
+    parse_equation,
+    solve_for_derivative,
+)
+
+EQUATIONS = load_corpus() + [
+    "y' = x*y''",
+    "y'' + y' = y'''",
+    "y^(5) + y''' = cos(x)",
+    "y'' * x = y",
+    "(1+x^2)*y' = x*y",
+    "sin(x)*y'' + cos(x)*y' = y",
+    "exp(x)*y' = y^2 + 1",
+    "y'*y = x",
+    "x^2*y''' + x*y' = sin(x)",
+    "y'^2 = x",
+]
+
+
+@pytest.mark.parametrize("text", EQUATIONS)
+def test_isolated_derivative_matches_sp_solve(text):
+    eq, y, x = parse_equation(text)
+    derivative = y.diff(x, get_equation_order(eq))
+
+    assert solve_for_derivative(eq, derivative) == sp.solve(eq, derivative)[0]
@@ -0,0 +1,22 @@
+import pytest
+from equation.function_replacer import replace_math_functions
+
+
+@pytest.mark.parametrize(
+    "equation, expected",
+    [
+        ("tg(x)*y[0] + ctg(y[1])", "tan(x)*y[0] + cot(y[1])"),
+        ("sh(x) + arcsin(y[0])", "sinh(x) + asin(y[0])"),
+        ("coth(x + 1) - y[0]", "(cosh(x + 1) / sinh(x + 1)) - y[0]"),
+        ("acot(y[0])", "(atan(1 / y[0]))"),
+        ("acot(x^2)", "(atan(1 / x^2))"),
+        ("acot(2*x)", "(atan(1 / (2*x)))"),
+        (
+            "coth(sin(x) + (y[0] + 1))",
+            "(cosh(sin(x) + (y[0] + 1)) / sinh(sin(x) + (y[0] + 1)))",
+        ),
+        ("arcctg(cth(tg(x)))", "(atan(1 / (cosh(tan(x)) / sinh(tan(x)))))"),
+    ],
+)
+def test_replace_math_functions(equation, expected):
+    assert replace_math_functions(equation) == expected
@@ -0,0 +1,113 @@
+import pytest
+from solving.local_solver import (
+    is_local_job,
+    solve_cost,
+    solve_ensemble,
+    solve_single,
+)
+
+# Final points computed by NumericalMethods.java with the same equations,
+# initial values, step size 0.1 and approximation point 2
+SERVER_SOLUTIONS = {
+    (1, "euler"): [2.0000000000000004, 1.2431533091811389],
+    (1, "midpoint"): [2.0000000000000004, 1.2716449150041687],
+    (1, "heun"): [2.0000000000000004, 1.2716449150041687],
+    (1, "runge_kutta"): [2.0000000000000004, 1.2706710568435817],
+    (1, "dormand_prince"): [2.0000000000000004, 1.270670568252337],
+    (2, "euler"): [2.0000000000000004, -0.45301865001711583, -1.0074542881365074],
+    (2, "midpoint"): [2.0000000000000004, -0.41927120244992866, -0.9081364311401705],
+    (2, "heun"): [2.0000000000000004, -0.41927120244992866, -0.9081364311401705],
+    (2, "runge_kutta"): [
+        2.0000000000000004,
+        -0.41614526873411334,
+        -0.9092979917935007,
+    ],
+    (2, "dormand_prince"): [
+        2.0000000000000004,
+        -0.41614683512494965,
+        -0.9092974214354939,
+    ],
+    (3, "euler"): [
+        2.0000000000000004,
+        1.957985329371613,
+        0.8551041056227552,
+        -0.3760230476706216,
+    ],
+    (3, "midpoint"): [
+        2.0000000000000004,
+        1.9383184251261198,
+        0.8257938670029484,
+        -0.39091321649507593,
+    ],
+    (3, "heun"): [
+        2.0000000000000004,
+        1.9378679959633012,
+        0.8250354241710554,
+        -0.3917303265772266,
+    ],
+    (3, "runge_kutta"): [
+        2.0000000000000004,
+        1.9372062586999652,
+        0.8250718015692827,
+        -0.3900283855058465,
+    ],
+    (3, "dormand_prince"): [
+        2.0000000000000004,
+        1.9372068689998765,
+        0.8250714839780329,
+        -0.3900279158785262,
+    ],
+}
+
+EQUATIONS = {
+    1: ("x - y[0]", [1.0]),
+    2: ("-y[0]", [1.0, 0.0]),
+    3: ("sin(x) - y[2] - y[0]", [0.0, 1.0, 0.0]),
+}
+
+TOLERANCE = 1e-12
+
+
+@pytest.mark.parametrize("order, method", sorted(SERVER_SOLUTIONS))
+def test_local_solution_matches_server(order, method):
+    equation, initial_y = EQUATIONS[order]
+
+    data = solve_single(method, order, equation, 0, initial_y, 2, 0.1)
+
+    assert data["solution"] == pytest.approx(
+        SERVER_SOLUTIONS[order, method], rel=TOLERANCE, abs=TOLERANCE
+    )
+    assert len(data["xvalues"]) == len(data["yvalues"]) == 20
+    assert data["yvalues"][-1] == data["solution"][1:]
+
+
+@pytest.mark.parametrize("method", ["euler", "runge_kutta", "dormand_prince"])
+def test_ensemble_matches_single_solutions(method):
+    equation, initial_y = EQUATIONS[2]
+    shifted_y = [2.0, -1.0]
+
+    ensemble = solve_ensemble(method, 2, equation, 0, [initial_y, shifted_y], 2, 0.1)
+
+    for solution, y in zip(ensemble["solution"], [initial_y, shifted_y]):
+        single = solve_single(method, 2, equation, 0, y, 2, 0.1)
+        assert solution == pytest.approx(single["solution"], rel=TOLERANCE)
+
+
+@pytest.mark.parametrize("step_size", [-0.1, 0, "0", "nan", "inf"])
+def test_invalid_step_size_is_never_local(step_size):
+    assert solve_cost("euler", 1, 0, 1, step_size) == float("inf")
+
+
+@pytest.mark.parametrize("reach_point", [-1, "-0.5", "nan", "inf"])
+def test_reach_point_behind_initial_x_is_never_local(reach_point):
+    assert solve_cost("euler", 1, 0, reach_point, 0.1) == float("inf")
+
+
+def test_ensemble_is_routed_by_combined_cost(monkeypatch):
+    monkeypatch.setenv("LOCAL_SOLVE_MAX_COST", "100")
+    job = ("runge_kutta", 1, "x - y[0]", 0, 2, 0.1)
+
+    # 20 steps of 4 stages cost 80
+    assert is_local_job(*job)
+    assert is_local_job(*job, trajectories=1)
+    assert not is_local_job(*job, trajectories=2)
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from equation.equation_cache import get_equation_cache, init_equation_cache
+from equation.equation_parser import normalize_equation
+from equation.parse_service import TIMED_OUT, ParseService
+
+SLOW_EQUATION = "y' = 9^9^9^9 + y"
+QUICK_EQUATION = "y' = x + y"
+
+
+def run(coroutine_function, workers=1, timeout=0.6):
+    async def main():
+        init_equation_cache()
+        service = ParseService(workers=workers, timeout=timeout)
+        service.start()
+        try:
+            return await coroutine_function(service)
+        finally:
+            service.stop()
+
+    return asyncio.run(main())
+
+
+def test_first_equation_on_fresh_worker_does_not_time_out():
+    # Importing SymPy in a spawned worker alone takes about the deadline
+    async def jobs(service):
+        return await service.format(QUICK_EQUATION)
+
+    formatted_equation, order = run(jobs, timeout=0.3)
+
+    assert order == 1
+    assert formatted_equation
+
+
+def test_equation_queued_behind_slow_one_is_not_cached_as_timed_out():
+    async def jobs(service):
+        slow = asyncio.ensure_future(service.format(SLOW_EQUATION))
+        await asyncio.sleep(0)
+        quick = await service.format(QUICK_EQUATION)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await slow
+        # The cached timeout is answered without a worker
+        with pytest.raises(asyncio.TimeoutError):
+            await service.format(SLOW_EQUATION)
+
+        return quick, service.stats()
+
+    (formatted_equation, order), stats = run(jobs)
+    equation_cache = get_equation_cache()
+
+    assert order == 1
+    assert equation_cache.get(normalize_equation(QUICK_EQUATION)) == (
+        formatted_equation,
+        order,
+    )
+    assert equation_cache.get(normalize_equation(SLOW_EQUATION)) is TIMED_OUT
+    assert stats["timeouts"] == 1
+    assert stats["restarts"] == 1
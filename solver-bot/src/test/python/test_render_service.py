@@ -0,0 +1,31 @@
+import asyncio
+
+import numpy as np
+from plotting.render_service import RenderService
+
+X_VALUES = np.linspace(0, 1, 50)
+Y_VALUES = np.column_stack([np.sin(X_VALUES), np.cos(X_VALUES)])
+
+
+def test_timeout_kills_worker_and_frees_slot():
+    async def run():
+        service = RenderService(workers=1, concurrency=1, timeout=0.01)
+        service.start()
+        try:
+            # Spawning a worker alone takes longer than the deadline
+            assert await service.render(X_VALUES, Y_VALUES, 2) is None
+
+            service.timeout = 60
+            png = await service.render(X_VALUES, Y_VALUES, 2)
+            return png, service.stats(), service._semaphore.locked()
+        finally:
+            service.stop()
+
+    png, stats, locked = asyncio.run(run())
+
+    assert png.getvalue().startswith(b"\x89PNG")
+    assert stats["timeouts"] == 1
+    assert stats["restarts"] == 1
+    assert stats["completed"] == 1
+    assert stats["running"] == 0
+    assert not locked
@@ -0,0 +1,93 @@
+import asyncio
+import math
+import os
+import time
+
+import pytest
+from worker_pool import WorkerDied, WorkerPool
+
+
+def run(coroutine_function, workers=1):
+    """
+    Runs the coroutine function with a started pool
+    and returns its result and the pool's restart count.
+    """
+
+    async def main():
+        pool = WorkerPool(workers)
+        pool.start()
+        try:
+            return await coroutine_function(pool), pool.stats()["restarts"]
+        finally:
+            pool.stop()
+
+    return asyncio.run(main())
+
+
+def test_returns_result_and_raises_job_errors():
+    async def jobs(pool):
+        assert await pool.run(math.sqrt, 4.0) == 2.0
+        with pytest.raises(ValueError):
+            await pool.run(math.sqrt, -1.0)
+        return await pool.run(math.hypot, 3.0, 4.0)
+
+    assert run(jobs) == (5.0, 0)
+
+
+def test_timeout_kills_only_its_own_worker():
+    async def jobs(pool):
+        slow = pool.run(time.sleep, 10, timeout=0.5)
+        other = pool.run(time.sleep, 1.5, timeout=10)
+        return await asyncio.gather(slow, other, return_exceptions=True)
+
+    (slow, other), restarts = run(jobs, workers=2)
+
+    assert isinstance(slow, asyncio.TimeoutError)
+    assert other is None
+    assert restarts == 1
+
+
+def test_deadline_starts_when_worker_takes_the_job():
+    async def jobs(pool):
+        # Spawning the worker is not part of the first job either
+        await pool.run(time.sleep, 0, timeout=0.5)
+
+        slow = asyncio.ensure_future(pool.run(time.sleep, 1, timeout=5))
+        await asyncio.sleep(0.1)
+        # Waits about a second for the only worker
+        quick = await pool.run(math.sqrt, 4.0, timeout=0.5)
+        await slow
+        return quick
+
+    assert run(jobs) == (2.0, 0)
+
+
+def test_cancelling_running_job_replaces_its_worker():
+    async def jobs(pool):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.run(time.sleep, 10), 0.5)
+        return await pool.run(math.sqrt, 9.0, timeout=10)
+
+    assert run(jobs) == (3.0, 1)
+
+
+def test_job_is_moved_when_idle_worker_died():
+    async def jobs(pool):
+        await pool.run(time.sleep, 0)
+        worker = pool._idle.get_nowait()
+        worker.kill()
+        worker.process.join()
+        pool._idle.put_nowait(worker)
+
+        return await pool.run(math.sqrt, 16.0, timeout=10)
+
+    assert run(jobs) == (4.0, 1)
+
+
+def test_worker_dying_in_job_fails_that_job():
+    async def jobs(pool):
+        with pytest.raises(WorkerDied):
+            await pool.run(os._exit, 1)
+        return await pool.run(math.sqrt, 1.0)
+
+    assert run(jobs) == (1.0, 1)
@@ -21,9 +21,6 @@ dependencies {
     // https://mvnrepository.com/artifact/io.github.cdimascio/java-dotenv
     implementation("io.github.cdimascio:java-dotenv:5.2.2")
 
-    // https://mvnrepository.com/artifact/net.objecthunter/exp4j
-    implementation("net.objecthunter:exp4j:0.4.8")
-
     // https://mvnrepository.com/artifact/org.postgresql/postgresql
     implementation("org.postgresql:postgresql:42.7.5")
 
@@ -32,6 +29,13 @@ dependencies {
     implementation("org.springframework.boot:spring-boot-starter-actuator")
     implementation("org.springframework.boot:spring-boot-starter-data-jpa")
     implementation("org.springframework.boot:spring-boot-starter-web")
+
+    // The previous equation evaluator, a baseline of the benchmark
+    // https://mvnrepository.com/artifact/net.objecthunter/exp4j
+    testImplementation("net.objecthunter:exp4j:0.4.8")
+
+    testImplementation("org.springframework.boot:spring-boot-starter-test")
+    testRuntimeOnly("org.junit.platform:junit-platform-launcher")
 }
 
 tasks.withType<JavaCompile> {
@@ -42,6 +46,12 @@ tasks.withType<Test> {
     useJUnitPlatform()
 }
 
+tasks.register<JavaExec>("benchmark") {
+    description = "Measures steps per second of the fixed-step methods."
+    classpath = sourceSets["test"].runtimeClasspath
+    mainClass.set("com.solver.SolverBenchmark")
+}
+
 tasks.jar {
     manifest {
         attributes["Main-Class"] = "com.solver.Application"
@@ -0,0 +1,230 @@
+package com.solver;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+import java.util.function.BiFunction;
+
+/**
+ * Dormand-Prince 5(4) with embedded error estimation, PI step size control
+ * and dense output, following Hairer, Norsett and Wanner (DOPRI5).
+ * Steps are chosen from the tolerances, the solution is reported
+ * on a uniform grid of output points by interpolating accepted steps.
+ */
+public class AdaptiveDormandPrince {
+    private static final Logger logger = LoggerFactory.getLogger(AdaptiveDormandPrince.class);
+
+    private static final int MAX_STEPS = 100000;
+
+    private static final double SAFETY = 0.9;
+    private static final double MIN_FACTOR = 0.2;
+    private static final double MAX_FACTOR = 10.0;
+    private static final double BETA = 0.04;
+    private static final double EXPONENT = 0.2 - BETA * 0.75;
+
+    private static final double C2 = 1.0 / 5.0, C3 = 3.0 / 10.0, C4 = 4.0 / 5.0, C5 = 8.0 / 9.0;
+    private static final double A21 = 1.0 / 5.0;
+    private static final double A31 = 3.0 / 40.0, A32 = 9.0 / 40.0;
+    private static final double A41 = 44.0 / 45.0, A42 = -56.0 / 15.0, A43 = 32.0 / 9.0;
+    private static final double A51 = 19372.0 / 6561.0, A52 = -25360.0 / 2187.0,
+            A53 = 64448.0 / 6561.0, A54 = -212.0 / 729.0;
+    private static final double A61 = 9017.0 / 3168.0, A62 = -355.0 / 33.0,
+            A63 = 46732.0 / 5247.0, A64 = 49.0 / 176.0, A65 = -5103.0 / 18656.0;
+    private static final double A71 = 35.0 / 384.0, A73 = 500.0 / 1113.0,
+            A74 = 125.0 / 192.0, A75 = -2187.0 / 6784.0, A76 = 11.0 / 84.0;
+
+    private static final double E1 = 71.0 / 57600.0, E3 = -71.0 / 16695.0, E4 = 71.0 / 1920.0,
+            E5 = -17253.0 / 339200.0, E6 = 22.0 / 525.0, E7 = -1.0 / 40.0;
+
+    private static final double D1 = -12715105075.0 / 11282082432.0, D3 = 87487479700.0 / 32700410799.0,
+            D4 = -10690763975.0 / 1880347072.0, D5 = 701980252875.0 / 199316789632.0,
+            D6 = -1453857185.0 / 822651844.0, D7 = 69997945.0 / 29380423.0;
+
+    public static SolutionResponse solve(BiFunction<Double, double[], double[]> f,
+                                         double x_0, double[] y_0, double reachPoint, double outputStep,
+                                         double relativeTolerance, double absoluteTolerance,
+                                         ProgressRegistry.Progress progress) {
+        if (relativeTolerance <= 0 || absoluteTolerance <= 0) {
+            throw new IllegalArgumentException("Tolerances must be positive");
+        }
+        if (reachPoint <= x_0) {
+            return new SolutionResponse(concat(x_0, y_0), new TrajectoryBuffer(y_0.length, 0));
+        }
+
+        int n = y_0.length;
+        int outputCount = Math.max(1, (int) Math.ceil((reachPoint - x_0) / outputStep - 1e-10));
+        double outputSpacing = (reachPoint - x_0) / outputCount;
+
+        TrajectoryBuffer trajectory = new TrajectoryBuffer(n, outputCount);
+
+        double[] k2, k3, k4, k5, k6, k7;
+        double[] temp = new double[n];
+        double[] yNext = new double[n];
+        double[] rcont5 = new double[n];
+        double[] yOutput = new double[n];
+
+        double x = x_0;
+        double[] y = y_0.clone();
+        double[] k1 = f.apply(x, y);
+
+        double h = Math.min(initialStep(f, x, y, k1, reachPoint - x_0, relativeTolerance, absoluteTolerance),
+                reachPoint - x_0);
+        double previousError = 1e-4;
+        boolean rejected = false;
+
+        int nextOutput = 1;
+        int accepted = 0;
+        int rejections = 0;
+
+        while (x < reachPoint) {
+            if (accepted + rejections >= MAX_STEPS) {
+                throw new SolverException("Too many steps required at x = " + x);
+            }
+            if (0.1 * Math.abs(h) <= Math.ulp(x)) {
+                throw new SolverException("Step size too small at x = " + x);
+            }
+            boolean lastStep = x + 1.01 * h >= reachPoint;
+            if (lastStep) {
+                h = reachPoint - x;
+            }
+
+            for (int i = 0; i < n; i++) {
+                temp[i] = y[i] + h * A21 * k1[i];
+            }
+            k2 = f.apply(x + C2 * h, temp);
+            for (int i = 0; i < n; i++) {
+                temp[i] = y[i] + h * (A31 * k1[i] + A32 * k2[i]);
+            }
+            k3 = f.apply(x + C3 * h, temp);
+            for (int i = 0; i < n; i++) {
+                temp[i] = y[i] + h * (A41 * k1[i] + A42 * k2[i] + A43 * k3[i]);
+            }
+            k4 = f.apply(x + C4 * h, temp);
+            for (int i = 0; i < n; i++) {
+                temp[i] = y[i] + h * (A51 * k1[i] + A52 * k2[i] + A53 * k3[i] + A54 * k4[i]);
+            }
+            k5 = f.apply(x + C5 * h, temp);
+            for (int i = 0; i < n; i++) {
+                temp[i] = y[i] + h * (A61 * k1[i] + A62 * k2[i] + A63 * k3[i] + A64 * k4[i] + A65 * k5[i]);
+            }
+            k6 = f.apply(x + h, temp);
+            for (int i = 0; i < n; i++) {
+                yNext[i] = y[i] + h * (A71 * k1[i] + A73 * k3[i] + A74 * k4[i] + A75 * k5[i] + A76 * k6[i]);
+            }
+            k7 = f.apply(x + h, yNext);
+
+            double error = 0.0;
+            for (int i = 0; i < n; i++) {
+                double scale = absoluteTolerance
+                        + relativeTolerance * Math.max(Math.abs(y[i]), Math.abs(yNext[i]));
+                double estimate = h * (E1 * k1[i] + E3 * k3[i] + E4 * k4[i]
+                        + E5 * k5[i] + E6 * k6[i] + E7 * k7[i]) / scale;
+                error += estimate * estimate;
+            }
+            error = Math.sqrt(error / n);
+
+            // PI controller on the error of this and the previous accepted step
+            double factor = Math.pow(error, EXPONENT);
+
+            if (error <= 1.0) {
+                double growth = factor / Math.pow(previousError, BETA);
+                growth = Math.max(1.0 / MAX_FACTOR, Math.min(1.0 / MIN_FACTOR, growth / SAFETY));
+                double hNext = h / growth;
+                if (rejected) {
+                    hNext = Math.min(hNext, h);
+                }
+
+                for (int i = 0; i < n; i++) {
+                    rcont5[i] = h * (D1 * k1[i] + D3 * k3[i] + D4 * k4[i]
+                            + D5 * k5[i] + D6 * k6[i] + D7 * k7[i]);
+                }
+
+                double xNext = lastStep ? reachPoint : x + h;
+                while (nextOutput <= outputCount) {
+                    double xOutput = nextOutput == outputCount
+                            ? reachPoint
+                            : x_0 + nextOutput * outputSpacing;
+                    if (xOutput > xNext) {
+                        break;
+                    }
+
+                    double theta = (xOutput - x) / h;
+                    double theta1 = 1.0 - theta;
+                    for (int i = 0; i < n; i++) {
+                        double yDiff = yNext[i] - y[i];
+                        double bspl = h * k1[i] - yDiff;
+                        yOutput[i] = y[i] + theta * (yDiff + theta1 * (bspl
+                                + theta * (yDiff - h * k7[i] - bspl + theta1 * rcont5[i])));
+                    }
+
+                    trajectory.add(xOutput, yOutput);
+                    nextOutput++;
+                }
+
+                previousError = Math.max(error, 1e-4);
+                x = xNext;
+                System.arraycopy(yNext, 0, y, 0, n);
+                k1 = k7;
+                h = hNext;
+                rejected = false;
+                accepted++;
+                progress.update(x, accepted);
+            } else {
+                h = h / Math.min(1.0 / MIN_FACTOR, factor / SAFETY);
+                rejected = true;
+                rejections++;
+            }
+        }
+
+        logger.debug("Adaptive Dormand-Prince finished with {} accepted and {} rejected steps",
+                accepted, rejections);
+
+        return new SolutionResponse(concat(x, y), trajectory);
+    }
+
+    private static double initialStep(BiFunction<Double, double[], double[]> f,
+                                      double x, double[] y, double[] dy, double span,
+                                      double relativeTolerance, double absoluteTolerance) {
+        int n = y.length;
+
+        double d0 = 0.0;
+        double d1 = 0.0;
+        for (int i = 0; i < n; i++) {
+            double scale = absoluteTolerance + relativeTolerance * Math.abs(y[i]);
+            d0 += (y[i] / scale) * (y[i] / scale);
+            d1 += (dy[i] / scale) * (dy[i] / scale);
+        }
+        d0 = Math.sqrt(d0 / n);
+        d1 = Math.sqrt(d1 / n);
+
+        double h0 = (d0 < 1e-5 || d1 < 1e-5) ? 1e-6 : 0.01 * d0 / d1;
+        h0 = Math.min(h0, span);
+
+        double[] temp = new double[n];
+        for (int i = 0; i < n; i++) {
+            temp[i] = y[i] + h0 * dy[i];
+        }
+        double[] dyNext = f.apply(x + h0, temp);
+
+        double d2 = 0.0;
+        for (int i = 0; i < n; i++) {
+            double scale = absoluteTolerance + relativeTolerance * Math.abs(y[i]);
+            d2 += ((dyNext[i] - dy[i]) / scale) * ((dyNext[i] - dy[i]) / scale);
+        }
+        d2 = Math.sqrt(d2 / n) / h0;
+
+        double maxDerivative = Math.max(d1, d2);
+        double h1 = maxDerivative <= 1e-15
+                ? Math.max(1e-6, h0 * 1e-3)
+                : Math.pow(0.01 / maxDerivative, 1.0 / 5.0);
+
+        return Math.min(100 * h0, h1);
+    }
+
+    private static double[] concat(double x, double[] y) {
+        double[] result = new double[y.length + 1];
+        result[0] = x;
+        System.arraycopy(y, 0, result, 1, y.length);
+        return result;
+    }
+}
@@ -12,10 +12,13 @@ public class ApplicationProcessingService {
 
     private final SolverService solverService;
     private final DBService dbService;
+    private final CompletionNotifier completionNotifier;
 
-    public ApplicationProcessingService(SolverService solverService, DBService dbService) {
+    public ApplicationProcessingService(SolverService solverService, DBService dbService,
+                                        CompletionNotifier completionNotifier) {
         this.solverService = solverService;
         this.dbService = dbService;
+        this.completionNotifier = completionNotifier;
     }
 
     public CompletableFuture<Void> processApplication(int applicationId, SolverRequest request) {
@@ -24,11 +27,11 @@ public class ApplicationProcessingService {
         return dbService.updateApplicationStatus(applicationId, "in_progress")
             .thenCompose(v -> {
                 logger.debug("Application {} status updated to in_progress, starting solver", applicationId);
-                return solverService.solveEquation(request);
+                return solverService.solveEquation(applicationId, request);
             })
             .thenCompose(solutionResponse -> {
                 logger.debug("Solution computed for applicationId: {}, saving results", applicationId);
-                return dbService.saveResults(applicationId, solutionResponse.toJson());
+                return dbService.saveResults(applicationId, solutionResponse);
             })
             .thenCompose(v -> {
                 logger.debug("Results saved for applicationId: {}, updating status to completed", applicationId);
@@ -42,9 +45,11 @@ public class ApplicationProcessingService {
                             logger.error("Failed to update application status to error for applicationId: {}", 
                                 applicationId, sqlException);
                             return null;
-                        });
+                        })
+                        .thenRun(() -> completionNotifier.notifyStatus(applicationId, "error"));
                 } else {
                     logger.info("Successfully completed processing for applicationId: {}", applicationId);
+                    completionNotifier.notifyStatus(applicationId, "completed");
                 }
             });
     }
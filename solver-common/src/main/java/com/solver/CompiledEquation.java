@@ -0,0 +1,347 @@
+package com.solver;
+
+import java.util.HashMap;
+import java.util.Map;
+import java.util.function.DoubleBinaryOperator;
+import java.util.function.DoubleUnaryOperator;
+
+/**
+ * An expression of x and y0..y(n-1) parsed once into a tree of nodes.
+ * Variables are bound by index: every evaluation reads x and the array of y
+ * directly, without looking anything up by name or allocating.
+ * The syntax, functions and constants are those of exp4j,
+ * which evaluated the equations before.
+ */
+public final class CompiledEquation {
+    private static final Map<String, DoubleUnaryOperator> FUNCTIONS = new HashMap<>();
+    private static final Map<String, DoubleBinaryOperator> BINARY_FUNCTIONS = new HashMap<>();
+    private static final Map<String, Double> CONSTANTS = Map.of(
+            "pi", Math.PI,
+            "π", Math.PI,
+            "e", Math.E,
+            "φ", 1.61803398874d);
+
+    static {
+        FUNCTIONS.put("sin", Math::sin);
+        FUNCTIONS.put("cos", Math::cos);
+        FUNCTIONS.put("tan", Math::tan);
+        FUNCTIONS.put("cot", a -> reciprocal(Math.tan(a), "cotangent"));
+        FUNCTIONS.put("sec", a -> reciprocal(Math.cos(a), "secant"));
+        FUNCTIONS.put("csc", a -> reciprocal(Math.sin(a), "cosecant"));
+        FUNCTIONS.put("asin", Math::asin);
+        FUNCTIONS.put("acos", Math::acos);
+        FUNCTIONS.put("atan", Math::atan);
+        FUNCTIONS.put("sinh", Math::sinh);
+        FUNCTIONS.put("cosh", Math::cosh);
+        FUNCTIONS.put("tanh", Math::tanh);
+        FUNCTIONS.put("coth", a -> Math.cosh(a) / Math.sinh(a));
+        FUNCTIONS.put("sech", a -> 1.0 / Math.cosh(a));
+        FUNCTIONS.put("csch", a -> 1.0 / Math.sinh(a));
+        FUNCTIONS.put("log", Math::log);
+        FUNCTIONS.put("log2", a -> Math.log(a) / Math.log(2.0));
+        FUNCTIONS.put("log10", Math::log10);
+        FUNCTIONS.put("log1p", Math::log1p);
+        FUNCTIONS.put("exp", Math::exp);
+        FUNCTIONS.put("expm1", Math::expm1);
+        FUNCTIONS.put("sqrt", Math::sqrt);
+        FUNCTIONS.put("cbrt", Math::cbrt);
+        FUNCTIONS.put("abs", Math::abs);
+        FUNCTIONS.put("floor", Math::floor);
+        FUNCTIONS.put("ceil", Math::ceil);
+        FUNCTIONS.put("signum", Math::signum);
+        FUNCTIONS.put("toradian", Math::toRadians);
+        FUNCTIONS.put("todegree", Math::toDegrees);
+
+        BINARY_FUNCTIONS.put("pow", Math::pow);
+        BINARY_FUNCTIONS.put("logb", (a, b) -> Math.log(b) / Math.log(a));
+    }
+
+    @FunctionalInterface
+    private interface Node {
+        double evaluate(double x, double[] y);
+    }
+
+    private record Constant(double value) implements Node {
+        @Override
+        public double evaluate(double x, double[] y) {
+            return value;
+        }
+    }
+
+    private final Node root;
+
+    private CompiledEquation(Node root) {
+        this.root = root;
+    }
+
+    /**
+     * Parses an expression of x and the variables y0..y(variables-1).
+     * Throws IllegalArgumentException if it is not a valid expression of them.
+     */
+    public static CompiledEquation compile(String expression, int variables) {
+        return new CompiledEquation(new Parser(expression, variables).parse());
+    }
+
+    /**
+     * Evaluates the expression with y[i] bound to yi.
+     * Throws ArithmeticException on division by zero, like exp4j.
+     */
+    public double evaluate(double x, double[] y) {
+        return root.evaluate(x, y);
+    }
+
+    private static double reciprocal(double value, String function) {
+        if (value == 0.0) {
+            throw new ArithmeticException("Division by zero in " + function + "!");
+        }
+        return 1.0 / value;
+    }
+
+    private static double divide(double dividend, double divisor) {
+        if (divisor == 0.0) {
+            throw new ArithmeticException("Division by zero!");
+        }
+        return dividend / divisor;
+    }
+
+    private static double modulo(double dividend, double divisor) {
+        if (divisor == 0.0) {
+            throw new ArithmeticException("Division by zero!");
+        }
+        return dividend % divisor;
+    }
+
+    /**
+     * Recursive descent over the grammar of exp4j:
+     * sums of products, unary signs binding looser than the right-associative power,
+     * and implicit multiplication of adjacent operands such as 2x or 2(x + 1).
+     */
+    private static final class Parser {
+        private final String expression;
+        private final Map<String, Integer> variables = new HashMap<>();
+        private int position;
+
+        Parser(String expression, int variables) {
+            this.expression = expression;
+            for (int i = 0; i < variables; i++) {
+                this.variables.put("y" + i, i);
+            }
+        }
+
+        Node parse() {
+            Node node = sum();
+            skipSpaces();
+            if (position < expression.length()) {
+                throw error("Unexpected '" + expression.charAt(position) + "'");
+            }
+            return node;
+        }
+
+        private Node sum() {
+            Node node = product();
+            while (true) {
+                if (accept('+')) {
+                    node = binary(node, product(), Double::sum);
+                } else if (accept('-')) {
+                    node = binary(node, product(), (a, b) -> a - b);
+                } else {
+                    return node;
+                }
+            }
+        }
+
+        private Node product() {
+            Node node = signed();
+            while (true) {
+                if (accept('*')) {
+                    node = binary(node, signed(), (a, b) -> a * b);
+                } else if (accept('/')) {
+                    node = binary(node, signed(), CompiledEquation::divide);
+                } else if (accept('%')) {
+                    node = binary(node, signed(), CompiledEquation::modulo);
+                } else if (startsOperand()) {
+                    node = binary(node, power(), (a, b) -> a * b);
+                } else {
+                    return node;
+                }
+            }
+        }
+
+        private Node signed() {
+            if (accept('-')) {
+                return unary(signed(), a -> -a);
+            }
+            if (accept('+')) {
+                return signed();
+            }
+            return power();
+        }
+
+        private Node power() {
+            Node base = operand();
+            if (accept('^')) {
+                // Right-associative, the exponent may carry its own sign
+                return binary(base, signed(), Math::pow);
+            }
+            return base;
+        }
+
+        private Node operand() {
+            skipSpaces();
+            if (position == expression.length()) {
+                throw error("Unexpected end of expression");
+            }
+
+            char c = expression.charAt(position);
+            if (accept('(')) {
+                Node node = sum();
+                expect(')');
+                return node;
+            }
+            if (Character.isDigit(c) || c == '.') {
+                return new Constant(number());
+            }
+            if (isNameStart(c)) {
+                return named(name());
+            }
+            throw error("Unexpected '" + c + "'");
+        }
+
+        private Node named(String name) {
+            if (name.equals("x")) {
+                return (x, y) -> x;
+            }
+
+            Integer index = variables.get(name);
+            if (index != null) {
+                int i = index;
+                return (x, y) -> y[i];
+            }
+
+            DoubleUnaryOperator function = FUNCTIONS.get(name);
+            if (function != null) {
+                expect('(');
+                Node argument = sum();
+                expect(')');
+                return unary(argument, function);
+            }
+
+            DoubleBinaryOperator binaryFunction = BINARY_FUNCTIONS.get(name);
+            if (binaryFunction != null) {
+                expect('(');
+                Node left = sum();
+                expect(',');
+                Node right = sum();
+                expect(')');
+                return binary(left, right, binaryFunction);
+            }
+
+            Double constant = CONSTANTS.get(name);
+            if (constant != null) {
+                return new Constant(constant);
+            }
+            throw error("Unknown function or variable '" + name + "'");
+        }
+
+        private double number() {
+            int start = position;
+            while (position < expression.length()
+                    && (Character.isDigit(expression.charAt(position)) || expression.charAt(position) == '.')) {
+                position++;
+            }
+            if (position < expression.length() && (expression.charAt(position) | 0x20) == 'e') {
+                int exponent = position + 1;
+                if (exponent < expression.length() && "+-".indexOf(expression.charAt(exponent)) >= 0) {
+                    exponent++;
+                }
+                // Otherwise the e is Euler's number multiplied implicitly
+                if (exponent < expression.length() && Character.isDigit(expression.charAt(exponent))) {
+                    position = exponent;
+                    while (position < expression.length() && Character.isDigit(expression.charAt(position))) {
+                        position++;
+                    }
+                }
+            }
+
+            try {
+                return Double.parseDouble(expression.substring(start, position));
+            } catch (NumberFormatException e) {
+                throw error("Invalid number '" + expression.substring(start, position) + "'");
+            }
+        }
+
+        private String name() {
+            int start = position;
+            while (position < expression.length() && isNamePart(expression.charAt(position))) {
+                position++;
+            }
+            return expression.substring(start, position);
+        }
+
+        private boolean startsOperand() {
+            skipSpaces();
+            if (position == expression.length()) {
+                return false;
+            }
+            char c = expression.charAt(position);
+            return c == '(' || c == '.' || Character.isDigit(c) || isNameStart(c);
+        }
+
+        private boolean accept(char c) {
+            skipSpaces();
+            if (position < expression.length() && expression.charAt(position) == c) {
+                position++;
+                return true;
+            }
+            return false;
+        }
+
+        private void expect(char c) {
+            if (!accept(c)) {
+                throw error("Expected '" + c + "'");
+            }
+        }
+
+        private void skipSpaces() {
+            while (position < expression.length() && Character.isWhitespace(expression.charAt(position))) {
+                position++;
+            }
+        }
+
+        private IllegalArgumentException error(String message) {
+            return new IllegalArgumentException(message + " at position " + position + " of " + expression);
+        }
+
+        private static boolean isNameStart(char c) {
+            return Character.isLetter(c) || c == '_';
+        }
+
+        private static boolean isNamePart(char c) {
+            return Character.isLetterOrDigit(c) || c == '_';
+        }
+    }
+
+    // Subtrees without variables are evaluated once, unless they throw
+
+    private static Node unary(Node argument, DoubleUnaryOperator operator) {
+        if (argument instanceof Constant constant) {
+            try {
+                return new Constant(operator.applyAsDouble(constant.value()));
+            } catch (ArithmeticException e) {
+                // Left to fail on evaluation, as it did before
+            }
+        }
+        return (x, y) -> operator.applyAsDouble(argument.evaluate(x, y));
+    }
+
+    private static Node binary(Node left, Node right, DoubleBinaryOperator operator) {
+        if (left instanceof Constant a && right instanceof Constant b) {
+            try {
+                return new Constant(operator.applyAsDouble(a.value(), b.value()));
+            } catch (ArithmeticException e) {
+                // Left to fail on evaluation, as it did before
+            }
+        }
+        return (x, y) -> operator.applyAsDouble(left.evaluate(x, y), right.evaluate(x, y));
+    }
+}
@@ -0,0 +1,60 @@
+package com.solver;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.http.MediaType;
+import org.springframework.http.client.SimpleClientHttpRequestFactory;
+import org.springframework.scheduling.annotation.Async;
+import org.springframework.stereotype.Service;
+import org.springframework.web.client.RestClient;
+import org.springframework.web.client.RestClientException;
+
+import java.time.Duration;
+import java.util.Map;
+
+@Service
+public class CompletionNotifier {
+    private static final Logger logger = LoggerFactory.getLogger(CompletionNotifier.class);
+
+    private static final Duration CONNECT_TIMEOUT = Duration.ofSeconds(2);
+    private static final Duration READ_TIMEOUT = Duration.ofSeconds(5);
+
+    private final String callbackUrl;
+    private final String callbackSecret;
+    private final RestClient restClient;
+
+    public CompletionNotifier(
+            @Value("${CLIENT_CALLBACK_URL:}") String callbackUrl,
+            @Value("${CALLBACK_SECRET:}") String callbackSecret) {
+        this.callbackUrl = callbackUrl;
+        this.callbackSecret = callbackSecret;
+
+        SimpleClientHttpRequestFactory requestFactory = new SimpleClientHttpRequestFactory();
+        requestFactory.setConnectTimeout(CONNECT_TIMEOUT);
+        requestFactory.setReadTimeout(READ_TIMEOUT);
+        this.restClient = RestClient.builder().requestFactory(requestFactory).build();
+    }
+
+    @Async
+    public void notifyStatus(int applicationId, String status) {
+        // The client rejects callbacks without the shared secret
+        if (callbackUrl.isBlank() || callbackSecret.isBlank()) {
+            return;
+        }
+
+        logger.debug("Notifying client about status {} of applicationId: {}", status, applicationId);
+        try {
+            restClient.post()
+                .uri(callbackUrl + "/applications/{applicationId}/status", applicationId)
+                .contentType(MediaType.APPLICATION_JSON)
+                .header("X-Callback-Secret", callbackSecret)
+                .body(Map.of("id", applicationId, "status", status))
+                .retrieve()
+                .toBodilessEntity();
+        } catch (RestClientException e) {
+            // The client falls back to polling the status endpoint
+            logger.warn("Failed to notify client about applicationId: {}: {}", applicationId, e.getMessage());
+        }
+    }
+}
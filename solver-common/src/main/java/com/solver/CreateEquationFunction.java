@@ -2,53 +2,48 @@ package com.solver;
 
 import java.util.function.BiFunction;
 
-import net.objecthunter.exp4j.Expression;
-import net.objecthunter.exp4j.ExpressionBuilder;
-
-import java.util.Map;
-import java.util.HashMap;
-
 public class CreateEquationFunction {
     public static BiFunction<Double, double[], double[]> create(String equation, int order) {
+        EquationFunction function = createInPlace(equation, order);
+
+        return (x, y) -> {
+            double[] dydt = new double[order];
+            function.apply(x, y, dydt);
+            return dydt;
+        };
+    }
+
+    public static EquationFunction createInPlace(String equation, int order) {
         if (order < 1) {
             throw new IllegalArgumentException("Order must be at least 1");
         }
-        
-        return (x, y) -> {
-            double[] dydt = new double[order];
 
+        // The expression is parsed once per request and reads x and y by index
+        CompiledEquation expression = compileEquation(equation, order);
+
+        return (x, y, dydt) -> {
             System.arraycopy(y, 1, dydt, 0, order - 1);
-            
-            dydt[order - 1] = evaluateEquation(equation, x, y);
-            return dydt;
+
+            dydt[order - 1] = evaluateEquation(expression, equation, x, y);
         };
     }
-    
-    private static double evaluateEquation(String equation, double x, double[] y) {
+
+    private static CompiledEquation compileEquation(String equation, int order) {
         try {
-            equation = equation.replaceAll("y\\[(\\d+)]", "y$1");
-            
-            ExpressionBuilder builder = new ExpressionBuilder(equation).variable("x");
-            
-            for (int i = 0; i < y.length; i++) {
-                builder.variable("y" + i);
-            }
-            
-            Expression expression = builder.build();
-            
-            Map<String, Double> variables = new HashMap<>();
-            variables.put("x", x);
-            for (int i = 0; i < y.length; i++) {
-                variables.put("y" + i, y[i]);
-            }
-            
-            expression.setVariables(variables);
-            double result = expression.evaluate();
-            
+            return CompiledEquation.compile(equation.replaceAll("y\\[(\\d+)]", "y$1"), order);
+        } catch (Exception e) {
+            throw new SolverException("Error evaluating equation: " + equation, e);
+        }
+    }
+
+    private static double evaluateEquation(CompiledEquation expression, String equation, double x, double[] y) {
+        try {
+            double result = expression.evaluate(x, y);
+
             if (Double.isNaN(result)) {
                 throw new SolverException("Result is NaN at x = " + x);
             }
-            
+
             return result;
         } catch (ArithmeticException e) {
             if (e.getMessage().contains("Division by zero")) {
@@ -59,4 +54,4 @@ public class CreateEquationFunction {
             throw new SolverException("Error evaluating equation: " + equation, e);
         }
     }
-}
\ No newline at end of file
+}
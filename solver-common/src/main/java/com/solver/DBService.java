@@ -2,6 +2,7 @@ package com.solver;
 
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
+import org.springframework.beans.factory.annotation.Value;
 import org.springframework.dao.DataAccessException;
 import org.springframework.dao.EmptyResultDataAccessException;
 import org.springframework.jdbc.core.JdbcTemplate;
@@ -11,6 +12,7 @@ import org.springframework.stereotype.Service;
 import org.springframework.transaction.annotation.Transactional;
 
 import java.util.concurrent.CompletableFuture;
+import java.util.Collections;
 import java.util.HashMap;
 import java.util.List;
 import java.util.Map;
@@ -21,9 +23,13 @@ public class DBService {
     private static final Logger logger = LoggerFactory.getLogger(DBService.class);
 
     private final JdbcTemplate jdbcTemplate;
+    private final String resultEncoding;
 
-    public DBService(JdbcTemplate jdbcTemplate) {
+    public DBService(
+            JdbcTemplate jdbcTemplate,
+            @Value("${RESULT_COMPRESSION:true}") boolean resultCompression) {
         this.jdbcTemplate = jdbcTemplate;
+        this.resultEncoding = resultCompression ? ResultEncoding.DELTA_DEFLATE : ResultEncoding.RAW;
     }
 
     @Async
@@ -150,7 +156,7 @@ public class DBService {
         logger.debug("Fetching results for applicationId: {}", applicationId);
         return CompletableFuture.supplyAsync(() -> {
             String query = """
-                SELECT id, data, created_at
+                SELECT id, data, encoding, dimension, solution, x_values, y_values, created_at
                 FROM results
                 WHERE application_id = ?
                 """;
@@ -158,7 +164,13 @@ public class DBService {
                 return jdbcTemplate.query(query, (rs, rowNum) -> {
                     Map<String, Object> result = new HashMap<>();
                     result.put("id", rs.getInt("id"));
+                    // Results saved before the packed columns only have data
                     result.put("data", rs.getString("data"));
+                    result.put("encoding", rs.getString("encoding"));
+                    result.put("dimension", rs.getObject("dimension"));
+                    result.put("solution", rs.getBytes("solution"));
+                    result.put("x_values", rs.getBytes("x_values"));
+                    result.put("y_values", rs.getBytes("y_values"));
                     result.put("created_at", rs.getString("created_at"));
                     return result;
                 }, applicationId);
@@ -189,6 +201,35 @@ public class DBService {
         });
     }
 
+    @Async
+    @Transactional
+    public CompletableFuture<List<Map<String, Object>>> getApplicationStatuses(List<Integer> applicationIds) {
+        logger.debug("Fetching statuses for {} applications", applicationIds.size());
+        return CompletableFuture.supplyAsync(() -> {
+            if (applicationIds.isEmpty()) {
+                return List.of();
+            }
+
+            String placeholders = String.join(", ", Collections.nCopies(applicationIds.size(), "?"));
+            String query = """
+                SELECT id, status
+                FROM applications
+                WHERE id IN (%s)
+                """.formatted(placeholders);
+            try {
+                return jdbcTemplate.query(query, (rs, rowNum) -> {
+                    Map<String, Object> status = new HashMap<>();
+                    status.put("id", rs.getInt("id"));
+                    status.put("status", rs.getString("status"));
+                    return status;
+                }, applicationIds.toArray());
+            } catch (DataAccessException e) {
+                logger.error("Database error while fetching statuses for applicationIds: {}", applicationIds, e);
+                throw new SolverException("Failed to fetch application statuses", e);
+            }
+        });
+    }
+
     @Async
     @Transactional
     public CompletableFuture<Void> updateApplicationStatus(int applicationId, String status) {
@@ -210,15 +251,23 @@ public class DBService {
 
     @Async
     @Transactional
-    public CompletableFuture<Void> saveResults(int applicationId, String results) {
+    public CompletableFuture<Void> saveResults(int applicationId, SolutionResponse solution) {
         logger.debug("Saving results for applicationId: {}", applicationId);
         return CompletableFuture.runAsync(() -> {
             String query = """
-                INSERT INTO results (application_id, data)
-                VALUES (?, ?::jsonb)
+                INSERT INTO results (application_id, encoding, dimension, solution, x_values, y_values)
+                VALUES (?, ?, ?, ?, ?, ?)
                 """;
             try {
-                jdbcTemplate.update(query, applicationId, results);
+                TrajectoryBuffer trajectory = solution.getTrajectory();
+                jdbcTemplate.update(query,
+                    applicationId,
+                    resultEncoding,
+                    trajectory.getDimension(),
+                    ResultEncoding.pack(new double[][] { solution.getSolution() },
+                        solution.getSolution().length, ResultEncoding.RAW),
+                    trajectory.packXValues(resultEncoding),
+                    trajectory.packYValues(resultEncoding));
             } catch (DataAccessException e) {
                 logger.error("Database error while saving results for applicationId: {}", applicationId, e);
                 throw new SolverException("Failed to save results", e);
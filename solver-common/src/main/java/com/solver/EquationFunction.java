@@ -0,0 +1,10 @@
+package com.solver;
+
+/**
+ * Right-hand side of the first-order system dy/dx = f(x, y)
+ * that writes the derivatives into a caller-owned array.
+ */
+@FunctionalInterface
+public interface EquationFunction {
+    void apply(double x, double[] y, double[] dydt);
+}
@@ -1,144 +1,165 @@
 package com.solver;
 
-import java.util.function.BiFunction;
-
+/**
+ * Fixed step methods that advance y in place and return the next x.
+ * All stage buffers live in a Workspace allocated once per solve,
+ * so a step does not allocate. The floating point operations
+ * are performed in the same order as the original array based steppers.
+ */
 public class NumericalMethods {
-    public static double[] dormandPrince(BiFunction<Double, double[], double[]> f, double x_0, double[] y_0, double h) {
-        double[] k1 = new double[y_0.length];
-        double[] k2 = new double[y_0.length];
-        double[] k3 = new double[y_0.length];
-        double[] k4 = new double[y_0.length];
-        double[] k5 = new double[y_0.length];
-        double[] k6 = new double[y_0.length];
-    
-        double[] temp = new double[y_0.length];
-        double[] y_next = new double[y_0.length];
-    
-        k1 = ArrayOperations.multiply(h, f.apply(x_0, y_0));
-        temp = ArrayOperations.add(y_0, ArrayOperations.multiply(1.0 / 5.0, k1));
-        k2 = ArrayOperations.multiply(h, f.apply(x_0 + h / 5.0, temp));
-        temp = ArrayOperations.add(y_0, ArrayOperations.add(
-                ArrayOperations.multiply(3.0 / 40.0, k1),
-                ArrayOperations.multiply(9.0 / 40.0, k2)));
-        k3 = ArrayOperations.multiply(h, f.apply(x_0 + h * 3.0 / 10.0, temp));
-        temp = ArrayOperations.add(y_0, ArrayOperations.add(
-                ArrayOperations.add(ArrayOperations.multiply(44.0 / 45.0, k1),
-                        ArrayOperations.multiply(-56.0 / 15.0, k2)),
-                ArrayOperations.multiply(32.0 / 9.0, k3)));
-        k4 = ArrayOperations.multiply(h, f.apply(x_0 + h * 4.0 / 5.0, temp));
-        temp = ArrayOperations.add(y_0, ArrayOperations.add(
-                ArrayOperations.add(ArrayOperations.multiply(19372.0 / 6561.0, k1),
-                        ArrayOperations.add(ArrayOperations.multiply(-25360.0 / 2187.0, k2),
-                                ArrayOperations.multiply(64448.0 / 6561.0, k3))),
-                ArrayOperations.multiply(-212.0 / 729.0, k4)));
-        k5 = ArrayOperations.multiply(h, f.apply(x_0 + h * 8.0 / 9.0, temp));
-        temp = ArrayOperations.add(y_0, ArrayOperations.add(
-                ArrayOperations.add(ArrayOperations.multiply(9017.0 / 3168.0, k1),
-                        ArrayOperations.add(ArrayOperations.multiply(-355.0 / 33.0, k2),
-                                ArrayOperations.add(ArrayOperations.multiply(46732.0 / 5247.0, k3),
-                                        ArrayOperations.multiply(49.0 / 176.0, k4)))),
-                ArrayOperations.multiply(-5103.0 / 18656.0, k5)));
-        k6 = ArrayOperations.multiply(h, f.apply(x_0 + h, temp));
-    
-        for (int i = 0; i < y_0.length; i++) {
-            y_next[i] = y_0[i] + (35.0 / 384.0 * k1[i] + 500.0 / 1113.0 * k3[i]
-                        + 125.0 / 192.0 * k4[i] - 2187.0 / 6784.0 * k5[i]
-                        + 11.0 / 84.0 * k6[i]);
-        }
-    
-        double[] result = new double[y_0.length + 1];
-        result[0] = x_0 + h;
-        System.arraycopy(y_next, 0, result, 1, y_0.length);
-    
-        return result;
-    }    
+    @FunctionalInterface
+    public interface Stepper {
+        double step(EquationFunction f, double x_0, double[] y, double h, Workspace workspace);
+    }
 
-    public static double[] rungeKutta(BiFunction<Double, double[], double[]> f, double x_0, double[] y_0, double h) {
-        double[] k1 = new double[y_0.length];
-        double[] k2 = new double[y_0.length];
-        double[] k3 = new double[y_0.length];
-        double[] k4 = new double[y_0.length];
+    public static final class Workspace {
+        private final double[] k1;
+        private final double[] k2;
+        private final double[] k3;
+        private final double[] k4;
+        private final double[] k5;
+        private final double[] k6;
+        private final double[] temp;
+
+        public Workspace(int n) {
+            k1 = new double[n];
+            k2 = new double[n];
+            k3 = new double[n];
+            k4 = new double[n];
+            k5 = new double[n];
+            k6 = new double[n];
+            temp = new double[n];
+        }
+    }
 
-        double[] temp = new double[y_0.length];
-        double[] y_next = new double[y_0.length];
+    public static Stepper stepper(String method) {
+        return switch (method) {
+            case "euler" -> NumericalMethods::euler;
+            case "midpoint" -> NumericalMethods::midpoint;
+            case "heun" -> NumericalMethods::heun;
+            case "rungeKutta" -> NumericalMethods::rungeKutta;
+            case "dormandPrince" -> NumericalMethods::dormandPrince;
+            default -> throw new IllegalArgumentException("Invalid method value: " + method);
+        };
+    }
 
-        k1 = ArrayOperations.multiply(h, f.apply(x_0, y_0));
-        temp = ArrayOperations.add(y_0, ArrayOperations.multiply(0.5, k1));
-        k2 = ArrayOperations.multiply(h, f.apply(x_0 + h / 2, temp));
-        temp = ArrayOperations.add(y_0, ArrayOperations.multiply(0.5, k2));
-        k3 = ArrayOperations.multiply(h, f.apply(x_0 + h / 2, temp));
-        temp = ArrayOperations.add(y_0, k3);
-        k4 = ArrayOperations.multiply(h, f.apply(x_0 + h, temp));
+    public static double dormandPrince(EquationFunction f, double x_0, double[] y, double h, Workspace w) {
+        double[] k1 = w.k1, k2 = w.k2, k3 = w.k3, k4 = w.k4, k5 = w.k5, k6 = w.k6, temp = w.temp;
+        int n = y.length;
 
-        for (int i = 0; i < y_0.length; i++) {
-            y_next[i] = y_0[i] + (k1[i] + 2 * k2[i] + 2 * k3[i] + k4[i]) / 6;
+        f.apply(x_0, y, k1);
+        for (int i = 0; i < n; i++) {
+            k1[i] = h * k1[i];
+            temp[i] = y[i] + (1.0 / 5.0) * k1[i];
+        }
+        f.apply(x_0 + h / 5.0, temp, k2);
+        for (int i = 0; i < n; i++) {
+            k2[i] = h * k2[i];
+            temp[i] = y[i] + ((3.0 / 40.0) * k1[i] + (9.0 / 40.0) * k2[i]);
+        }
+        f.apply(x_0 + h * 3.0 / 10.0, temp, k3);
+        for (int i = 0; i < n; i++) {
+            k3[i] = h * k3[i];
+            temp[i] = y[i] + (((44.0 / 45.0) * k1[i] + (-56.0 / 15.0) * k2[i])
+                    + (32.0 / 9.0) * k3[i]);
         }
+        f.apply(x_0 + h * 4.0 / 5.0, temp, k4);
+        for (int i = 0; i < n; i++) {
+            k4[i] = h * k4[i];
+            temp[i] = y[i] + (((19372.0 / 6561.0) * k1[i]
+                    + ((-25360.0 / 2187.0) * k2[i] + (64448.0 / 6561.0) * k3[i]))
+                    + (-212.0 / 729.0) * k4[i]);
+        }
+        f.apply(x_0 + h * 8.0 / 9.0, temp, k5);
+        for (int i = 0; i < n; i++) {
+            k5[i] = h * k5[i];
+            temp[i] = y[i] + (((9017.0 / 3168.0) * k1[i]
+                    + ((-355.0 / 33.0) * k2[i] + ((46732.0 / 5247.0) * k3[i] + (49.0 / 176.0) * k4[i])))
+                    + (-5103.0 / 18656.0) * k5[i]);
+        }
+        f.apply(x_0 + h, temp, k6);
 
-        double[] result = new double[y_0.length + 1];
-        result[0] = x_0 + h;
-        System.arraycopy(y_next, 0, result, 1, y_0.length);
+        for (int i = 0; i < n; i++) {
+            k6[i] = h * k6[i];
+            y[i] = y[i] + (35.0 / 384.0 * k1[i] + 500.0 / 1113.0 * k3[i]
+                        + 125.0 / 192.0 * k4[i] - 2187.0 / 6784.0 * k5[i]
+                        + 11.0 / 84.0 * k6[i]);
+        }
 
-        return result;
+        return x_0 + h;
     }
 
-    public static double[] heun(BiFunction<Double, double[], double[]> f, double x_0, double[] y_0, double h) {
-        double[] y_next = new double[y_0.length];
+    public static double rungeKutta(EquationFunction f, double x_0, double[] y, double h, Workspace w) {
+        double[] k1 = w.k1, k2 = w.k2, k3 = w.k3, k4 = w.k4, temp = w.temp;
+        int n = y.length;
 
-        double[] k1 = f.apply(x_0, y_0);
-        double[] temp = new double[y_0.length];
+        f.apply(x_0, y, k1);
+        for (int i = 0; i < n; i++) {
+            k1[i] = h * k1[i];
+            temp[i] = y[i] + 0.5 * k1[i];
+        }
+        f.apply(x_0 + h / 2, temp, k2);
+        for (int i = 0; i < n; i++) {
+            k2[i] = h * k2[i];
+            temp[i] = y[i] + 0.5 * k2[i];
+        }
+        f.apply(x_0 + h / 2, temp, k3);
+        for (int i = 0; i < n; i++) {
+            k3[i] = h * k3[i];
+            temp[i] = y[i] + k3[i];
+        }
+        f.apply(x_0 + h, temp, k4);
 
-        for (int i = 0; i < y_0.length; i++) {
-            temp[i] = y_0[i] + h * k1[i];
+        for (int i = 0; i < n; i++) {
+            k4[i] = h * k4[i];
+            y[i] = y[i] + (k1[i] + 2 * k2[i] + 2 * k3[i] + k4[i]) / 6;
         }
 
-        double[] k2 = f.apply(x_0 + h, temp);
+        return x_0 + h;
+    }
+
+    public static double heun(EquationFunction f, double x_0, double[] y, double h, Workspace w) {
+        double[] k1 = w.k1, k2 = w.k2, temp = w.temp;
 
-        for (int i = 0; i < y_0.length; i++) {
-            y_next[i] = y_0[i] + (h / 2) * (k1[i] + k2[i]);
+        f.apply(x_0, y, k1);
+        for (int i = 0; i < y.length; i++) {
+            temp[i] = y[i] + h * k1[i];
         }
 
-        double[] result = new double[y_0.length + 1];
-        result[0] = x_0 + h;
-        System.arraycopy(y_next, 0, result, 1, y_0.length);
+        f.apply(x_0 + h, temp, k2);
 
-        return result;
-    }
+        for (int i = 0; i < y.length; i++) {
+            y[i] = y[i] + (h / 2) * (k1[i] + k2[i]);
+        }
 
-    public static double[] midpoint(BiFunction<Double, double[], double[]> f, double x_0, double[] y_0, double h) {
-        double[] y_next = new double[y_0.length];
+        return x_0 + h;
+    }
 
-        double[] k1 = f.apply(x_0, y_0);
-        double[] temp = new double[y_0.length];
+    public static double midpoint(EquationFunction f, double x_0, double[] y, double h, Workspace w) {
+        double[] k1 = w.k1, k2 = w.k2, temp = w.temp;
 
-        for (int i = 0; i < y_0.length; i++) {
-            temp[i] = y_0[i] + (h / 2) * k1[i];
+        f.apply(x_0, y, k1);
+        for (int i = 0; i < y.length; i++) {
+            temp[i] = y[i] + (h / 2) * k1[i];
         }
 
-        double[] k2 = f.apply(x_0 + h / 2, temp);
+        f.apply(x_0 + h / 2, temp, k2);
 
-        for (int i = 0; i < y_0.length; i++) {
-            y_next[i] = y_0[i] + h * k2[i];
+        for (int i = 0; i < y.length; i++) {
+            y[i] = y[i] + h * k2[i];
         }
 
-        double[] result = new double[y_0.length + 1];
-        result[0] = x_0 + h;
-        System.arraycopy(y_next, 0, result, 1, y_0.length);
-
-        return result;
+        return x_0 + h;
     }
 
-    public static double[] euler(BiFunction<Double, double[], double[]> f, double x_0, double[] y_0, double h) {
-        double[] y_next = new double[y_0.length];
+    public static double euler(EquationFunction f, double x_0, double[] y, double h, Workspace w) {
+        double[] k1 = w.k1;
 
-        double[] k1 = f.apply(x_0, y_0);
-        for (int i = 0; i < y_0.length; i++) {
-            y_next[i] = y_0[i] + h * k1[i];
+        f.apply(x_0, y, k1);
+        for (int i = 0; i < y.length; i++) {
+            y[i] = y[i] + h * k1[i];
         }
 
-        double[] result = new double[y_0.length + 1];
-        result[0] = x_0 + h;
-        System.arraycopy(y_next, 0, result, 1, y_0.length);
-
-        return result;
+        return x_0 + h;
     }
-}
\ No newline at end of file
+}
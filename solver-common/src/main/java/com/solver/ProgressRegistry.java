@@ -0,0 +1,68 @@
+package com.solver;
+
+import org.springframework.stereotype.Component;
+
+import java.util.HashMap;
+import java.util.Map;
+import java.util.Optional;
+import java.util.concurrent.ConcurrentHashMap;
+
+/**
+ * Progress of the applications being solved by this instance.
+ * Solvers publish the current x and the number of steps taken,
+ * readers get the covered fraction of [initialX, reachPoint],
+ * the step rate and an estimate of the remaining time.
+ */
+@Component
+public class ProgressRegistry {
+    private final Map<Integer, Progress> progresses = new ConcurrentHashMap<>();
+
+    public Progress start(int applicationId, double initialX, double reachPoint) {
+        Progress progress = new Progress(initialX, reachPoint);
+        progresses.put(applicationId, progress);
+        return progress;
+    }
+
+    public void finish(int applicationId) {
+        progresses.remove(applicationId);
+    }
+
+    public Optional<Map<String, Object>> get(int applicationId) {
+        return Optional.ofNullable(progresses.get(applicationId)).map(Progress::snapshot);
+    }
+
+    public static class Progress {
+        private final double initialX;
+        private final double reachPoint;
+        private final long startNanos = System.nanoTime();
+
+        // Written by the solver thread only, read by the status requests
+        private volatile double x;
+        private volatile long steps;
+
+        private Progress(double initialX, double reachPoint) {
+            this.initialX = initialX;
+            this.reachPoint = reachPoint;
+            this.x = initialX;
+        }
+
+        public void update(double x, long steps) {
+            this.x = x;
+            this.steps = steps;
+        }
+
+        private Map<String, Object> snapshot() {
+            double span = reachPoint - initialX;
+            double fraction = span > 0 ? Math.min(Math.max((x - initialX) / span, 0.0), 1.0) : 0.0;
+            double elapsed = (System.nanoTime() - startNanos) / 1e9;
+            double stepsPerSecond = elapsed > 0 ? steps / elapsed : 0.0;
+
+            Map<String, Object> snapshot = new HashMap<>();
+            snapshot.put("fraction", fraction);
+            snapshot.put("steps", steps);
+            snapshot.put("steps_per_second", stepsPerSecond);
+            snapshot.put("eta_seconds", fraction > 0 ? elapsed * (1 - fraction) / fraction : null);
+            return snapshot;
+        }
+    }
+}
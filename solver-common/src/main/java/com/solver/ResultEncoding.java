@@ -0,0 +1,145 @@
+package com.solver;
+
+import java.io.ByteArrayOutputStream;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.util.zip.DataFormatException;
+import java.util.zip.Deflater;
+import java.util.zip.Inflater;
+
+/**
+ * Packed storage of result columns as little-endian float64 values.
+ * With DELTA_DEFLATE the raw bits of consecutive values are stored
+ * as differences of 64-bit integers and deflated, which is lossless
+ * and shrinks evenly spaced or smooth columns considerably.
+ *
+ * The same columns are sent to clients that accept MEDIA_TYPE
+ * in a frame with a 24 byte little-endian header:
+ * magic "SOLV", version, encoding (0 raw, 1 delta_deflate), two reserved bytes,
+ * dimension and the byte lengths of the solution, x and y columns,
+ * followed by the columns themselves.
+ */
+public final class ResultEncoding {
+    public static final String RAW = "raw";
+    public static final String DELTA_DEFLATE = "delta_deflate";
+
+    public static final String MEDIA_TYPE = "application/vnd.solver.columns";
+
+    private static final byte[] MAGIC = { 'S', 'O', 'L', 'V' };
+    private static final byte VERSION = 1;
+    private static final int HEADER_BYTES = 24;
+
+    private ResultEncoding() {}
+
+    public static byte[] pack(double[][] columns, int length, String encoding) {
+        ByteBuffer buffer = ByteBuffer.allocate(columns.length * length * Double.BYTES)
+                .order(ByteOrder.LITTLE_ENDIAN);
+
+        switch (encoding) {
+            case RAW -> {
+                for (double[] column : columns) {
+                    for (int i = 0; i < length; i++) {
+                        buffer.putDouble(column[i]);
+                    }
+                }
+                return buffer.array();
+            }
+            case DELTA_DEFLATE -> {
+                long previous = 0;
+                for (double[] column : columns) {
+                    for (int i = 0; i < length; i++) {
+                        long bits = Double.doubleToRawLongBits(column[i]);
+                        buffer.putLong(bits - previous);
+                        previous = bits;
+                    }
+                }
+                return deflate(buffer.array());
+            }
+            default -> throw new IllegalArgumentException("Invalid result encoding: " + encoding);
+        }
+    }
+
+    public static double[] unpack(byte[] packed, String encoding) {
+        byte[] data = switch (encoding) {
+            case RAW -> packed;
+            case DELTA_DEFLATE -> inflate(packed);
+            default -> throw new IllegalArgumentException("Invalid result encoding: " + encoding);
+        };
+
+        ByteBuffer buffer = ByteBuffer.wrap(data).order(ByteOrder.LITTLE_ENDIAN);
+        double[] values = new double[data.length / Double.BYTES];
+        long previous = 0;
+        for (int i = 0; i < values.length; i++) {
+            if (DELTA_DEFLATE.equals(encoding)) {
+                previous += buffer.getLong();
+                values[i] = Double.longBitsToDouble(previous);
+            } else {
+                values[i] = buffer.getDouble();
+            }
+        }
+        return values;
+    }
+
+    public static byte[] frame(String encoding, int dimension, byte[] solution, byte[] xValues, byte[] yValues) {
+        byte encodingId = switch (encoding) {
+            case RAW -> 0;
+            case DELTA_DEFLATE -> 1;
+            default -> throw new IllegalArgumentException("Invalid result encoding: " + encoding);
+        };
+
+        return ByteBuffer.allocate(HEADER_BYTES + solution.length + xValues.length + yValues.length)
+                .order(ByteOrder.LITTLE_ENDIAN)
+                .put(MAGIC)
+                .put(VERSION)
+                .put(encodingId)
+                .putShort((short) 0)
+                .putInt(dimension)
+                .putInt(solution.length)
+                .putInt(xValues.length)
+                .putInt(yValues.length)
+                .put(solution)
+                .put(xValues)
+                .put(yValues)
+                .array();
+    }
+
+    private static byte[] inflate(byte[] data) {
+        Inflater inflater = new Inflater();
+        try {
+            inflater.setInput(data);
+
+            ByteArrayOutputStream out = new ByteArrayOutputStream(data.length * 4);
+            byte[] chunk = new byte[8192];
+            while (!inflater.finished()) {
+                int count = inflater.inflate(chunk);
+                if (count == 0 && !inflater.finished() && (inflater.needsInput() || inflater.needsDictionary())) {
+                    throw new SolverException("Truncated result column");
+                }
+                out.write(chunk, 0, count);
+            }
+            return out.toByteArray();
+        } catch (DataFormatException e) {
+            throw new SolverException("Corrupted result column", e);
+        } finally {
+            inflater.end();
+        }
+    }
+
+    private static byte[] deflate(byte[] data) {
+        Deflater deflater = new Deflater();
+        try {
+            deflater.setInput(data);
+            deflater.finish();
+
+            ByteArrayOutputStream out = new ByteArrayOutputStream(data.length / 4 + 64);
+            byte[] chunk = new byte[8192];
+            while (!deflater.finished()) {
+                int count = deflater.deflate(chunk);
+                out.write(chunk, 0, count);
+            }
+            return out.toByteArray();
+        } finally {
+            deflater.end();
+        }
+    }
+}
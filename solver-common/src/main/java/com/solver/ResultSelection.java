@@ -0,0 +1,117 @@
+package com.solver;
+
+import java.util.HashMap;
+import java.util.Map;
+
+/**
+ * Reduces a stored result to what a client asked for:
+ * only the final solution, or the trajectory decimated to at most
+ * maxPoints points. Decimation keeps the first and the last point
+ * and the minimum and maximum of every component in each bucket,
+ * so the visible envelope of every curve is preserved.
+ */
+public final class ResultSelection {
+    public static final String SOLUTION = "solution";
+    public static final String TRAJECTORY = "trajectory";
+
+    public static final int MIN_POINTS = 2;
+
+    private ResultSelection() {}
+
+    public static Map<String, Object> select(Map<String, Object> result, Integer maxPoints, boolean trajectory) {
+        // Results saved before the packed columns are returned unchanged
+        if (result.get("x_values") == null) {
+            return result;
+        }
+
+        Map<String, Object> selected = new HashMap<>(result);
+        if (!trajectory) {
+            selected.put("x_values", new byte[0]);
+            selected.put("y_values", new byte[0]);
+            return selected;
+        }
+        if (maxPoints == null) {
+            return selected;
+        }
+
+        String encoding = (String) result.get("encoding");
+        int dimension = ((Number) result.get("dimension")).intValue();
+        double[] xValues = ResultEncoding.unpack((byte[]) result.get("x_values"), encoding);
+        int n = xValues.length;
+        if (n <= maxPoints) {
+            return selected;
+        }
+
+        double[] yValues = ResultEncoding.unpack((byte[]) result.get("y_values"), encoding);
+        int[] indices = envelopeIndices(yValues, n, dimension, maxPoints);
+
+        double[][] xColumn = new double[1][indices.length];
+        double[][] yColumns = new double[dimension][indices.length];
+        for (int i = 0; i < indices.length; i++) {
+            xColumn[0][i] = xValues[indices[i]];
+            for (int j = 0; j < dimension; j++) {
+                yColumns[j][i] = yValues[j * n + indices[i]];
+            }
+        }
+
+        selected.put("x_values", ResultEncoding.pack(xColumn, indices.length, encoding));
+        selected.put("y_values", ResultEncoding.pack(yColumns, indices.length, encoding));
+        return selected;
+    }
+
+    private static int[] envelopeIndices(double[] yValues, int n, int dimension, int maxPoints) {
+        boolean[] keep = new boolean[n];
+        keep[0] = true;
+        keep[n - 1] = true;
+
+        int buckets = (maxPoints - 2) / (2 * Math.max(dimension, 1));
+        if (buckets < 1) {
+            // Too few points for an envelope of every component, take evenly spaced ones
+            int stride = (int) Math.ceil((n - 1) / (double) (maxPoints - 1));
+            for (int i = 0; i < n; i += stride) {
+                keep[i] = true;
+            }
+        } else {
+            int bucketSize = (int) Math.ceil(n / (double) buckets);
+            for (int j = 0; j < dimension; j++) {
+                int offset = j * n;
+                for (int start = 0; start < n; start += bucketSize) {
+                    int end = Math.min(start + bucketSize, n);
+                    int minIndex = -1;
+                    int maxIndex = -1;
+                    for (int i = start; i < end; i++) {
+                        double value = yValues[offset + i];
+                        if (Double.isNaN(value)) {
+                            continue;
+                        }
+                        if (minIndex < 0 || value < yValues[offset + minIndex]) {
+                            minIndex = i;
+                        }
+                        if (maxIndex < 0 || value > yValues[offset + maxIndex]) {
+                            maxIndex = i;
+                        }
+                    }
+                    if (minIndex >= 0) {
+                        keep[minIndex] = true;
+                        keep[maxIndex] = true;
+                    }
+                }
+            }
+        }
+
+        int count = 0;
+        for (boolean kept : keep) {
+            if (kept) {
+                count++;
+            }
+        }
+
+        int[] indices = new int[count];
+        for (int i = 0, k = 0; i < n; i++) {
+            if (keep[i]) {
+                indices[k++] = i;
+            }
+        }
+        return indices;
+    }
+}
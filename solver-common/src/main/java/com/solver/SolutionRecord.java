@@ -0,0 +1,25 @@
+package com.solver;
+
+import com.fasterxml.jackson.annotation.JsonCreator;
+import com.fasterxml.jackson.annotation.JsonProperty;
+
+public class SolutionRecord {
+    private SolverRequest request;
+    private SolutionResponse solution;
+
+    public SolutionRecord() {}
+
+    @JsonCreator
+    public SolutionRecord(
+            @JsonProperty("request") SolverRequest request,
+            @JsonProperty("solution") SolutionResponse solution) {
+        this.request = request;
+        this.solution = solution;
+    }
+
+    public SolverRequest getRequest() { return request; }
+    public void setRequest(SolverRequest request) { this.request = request; }
+
+    public SolutionResponse getSolution() { return solution; }
+    public void setSolution(SolutionResponse solution) { this.solution = solution; }
+}
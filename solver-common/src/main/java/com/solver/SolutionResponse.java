@@ -1,44 +1,63 @@
 package com.solver;
 
+import java.io.IOException;
 import java.util.List;
 
 import com.fasterxml.jackson.annotation.JsonCreator;
 import com.fasterxml.jackson.annotation.JsonProperty;
-import com.fasterxml.jackson.core.JsonProcessingException;
-import com.fasterxml.jackson.databind.ObjectMapper;
+import com.fasterxml.jackson.core.JsonGenerator;
+import com.fasterxml.jackson.databind.SerializerProvider;
+import com.fasterxml.jackson.databind.annotation.JsonSerialize;
+import com.fasterxml.jackson.databind.ser.std.StdSerializer;
 
+@JsonSerialize(using = SolutionResponse.Serializer.class)
 public class SolutionResponse {
-    private double[] solution;
-    private List<Double> xValues;
-    private List<double[]> yValues;
+    private final double[] solution;
+    private final TrajectoryBuffer trajectory;
 
-    public SolutionResponse() {}
+    public SolutionResponse(double[] solution, TrajectoryBuffer trajectory) {
+        this.solution = solution;
+        this.trajectory = trajectory;
+    }
 
+    // Solutions computed by the bot arrive row by row, the trajectory is left empty if they are incomplete
     @JsonCreator
     public SolutionResponse(
             @JsonProperty("solution") double[] solution,
             @JsonProperty("xValues") List<Double> xValues,
             @JsonProperty("yValues") List<double[]> yValues) {
         this.solution = solution;
-        this.xValues = xValues;
-        this.yValues = yValues;
+        this.trajectory = solution != null && solution.length > 0 && xValues != null && yValues != null
+                && xValues.size() == yValues.size()
+                && yValues.stream().allMatch(y -> y != null && y.length == solution.length - 1)
+                ? TrajectoryBuffer.fromRows(solution.length - 1, xValues, yValues)
+                : null;
     }
 
     public double[] getSolution() { return solution; }
-    public void setSolution(double[] solution) { this.solution = solution; }
 
-    public List<Double> getXValues() { return xValues; }
-    public void setXValues(List<Double> xValues) { this.xValues = xValues; }
+    public TrajectoryBuffer getTrajectory() { return trajectory; }
+
+    public void writeJson(JsonGenerator generator) throws IOException {
+        generator.writeStartObject();
+        generator.writeFieldName("solution");
+        generator.writeArray(solution, 0, solution.length);
+        generator.writeFieldName("xvalues");
+        trajectory.writeXValues(generator);
+        generator.writeFieldName("yvalues");
+        trajectory.writeYValues(generator);
+        generator.writeEndObject();
+    }
 
-    public List<double[]> getYValues() { return yValues; }
-    public void setYValues(List<double[]> yValues) { this.yValues = yValues; }
+    public static class Serializer extends StdSerializer<SolutionResponse> {
+        public Serializer() {
+            super(SolutionResponse.class);
+        }
 
-    public String toJson() {
-        ObjectMapper objectMapper = new ObjectMapper();
-        try {
-            return objectMapper.writeValueAsString(this);
-        } catch (JsonProcessingException e) {
-            throw new RuntimeException("Error converting SolutionResponse to JSON", e);
+        @Override
+        public void serialize(SolutionResponse value, JsonGenerator generator, SerializerProvider provider)
+                throws IOException {
+            value.writeJson(generator);
         }
     }
-}
\ No newline at end of file
+}
@@ -3,6 +3,8 @@ package com.solver;
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
 import org.springframework.web.bind.annotation.*;
+import org.springframework.http.HttpHeaders;
+import org.springframework.http.MediaType;
 import org.springframework.http.ResponseEntity;
 
 import java.util.concurrent.CompletableFuture;
@@ -14,12 +16,18 @@ import java.util.Map;
 public class SolverController {
     private static final Logger logger = LoggerFactory.getLogger(SolverController.class);
 
+    private static final int MAX_BATCH_STATUS_IDS = 1000;
+    private static final MediaType PACKED_RESULTS = MediaType.parseMediaType(ResultEncoding.MEDIA_TYPE);
+
     private final ApplicationProcessingService applicationProcessingService;
     private final DBService dbService;
+    private final ProgressRegistry progressRegistry;
 
-    public SolverController(ApplicationProcessingService applicationProcessingService, DBService dbService) {
+    public SolverController(ApplicationProcessingService applicationProcessingService, DBService dbService,
+                            ProgressRegistry progressRegistry) {
         this.applicationProcessingService = applicationProcessingService;
         this.dbService = dbService;
+        this.progressRegistry = progressRegistry;
     }
 
     @PostMapping("/users/{userId}/settings")
@@ -56,6 +64,32 @@ public class SolverController {
             });
     }
 
+    @PostMapping("/users/{userId}/solutions")
+    public CompletableFuture<ResponseEntity<Integer>> saveSolution(
+            @PathVariable("userId") Long userId,
+            @RequestBody SolutionRecord record) {
+        logger.debug("Received solution computed by the client for userId: {}", userId);
+
+        SolverRequest request = record.getRequest();
+        SolutionResponse solution = record.getSolution();
+        if (request == null || solution == null || solution.getSolution() == null
+                || solution.getTrajectory() == null) {
+            throw new IllegalArgumentException("Incomplete solution for userId: " + userId);
+        }
+
+        return dbService.createApplication(request.toJson(), "new", userId)
+            .thenCompose(applicationId -> dbService.saveResults(applicationId, solution)
+                .thenCompose(v -> dbService.updateApplicationStatus(applicationId, "completed"))
+                .thenApply(v -> {
+                    logger.debug("Stored client solution as application {} for userId: {}", applicationId, userId);
+                    return ResponseEntity.ok(applicationId);
+                }))
+            .exceptionally(e -> {
+                logger.error("Error storing solution for userId: {}", userId, e);
+                throw new SolverException("Error storing solution", e);
+            });
+    }
+
     private void processEquationSolvingAsync(int applicationId, SolverRequest request) {
         applicationProcessingService.processApplication(applicationId, request);
     }
@@ -95,20 +129,75 @@ public class SolverController {
                     .orElseThrow(() -> new NotFoundException("Application not found for applicationId: " + applicationId)));
     }
 
+    @GetMapping("/applications/status")
+    public CompletableFuture<ResponseEntity<List<Map<String, Object>>>> getApplicationStatuses(
+            @RequestParam("ids") List<Integer> applicationIds) {
+        logger.debug("Getting statuses for {} applications", applicationIds.size());
+
+        if (applicationIds.size() > MAX_BATCH_STATUS_IDS) {
+            throw new IllegalArgumentException("Too many applicationIds in one request: " + applicationIds.size());
+        }
+
+        // Applications being solved also report how far the solver got
+        return dbService.getApplicationStatuses(applicationIds)
+                .thenApply(statuses -> {
+                    statuses.forEach(status -> progressRegistry.get((Integer) status.get("id"))
+                        .ifPresent(progress -> status.put("progress", progress)));
+                    return ResponseEntity.ok(statuses);
+                });
+    }
+
     @GetMapping("/applications/{applicationId}/results")
-    public CompletableFuture<ResponseEntity<List<Map<String, Object>>>> getResults(@PathVariable("applicationId") int applicationId) {
+    public CompletableFuture<ResponseEntity<?>> getResults(
+            @PathVariable("applicationId") int applicationId,
+            @RequestParam(value = "max_points", required = false) Integer maxPoints,
+            @RequestParam(value = "fields", required = false) List<String> fields,
+            @RequestHeader(value = HttpHeaders.ACCEPT, required = false) String accept) {
         logger.debug("Getting results for applicationId: {}", applicationId);
         
         if (applicationId <= 0) {
             throw new NotFoundException("Invalid applicationId: " + applicationId);
         }
+
+        if (maxPoints != null && maxPoints < ResultSelection.MIN_POINTS) {
+            throw new IllegalArgumentException("max_points must be at least " + ResultSelection.MIN_POINTS);
+        }
+        if (fields != null && !List.of(ResultSelection.SOLUTION, ResultSelection.TRAJECTORY).containsAll(fields)) {
+            throw new IllegalArgumentException("Invalid fields: " + fields);
+        }
+        boolean trajectory = fields == null || fields.contains(ResultSelection.TRAJECTORY);
+
+        boolean packed = accept != null && MediaType.parseMediaTypes(accept).stream()
+            .anyMatch(PACKED_RESULTS::equalsTypeAndSubtype);
         
         return dbService.getResults(applicationId)
                 .thenApply(results -> {
                     if (results.isEmpty()) {
                         throw new NotFoundException("Results not found for applicationId: " + applicationId);
                     }
-                    return ResponseEntity.ok(results);
+
+                    List<Map<String, Object>> selected = results.stream()
+                        .map(result -> ResultSelection.select(result, maxPoints, trajectory))
+                        .toList();
+
+                    // Results saved before the packed columns are only available as JSON
+                    Map<String, Object> result = selected.getFirst();
+                    if (!packed || result.get("x_values") == null) {
+                        return ResponseEntity.ok()
+                            .contentType(MediaType.APPLICATION_JSON)
+                            .body(selected);
+                    }
+
+                    byte[] body = ResultEncoding.frame(
+                        (String) result.get("encoding"),
+                        ((Number) result.get("dimension")).intValue(),
+                        (byte[]) result.get("solution"),
+                        (byte[]) result.get("x_values"),
+                        (byte[]) result.get("y_values"));
+
+                    return ResponseEntity.ok()
+                        .contentType(PACKED_RESULTS)
+                        .body(body);
                 });
     }
 }
\ No newline at end of file
@@ -12,6 +12,8 @@ public class SolverRequest {
     private double[] initialY;
     private double reachPoint;
     private double stepSize;
+    private Double relativeTolerance;
+    private Double absoluteTolerance;
 
     public String getMethod() { return method; }
     public void setMethod(String method) { this.method = method; }
@@ -37,6 +39,12 @@ public class SolverRequest {
     public double getStepSize() { return stepSize; }
     public void setStepSize(double stepSize) { this.stepSize = stepSize; }
 
+    public Double getRelativeTolerance() { return relativeTolerance; }
+    public void setRelativeTolerance(Double relativeTolerance) { this.relativeTolerance = relativeTolerance; }
+
+    public Double getAbsoluteTolerance() { return absoluteTolerance; }
+    public void setAbsoluteTolerance(Double absoluteTolerance) { this.absoluteTolerance = absoluteTolerance; }
+
     public String toJson() {
         ObjectMapper objectMapper = new ObjectMapper();
         try {
@@ -5,8 +5,6 @@ import org.slf4j.LoggerFactory;
 import org.springframework.scheduling.annotation.Async;
 import org.springframework.stereotype.Service;
 
-import java.util.List;
-import java.util.ArrayList;
 import java.util.concurrent.CompletableFuture;
 import java.util.function.BiFunction;
 
@@ -14,50 +12,82 @@ import java.util.function.BiFunction;
 public class SolverService {
     private static final Logger logger = LoggerFactory.getLogger(SolverService.class);
 
+    // Fixed-step solves publish their progress once per this many steps
+    private static final int PROGRESS_STEPS = 1024;
+
+    private final ProgressRegistry progressRegistry;
+
+    public SolverService(ProgressRegistry progressRegistry) {
+        this.progressRegistry = progressRegistry;
+    }
+
     @Async("taskExecutor")
-    public CompletableFuture<SolutionResponse> solveEquation(SolverRequest request) {
+    public CompletableFuture<SolutionResponse> solveEquation(int applicationId, SolverRequest request) {
         return CompletableFuture.supplyAsync(() -> {
+            ProgressRegistry.Progress progress =
+                progressRegistry.start(applicationId, request.getInitialX(), request.getReachPoint());
             try {
                 logger.debug("Starting equation solving with method: {}, order: {}", 
                     request.getMethod(), request.getOrder());
 
-                BiFunction<Double, double[], double[]> equationFunction = 
-                    CreateEquationFunction.create(request.getFormattedEquation(), request.getOrder());
+                if ("dormandPrinceAdaptive".equals(request.getMethod())) {
+                    if (request.getRelativeTolerance() == null || request.getAbsoluteTolerance() == null) {
+                        throw new IllegalArgumentException("Tolerances are required for the adaptive method");
+                    }
+
+                    BiFunction<Double, double[], double[]> equationFunction =
+                        CreateEquationFunction.create(request.getFormattedEquation(), request.getOrder());
+
+                    // The step size only sets the spacing of the dense output
+                    SolutionResponse response = AdaptiveDormandPrince.solve(equationFunction,
+                        request.getInitialX(), request.getInitialY(), request.getReachPoint(),
+                        request.getStepSize(), request.getRelativeTolerance(), request.getAbsoluteTolerance(),
+                        progress);
 
-                List<Double> xValues = new ArrayList<>();
-                List<double[]> yValues = new ArrayList<>();
+                    logger.debug("Successfully completed adaptive equation solving with {} output points",
+                        response.getTrajectory().size());
+                    return response;
+                }
+
+                EquationFunction equationFunction =
+                    CreateEquationFunction.createInPlace(request.getFormattedEquation(), request.getOrder());
+                NumericalMethods.Stepper stepper = NumericalMethods.stepper(request.getMethod());
 
                 double x = request.getInitialX();
                 double[] y = request.getInitialY().clone();
+                double h = request.getStepSize();
+                if (!(h > 0) || Double.isInfinite(h)) {
+                    throw new IllegalArgumentException("Step size must be positive");
+                }
+
+                int expectedSteps = (int) Math.min(Integer.MAX_VALUE,
+                    Math.ceil((request.getReachPoint() - x) / h) + 1);
+                TrajectoryBuffer trajectory = new TrajectoryBuffer(y.length, expectedSteps);
+
+                // Stage buffers are shared by every step, y is advanced in place
+                NumericalMethods.Workspace workspace = new NumericalMethods.Workspace(y.length);
 
                 while (x < request.getReachPoint() - 1e-10) {
-                    double[] result = switch (request.getMethod()) {
-                        case "euler" -> NumericalMethods.euler(equationFunction, x, y, request.getStepSize());
-                        case "midpoint" -> NumericalMethods.midpoint(equationFunction, x, y, request.getStepSize());
-                        case "heun" -> NumericalMethods.heun(equationFunction, x, y, request.getStepSize());
-                        case "rungeKutta" -> NumericalMethods.rungeKutta(equationFunction, x, y, request.getStepSize());
-                        case "dormandPrince" -> NumericalMethods.dormandPrince(equationFunction, x, y, request.getStepSize());
-                        default -> throw new IllegalArgumentException("Invalid method value: " + request.getMethod());
-                    };
-
-                    x = result[0];
-                    y = new double[result.length - 1];
-                    System.arraycopy(result, 1, y, 0, result.length - 1);
-
-                    xValues.add(x);
-                    yValues.add(y.clone());
+                    x = stepper.step(equationFunction, x, y, h, workspace);
+
+                    trajectory.add(x, y);
+                    if (trajectory.size() % PROGRESS_STEPS == 0) {
+                        progress.update(x, trajectory.size());
+                    }
                 }
 
                 double[] finalSolution = new double[1 + y.length];
                 finalSolution[0] = x;
                 System.arraycopy(y, 0, finalSolution, 1, y.length);
 
-                logger.debug("Successfully completed equation solving with {} steps", xValues.size());
-                return new SolutionResponse(finalSolution, xValues, yValues);
+                logger.debug("Successfully completed equation solving with {} steps", trajectory.size());
+                return new SolutionResponse(finalSolution, trajectory);
 
             } catch (Exception e) {
                 logger.error("Error solving equation: {}", e.getMessage(), e);
                 throw new SolverException("Error solving equation: " + e.getMessage(), e);
+            } finally {
+                progressRegistry.finish(applicationId);
             }
         });
     }
@@ -0,0 +1,99 @@
+package com.solver;
+
+import com.fasterxml.jackson.core.JsonGenerator;
+
+import java.io.IOException;
+import java.util.Arrays;
+import java.util.List;
+
+/**
+ * Growable column-major storage of the solution points:
+ * one primitive array for x and one per component of y.
+ */
+public class TrajectoryBuffer {
+    private static final int MIN_CAPACITY = 16;
+    private static final int MAX_INITIAL_CAPACITY = 1 << 20;
+
+    private final int dimension;
+    private double[] xValues;
+    private final double[][] yValues;
+    private int size;
+
+    public TrajectoryBuffer(int dimension, int expectedSize) {
+        if (dimension < 0) {
+            throw new IllegalArgumentException("Dimension must not be negative");
+        }
+
+        int capacity = Math.max(MIN_CAPACITY, Math.min(expectedSize, MAX_INITIAL_CAPACITY));
+
+        this.dimension = dimension;
+        this.xValues = new double[capacity];
+        this.yValues = new double[dimension][capacity];
+    }
+
+    public static TrajectoryBuffer fromRows(int dimension, List<Double> xValues, List<double[]> yValues) {
+        if (xValues.size() != yValues.size()) {
+            throw new IllegalArgumentException("Number of x values does not match number of y values");
+        }
+
+        TrajectoryBuffer buffer = new TrajectoryBuffer(dimension, xValues.size());
+        for (int i = 0; i < xValues.size(); i++) {
+            buffer.add(xValues.get(i), yValues.get(i));
+        }
+        return buffer;
+    }
+
+    public void add(double x, double[] y) {
+        if (y.length != dimension) {
+            throw new IllegalArgumentException("Expected " + dimension + " values of y, got " + y.length);
+        }
+
+        if (size == xValues.length) {
+            int capacity = xValues.length * 2;
+            xValues = Arrays.copyOf(xValues, capacity);
+            for (int j = 0; j < dimension; j++) {
+                yValues[j] = Arrays.copyOf(yValues[j], capacity);
+            }
+        }
+
+        xValues[size] = x;
+        for (int j = 0; j < dimension; j++) {
+            yValues[j][size] = y[j];
+        }
+        size++;
+    }
+
+    public int size() { return size; }
+
+    public int getDimension() { return dimension; }
+
+    public double getX(int index) { return xValues[index]; }
+
+    public double getY(int index, int component) { return yValues[component][index]; }
+
+    public byte[] packXValues(String encoding) {
+        return ResultEncoding.pack(new double[][] { xValues }, size, encoding);
+    }
+
+    // y values are packed column after column
+    public byte[] packYValues(String encoding) {
+        return ResultEncoding.pack(yValues, size, encoding);
+    }
+
+    public void writeXValues(JsonGenerator generator) throws IOException {
+        generator.writeArray(xValues, 0, size);
+    }
+
+    // y values are written row by row, as the clients expect one array per point
+    public void writeYValues(JsonGenerator generator) throws IOException {
+        generator.writeStartArray(null, size);
+        for (int i = 0; i < size; i++) {
+            generator.writeStartArray(null, dimension);
+            for (int j = 0; j < dimension; j++) {
+                generator.writeNumber(yValues[j][i]);
+            }
+            generator.writeEndArray();
+        }
+        generator.writeEndArray();
+    }
+}
@@ -0,0 +1,63 @@
+package com.solver;
+
+import org.junit.jupiter.api.Test;
+
+import java.util.function.BiFunction;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertThrows;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+class AdaptiveDormandPrinceTest {
+    // y'' = -y with y(0) = 1, y'(0) = 0, solved by y = cos(x)
+    private static final BiFunction<Double, double[], double[]> OSCILLATOR =
+            (x, y) -> new double[] { y[1], -y[0] };
+
+    private static SolutionResponse solve(double reachPoint, double outputStep, double tolerance) {
+        ProgressRegistry.Progress progress = new ProgressRegistry().start(1, 0.0, reachPoint);
+        return AdaptiveDormandPrince.solve(OSCILLATOR, 0.0, new double[] { 1.0, 0.0 },
+                reachPoint, outputStep, tolerance, tolerance, progress);
+    }
+
+    @Test
+    void meetsTolerance() {
+        for (double tolerance : new double[] { 1e-4, 1e-8, 1e-11 }) {
+            double[] solution = solve(10.0, 0.5, tolerance).getSolution();
+
+            assertEquals(10.0, solution[0]);
+            assertTrue(Math.abs(solution[1] - Math.cos(10.0)) < 100 * tolerance,
+                    "error " + Math.abs(solution[1] - Math.cos(10.0)) + " at tolerance " + tolerance);
+            assertTrue(Math.abs(solution[2] + Math.sin(10.0)) < 100 * tolerance);
+        }
+    }
+
+    @Test
+    void reportsDenseOutputOnUniformGrid() {
+        TrajectoryBuffer trajectory = solve(3.0, 0.1, 1e-9).getTrajectory();
+
+        assertEquals(30, trajectory.size());
+        assertEquals(2, trajectory.getDimension());
+        for (int i = 0; i < trajectory.size(); i++) {
+            double x = trajectory.getX(i);
+            assertEquals((i + 1) * 0.1, x, 1e-12);
+            assertEquals(Math.cos(x), trajectory.getY(i, 0), 1e-7);
+            assertEquals(-Math.sin(x), trajectory.getY(i, 1), 1e-7);
+        }
+        assertEquals(3.0, trajectory.getX(trajectory.size() - 1));
+    }
+
+    @Test
+    void returnsInitialValuesWhenReachPointIsNotAhead() {
+        SolutionResponse response = solve(0.0, 0.1, 1e-6);
+
+        assertEquals(0, response.getTrajectory().size());
+        assertEquals(0.0, response.getSolution()[0]);
+        assertEquals(1.0, response.getSolution()[1]);
+    }
+
+    @Test
+    void rejectsNonPositiveTolerances() {
+        assertThrows(IllegalArgumentException.class, () -> solve(1.0, 0.1, 0.0));
+        assertThrows(IllegalArgumentException.class, () -> solve(1.0, 0.1, -1e-6));
+    }
+}
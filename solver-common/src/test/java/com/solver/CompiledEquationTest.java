@@ -0,0 +1,88 @@
+package com.solver;
+
+import org.junit.jupiter.api.Test;
+
+import static org.junit.jupiter.api.Assertions.assertArrayEquals;
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertThrows;
+
+class CompiledEquationTest {
+    private static final double[] Y = { 0.5, -2.0, 3.0 };
+
+    private static double evaluate(String expression, double x) {
+        return CompiledEquation.compile(expression, Y.length).evaluate(x, Y);
+    }
+
+    @Test
+    void bindsVariablesByIndex() {
+        CompiledEquation equation = CompiledEquation.compile("sin(x) - 0.1*y1 - y0", 2);
+
+        assertEquals(Math.sin(0.3) - 0.1 * -2.0 - 0.5, equation.evaluate(0.3, Y));
+        assertEquals(Math.sin(1.0) - 0.1 * 4.0 - 1.0, equation.evaluate(1.0, new double[] { 1.0, 4.0 }));
+    }
+
+    @Test
+    void followsExp4jPrecedence() {
+        assertEquals(7.0, evaluate("1 + 2*3", 0.0));
+        assertEquals(-4.0, evaluate("-2^2", 0.0));
+        assertEquals(512.0, evaluate("2^3^2", 0.0));
+        assertEquals(0.25, evaluate("2^-2", 0.0));
+        assertEquals(1.0, evaluate("7 % 3", 0.0));
+        assertEquals(2.0, evaluate("8/2/2", 0.0));
+        assertEquals(-1.5, evaluate("-y0*3", 0.0));
+        assertEquals(5.0, evaluate("--5", 0.0));
+    }
+
+    @Test
+    void multipliesAdjacentOperands() {
+        assertEquals(6.0, evaluate("2x", 3.0));
+        assertEquals(8.0, evaluate("2(x + 1)", 3.0));
+        assertEquals(2 * Math.E, evaluate("2e", 0.0));
+        assertEquals(0.02, evaluate("2e-2", 0.0));
+        assertEquals(12.0, evaluate("(x)(y2 + 1)", 3.0));
+    }
+
+    @Test
+    void evaluatesFunctionsAndConstants() {
+        assertArrayEquals(
+                new double[] { Math.exp(1.5), Math.log(1.5), Math.log10(1.5), Math.sqrt(1.5), Math.pow(1.5, 3.0),
+                        1.0 / Math.tan(1.5), Math.atan(1.0 / 1.5), Math.PI * 1.5, Math.abs(-1.5) },
+                new double[] { evaluate("exp(x)", 1.5), evaluate("log(x)", 1.5), evaluate("log10(x)", 1.5),
+                        evaluate("sqrt(x)", 1.5), evaluate("pow(x, 3)", 1.5), evaluate("cot(x)", 1.5),
+                        evaluate("atan(1 / x)", 1.5), evaluate("pi*x", 1.5), evaluate("abs(-x)", 1.5) });
+    }
+
+    @Test
+    void divisionByZeroThrowsOnEvaluation() {
+        CompiledEquation equation = CompiledEquation.compile("1 / x", 1);
+
+        assertEquals(0.5, equation.evaluate(2.0, Y));
+        ArithmeticException e = assertThrows(ArithmeticException.class, () -> equation.evaluate(0.0, Y));
+        assertEquals("Division by zero!", e.getMessage());
+
+        CompiledEquation constant = CompiledEquation.compile("x + 1/0", 1);
+        assertThrows(ArithmeticException.class, () -> constant.evaluate(2.0, Y));
+    }
+
+    @Test
+    void rejectsInvalidExpressions() {
+        assertThrows(IllegalArgumentException.class, () -> CompiledEquation.compile("y2", 2));
+        assertThrows(IllegalArgumentException.class, () -> CompiledEquation.compile("foo(x)", 1));
+        assertThrows(IllegalArgumentException.class, () -> CompiledEquation.compile("(x + 1", 1));
+        assertThrows(IllegalArgumentException.class, () -> CompiledEquation.compile("x +", 1));
+        assertThrows(IllegalArgumentException.class, () -> CompiledEquation.compile("x ) 1", 1));
+    }
+
+    @Test
+    void equationFunctionReadsBracketedVariables() {
+        EquationFunction f = CreateEquationFunction.createInPlace("sin(x) - y[2] - y[0]", 3);
+        double[] dydt = new double[3];
+
+        f.apply(0.5, Y, dydt);
+
+        assertArrayEquals(new double[] { -2.0, 3.0, Math.sin(0.5) - 3.0 - 0.5 }, dydt);
+        SolverException e = assertThrows(SolverException.class,
+                () -> CreateEquationFunction.createInPlace("y[0] / (x - 1)", 1).apply(1.0, Y, dydt));
+        assertEquals("Division by zero occurred at x = 1.0", e.getMessage());
+    }
+}
@@ -0,0 +1,75 @@
+package com.solver;
+
+import org.junit.jupiter.api.Test;
+
+import java.util.Map;
+
+import static org.junit.jupiter.api.Assertions.assertArrayEquals;
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertThrows;
+
+class NumericalMethodsTest {
+    // y' = x - y with y(0) = 1, the bot's local steppers are checked against the same values
+    private static final EquationFunction FIRST_ORDER = (x, y, dydt) -> dydt[0] = x - y[0];
+
+    // y'' = -y with y(0) = 1, y'(0) = 0
+    private static final EquationFunction SECOND_ORDER = (x, y, dydt) -> {
+        dydt[0] = y[1];
+        dydt[1] = -y[0];
+    };
+
+    private static final Map<String, double[]> FIRST_ORDER_SOLUTIONS = Map.of(
+            "euler", new double[] { 2.0000000000000004, 1.2431533091811389 },
+            "midpoint", new double[] { 2.0000000000000004, 1.2716449150041687 },
+            "heun", new double[] { 2.0000000000000004, 1.2716449150041687 },
+            "rungeKutta", new double[] { 2.0000000000000004, 1.2706710568435817 },
+            "dormandPrince", new double[] { 2.0000000000000004, 1.270670568252337 });
+
+    private static final Map<String, double[]> SECOND_ORDER_SOLUTIONS = Map.of(
+            "euler", new double[] { 2.0000000000000004, -0.45301865001711583, -1.0074542881365074 },
+            "midpoint", new double[] { 2.0000000000000004, -0.41927120244992866, -0.9081364311401705 },
+            "heun", new double[] { 2.0000000000000004, -0.41927120244992866, -0.9081364311401705 },
+            "rungeKutta", new double[] { 2.0000000000000004, -0.41614526873411334, -0.9092979917935007 },
+            "dormandPrince", new double[] { 2.0000000000000004, -0.41614683512494965, -0.9092974214354939 });
+
+    private static double[] solve(String method, EquationFunction f, double[] initialY) {
+        NumericalMethods.Stepper stepper = NumericalMethods.stepper(method);
+        NumericalMethods.Workspace workspace = new NumericalMethods.Workspace(initialY.length);
+
+        double x = 0.0;
+        double[] y = initialY.clone();
+        while (x < 2.0 - 1e-10) {
+            x = stepper.step(f, x, y, 0.1, workspace);
+        }
+
+        double[] solution = new double[1 + y.length];
+        solution[0] = x;
+        System.arraycopy(y, 0, solution, 1, y.length);
+        return solution;
+    }
+
+    @Test
+    void matchesReferenceSolutions() {
+        for (String method : FIRST_ORDER_SOLUTIONS.keySet()) {
+            assertArrayEquals(FIRST_ORDER_SOLUTIONS.get(method), solve(method, FIRST_ORDER, new double[] { 1.0 }));
+            assertArrayEquals(SECOND_ORDER_SOLUTIONS.get(method),
+                    solve(method, SECOND_ORDER, new double[] { 1.0, 0.0 }));
+        }
+    }
+
+    @Test
+    void advancesYInPlaceAndReturnsNextX() {
+        double[] y = { 1.0, 0.0 };
+        NumericalMethods.Workspace workspace = new NumericalMethods.Workspace(2);
+
+        double x = NumericalMethods.euler(SECOND_ORDER, 0.5, y, 0.25, workspace);
+
+        assertEquals(0.75, x);
+        assertArrayEquals(new double[] { 1.0, -0.25 }, y);
+    }
+
+    @Test
+    void rejectsUnknownMethod() {
+        assertThrows(IllegalArgumentException.class, () -> NumericalMethods.stepper("dormandPrinceAdaptive"));
+    }
+}
@@ -0,0 +1,52 @@
+package com.solver;
+
+import org.junit.jupiter.api.Test;
+
+import java.util.Map;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertNull;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+class ProgressRegistryTest {
+    @Test
+    void reportsFractionAndStepsUntilFinished() {
+        ProgressRegistry registry = new ProgressRegistry();
+        ProgressRegistry.Progress progress = registry.start(1, 2.0, 6.0);
+
+        Map<String, Object> started = registry.get(1).orElseThrow();
+        assertEquals(0.0, started.get("fraction"));
+        assertEquals(0L, started.get("steps"));
+        assertNull(started.get("eta_seconds"));
+
+        progress.update(3.0, 100);
+        Map<String, Object> running = registry.get(1).orElseThrow();
+        assertEquals(0.25, running.get("fraction"));
+        assertEquals(100L, running.get("steps"));
+        assertTrue((Double) running.get("eta_seconds") >= 0);
+
+        registry.finish(1);
+        assertTrue(registry.get(1).isEmpty());
+    }
+
+    @Test
+    void clampsFractionToUnitInterval() {
+        ProgressRegistry registry = new ProgressRegistry();
+        ProgressRegistry.Progress progress = registry.start(1, 0.0, 1.0);
+
+        progress.update(1.0000001, 10);
+        assertEquals(1.0, registry.get(1).orElseThrow().get("fraction"));
+
+        progress.update(-1.0, 10);
+        assertEquals(0.0, registry.get(1).orElseThrow().get("fraction"));
+    }
+
+    @Test
+    void reportsNoProgressForEmptyInterval() {
+        ProgressRegistry registry = new ProgressRegistry();
+        registry.start(1, 1.0, 1.0).update(1.0, 0);
+
+        assertEquals(0.0, registry.get(1).orElseThrow().get("fraction"));
+        assertTrue(registry.get(2).isEmpty());
+    }
+}
@@ -0,0 +1,142 @@
+package com.solver;
+
+import org.junit.jupiter.api.Test;
+
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.util.Arrays;
+
+import static org.junit.jupiter.api.Assertions.assertArrayEquals;
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertThrows;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+class ResultEncodingTest {
+    private static final int N = 1000;
+
+    private static double[] xValues() {
+        double[] xValues = new double[N];
+        for (int i = 0; i < N; i++) {
+            xValues[i] = i * 0.01;
+        }
+        return xValues;
+    }
+
+    private static double[][] yColumns() {
+        double[][] yColumns = new double[3][N];
+        for (int i = 0; i < N; i++) {
+            double x = i * 0.01;
+            yColumns[0][i] = Math.sin(x);
+            yColumns[1][i] = Math.cos(x) * Math.exp(-x);
+            yColumns[2][i] = -x * x;
+        }
+        return yColumns;
+    }
+
+    private static double[] concat(double[][] columns) {
+        return Arrays.stream(columns).flatMapToDouble(Arrays::stream).toArray();
+    }
+
+    @Test
+    void rawRoundTripsXAndYColumns() {
+        double[] xValues = xValues();
+        double[][] yColumns = yColumns();
+
+        byte[] x = ResultEncoding.pack(new double[][] { xValues }, N, ResultEncoding.RAW);
+        byte[] y = ResultEncoding.pack(yColumns, N, ResultEncoding.RAW);
+
+        assertEquals(N * Double.BYTES, x.length);
+        assertEquals(3 * N * Double.BYTES, y.length);
+        assertArrayEquals(xValues, ResultEncoding.unpack(x, ResultEncoding.RAW));
+        assertArrayEquals(concat(yColumns), ResultEncoding.unpack(y, ResultEncoding.RAW));
+    }
+
+    @Test
+    void deltaDeflateRoundTripsXAndYColumns() {
+        double[] xValues = xValues();
+        double[][] yColumns = yColumns();
+
+        byte[] x = ResultEncoding.pack(new double[][] { xValues }, N, ResultEncoding.DELTA_DEFLATE);
+        byte[] y = ResultEncoding.pack(yColumns, N, ResultEncoding.DELTA_DEFLATE);
+
+        assertTrue(x.length < N * Double.BYTES);
+        assertTrue(y.length < 3 * N * Double.BYTES);
+        assertArrayEquals(xValues, ResultEncoding.unpack(x, ResultEncoding.DELTA_DEFLATE));
+        assertArrayEquals(concat(yColumns), ResultEncoding.unpack(y, ResultEncoding.DELTA_DEFLATE));
+    }
+
+    @Test
+    void roundTripsSpecialValuesBitForBit() {
+        double[] values = {
+            0.0, -0.0, Double.NaN, Double.POSITIVE_INFINITY, Double.NEGATIVE_INFINITY,
+            Double.MIN_VALUE, Double.MAX_VALUE, -1e-300, 1e300
+        };
+
+        for (String encoding : new String[] { ResultEncoding.RAW, ResultEncoding.DELTA_DEFLATE }) {
+            double[] unpacked = ResultEncoding.unpack(
+                    ResultEncoding.pack(new double[][] { values }, values.length, encoding), encoding);
+
+            assertEquals(values.length, unpacked.length);
+            for (int i = 0; i < values.length; i++) {
+                assertEquals(Double.doubleToRawLongBits(values[i]), Double.doubleToRawLongBits(unpacked[i]));
+            }
+        }
+    }
+
+    @Test
+    void packsOnlyTheFirstLengthValues() {
+        double[] buffer = { 1.0, 2.0, 3.0, 0.0, 0.0 };
+
+        for (String encoding : new String[] { ResultEncoding.RAW, ResultEncoding.DELTA_DEFLATE }) {
+            assertArrayEquals(new double[] { 1.0, 2.0, 3.0 },
+                    ResultEncoding.unpack(ResultEncoding.pack(new double[][] { buffer }, 3, encoding), encoding));
+        }
+    }
+
+    @Test
+    void roundTripsEmptyColumns() {
+        for (String encoding : new String[] { ResultEncoding.RAW, ResultEncoding.DELTA_DEFLATE }) {
+            assertEquals(0, ResultEncoding.unpack(ResultEncoding.pack(new double[][] { {} }, 0, encoding), encoding).length);
+        }
+    }
+
+    @Test
+    void rejectsUnknownEncoding() {
+        assertThrows(IllegalArgumentException.class,
+                () -> ResultEncoding.pack(new double[][] { { 1.0 } }, 1, "gzip"));
+        assertThrows(IllegalArgumentException.class,
+                () -> ResultEncoding.unpack(new byte[8], "gzip"));
+    }
+
+    @Test
+    void rejectsTruncatedDeflatedColumn() {
+        byte[] packed = ResultEncoding.pack(new double[][] { xValues() }, N, ResultEncoding.DELTA_DEFLATE);
+
+        assertThrows(SolverException.class,
+                () -> ResultEncoding.unpack(Arrays.copyOf(packed, packed.length / 2), ResultEncoding.DELTA_DEFLATE));
+    }
+
+    @Test
+    void frameHasHeaderFollowedByColumns() {
+        byte[] solution = ResultEncoding.pack(new double[][] { { 2.0, 1.0, 0.5 } }, 3, ResultEncoding.RAW);
+        byte[] x = ResultEncoding.pack(new double[][] { xValues() }, N, ResultEncoding.DELTA_DEFLATE);
+        byte[] y = ResultEncoding.pack(yColumns(), N, ResultEncoding.DELTA_DEFLATE);
+
+        byte[] frame = ResultEncoding.frame(ResultEncoding.DELTA_DEFLATE, 3, solution, x, y);
+
+        ByteBuffer buffer = ByteBuffer.wrap(frame).order(ByteOrder.LITTLE_ENDIAN);
+        byte[] magic = new byte[4];
+        buffer.get(magic);
+        assertArrayEquals(new byte[] { 'S', 'O', 'L', 'V' }, magic);
+        assertEquals(1, buffer.get());
+        assertEquals(1, buffer.get());
+        assertEquals(0, buffer.getShort());
+        assertEquals(3, buffer.getInt());
+        assertEquals(solution.length, buffer.getInt());
+        assertEquals(x.length, buffer.getInt());
+        assertEquals(y.length, buffer.getInt());
+        assertEquals(24, buffer.position());
+        assertEquals(24 + solution.length + x.length + y.length, frame.length);
+        assertArrayEquals(y, Arrays.copyOfRange(frame, frame.length - y.length, frame.length));
+    }
+}
@@ -0,0 +1,124 @@
+package com.solver;
+
+import org.junit.jupiter.api.Test;
+
+import java.util.HashMap;
+import java.util.Map;
+
+import static org.junit.jupiter.api.Assertions.assertArrayEquals;
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertSame;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+class ResultSelectionTest {
+    private static final int N = 1000;
+
+    private static double[] xValues;
+    private static double[][] yColumns;
+
+    private static Map<String, Object> result(String encoding) {
+        xValues = new double[N];
+        yColumns = new double[2][N];
+        for (int i = 0; i < N; i++) {
+            double x = i * 0.01;
+            xValues[i] = x;
+            yColumns[0][i] = Math.sin(3 * x);
+            yColumns[1][i] = Math.cos(x);
+        }
+        // Spikes a plain stride would step over
+        yColumns[0][501] = 10.0;
+        yColumns[1][333] = -10.0;
+
+        Map<String, Object> result = new HashMap<>();
+        result.put("id", 1);
+        result.put("encoding", encoding);
+        result.put("dimension", 2);
+        result.put("solution", ResultEncoding.pack(new double[][] { { xValues[N - 1], 0.0, 0.0 } }, 3, ResultEncoding.RAW));
+        result.put("x_values", ResultEncoding.pack(new double[][] { xValues }, N, encoding));
+        result.put("y_values", ResultEncoding.pack(yColumns, N, encoding));
+        return result;
+    }
+
+    private static double[] unpack(Map<String, Object> selected, String column) {
+        return ResultEncoding.unpack((byte[]) selected.get(column), (String) selected.get("encoding"));
+    }
+
+    private static int indexOf(double x) {
+        return (int) Math.round(x / 0.01);
+    }
+
+    @Test
+    void returnsJsonResultsUnchanged() {
+        Map<String, Object> result = new HashMap<>();
+        result.put("data", "{}");
+
+        assertSame(result, ResultSelection.select(result, 10, true));
+        assertSame(result, ResultSelection.select(result, null, false));
+    }
+
+    @Test
+    void leavesTrajectoryOutForSolutionOnly() {
+        Map<String, Object> result = result(ResultEncoding.RAW);
+
+        Map<String, Object> selected = ResultSelection.select(result, null, false);
+
+        assertEquals(0, ((byte[]) selected.get("x_values")).length);
+        assertEquals(0, ((byte[]) selected.get("y_values")).length);
+        assertSame(result.get("solution"), selected.get("solution"));
+        // The stored result is not modified
+        assertEquals(N * Double.BYTES, ((byte[]) result.get("x_values")).length);
+    }
+
+    @Test
+    void keepsEveryPointWithoutOrAboveMaxPoints() {
+        Map<String, Object> result = result(ResultEncoding.DELTA_DEFLATE);
+
+        assertSame(result.get("x_values"), ResultSelection.select(result, null, true).get("x_values"));
+        assertSame(result.get("x_values"), ResultSelection.select(result, N, true).get("x_values"));
+    }
+
+    @Test
+    void decimatesToEnvelopeOfEveryComponent() {
+        for (String encoding : new String[] { ResultEncoding.RAW, ResultEncoding.DELTA_DEFLATE }) {
+            Map<String, Object> selected = ResultSelection.select(result(encoding), 100, true);
+
+            double[] x = unpack(selected, "x_values");
+            double[] y = unpack(selected, "y_values");
+            int n = x.length;
+
+            assertTrue(n <= 100, "kept " + n + " points");
+            assertEquals(2 * n, y.length);
+            assertEquals(xValues[0], x[0]);
+            assertEquals(xValues[N - 1], x[n - 1]);
+
+            double min0 = Double.POSITIVE_INFINITY;
+            double max0 = Double.NEGATIVE_INFINITY;
+            double min1 = Double.POSITIVE_INFINITY;
+            for (int i = 0; i < n; i++) {
+                int index = indexOf(x[i]);
+                assertEquals(xValues[index], x[i]);
+                assertEquals(yColumns[0][index], y[i]);
+                assertEquals(yColumns[1][index], y[n + i]);
+                if (i > 0) {
+                    assertTrue(x[i] > x[i - 1]);
+                }
+                min0 = Math.min(min0, y[i]);
+                max0 = Math.max(max0, y[i]);
+                min1 = Math.min(min1, y[n + i]);
+            }
+
+            assertEquals(10.0, max0);
+            assertEquals(-10.0, min1);
+            assertTrue(min0 < -0.99);
+        }
+    }
+
+    @Test
+    void takesEvenlySpacedPointsWhenTooFewForEnvelope() {
+        Map<String, Object> selected = ResultSelection.select(result(ResultEncoding.RAW), 4, true);
+
+        double[] x = unpack(selected, "x_values");
+
+        assertArrayEquals(new double[] { xValues[0], xValues[333], xValues[666], xValues[999] }, x);
+    }
+}
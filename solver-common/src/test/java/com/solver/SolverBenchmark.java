@@ -0,0 +1,369 @@
+package com.solver;
+
+import com.sun.management.ThreadMXBean;
+import net.objecthunter.exp4j.Expression;
+import net.objecthunter.exp4j.ExpressionBuilder;
+
+import java.lang.management.ManagementFactory;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.function.BiFunction;
+
+/**
+ * Steps per second and bytes allocated per step of the fixed-step solve loop.
+ * The previous implementations, an exp4j equation parsed on every evaluation
+ * or bound by name, and steppers allocating their stages and result,
+ * are kept here as baselines for the index-bound equation and the in-place steppers.
+ * The same equation is also solved as a plain lambda to isolate the steppers.
+ *
+ * Run with: gradle benchmark --args="[method ...]"
+ */
+public class SolverBenchmark {
+    private static final String EQUATION = "sin(x) - 0.1*y[1] - y[0]";
+    private static final int ORDER = 2;
+    private static final double[] INITIAL_Y = { 1.0, 0.0 };
+    private static final double STEP_SIZE = 0.001;
+    private static final double REACH_POINT = 100.0;
+
+    private static final int WARMUP_ROUNDS = 3;
+    private static final int ROUNDS = 5;
+
+    private static final ThreadMXBean threads = (ThreadMXBean) ManagementFactory.getThreadMXBean();
+
+    private static final EquationFunction LAMBDA = (x, y, dydt) -> {
+        dydt[0] = y[1];
+        dydt[1] = Math.sin(x) - 0.1 * y[1] - y[0];
+    };
+
+    private interface AllocatingStepper {
+        double[] step(BiFunction<Double, double[], double[]> f, double x_0, double[] y_0, double h);
+    }
+
+    private interface Solve {
+        double[] run();
+    }
+
+    public static void main(String[] args) {
+        List<String> methods = args.length > 0
+                ? Arrays.asList(args)
+                : List.of("euler", "midpoint", "heun", "rungeKutta", "dormandPrince");
+        boolean exp4j = isAvailable("net.objecthunter.exp4j.ExpressionBuilder");
+        long steps = Math.round((REACH_POINT - 0.0) / STEP_SIZE);
+
+        System.out.printf("order %d, %d steps per solve, best of %d rounds%n", ORDER, steps, ROUNDS);
+        if (!exp4j) {
+            System.out.println("exp4j is not on the classpath, the exp4j baselines are skipped");
+        }
+        System.out.printf("%-14s %-10s %-12s %14s %14s%n", "method", "equation", "steppers", "steps/s", "bytes/step");
+
+        for (String method : methods) {
+            NumericalMethods.Stepper stepper = NumericalMethods.stepper(method);
+            AllocatingStepper allocatingStepper = allocatingStepper(method);
+            BiFunction<Double, double[], double[]> lambda = allocating(LAMBDA);
+
+            double[] expected = solveInPlace(LAMBDA, stepper);
+            if (exp4j) {
+                report(method, "per call", "allocating",
+                        () -> solveAllocating(parsedPerCall(EQUATION, ORDER), allocatingStepper), steps, expected);
+                report(method, "exp4j", "in place",
+                        () -> solveInPlace(boundByName(EQUATION, ORDER), stepper), steps, expected);
+            }
+            report(method, "by name", "in place",
+                    () -> solveInPlace(mapBound(EQUATION, ORDER), stepper), steps, expected);
+            report(method, "indexed", "allocating",
+                    () -> solveAllocating(CreateEquationFunction.create(EQUATION, ORDER), allocatingStepper),
+                    steps, expected);
+            report(method, "indexed", "in place",
+                    () -> solveInPlace(CreateEquationFunction.createInPlace(EQUATION, ORDER), stepper),
+                    steps, expected);
+            report(method, "lambda", "allocating", () -> solveAllocating(lambda, allocatingStepper), steps, expected);
+            report(method, "lambda", "in place", () -> solveInPlace(LAMBDA, stepper), steps, expected);
+        }
+    }
+
+    private static void report(String method, String equation, String steppers, Solve solve,
+                               long steps, double[] expected) {
+        for (int i = 0; i < WARMUP_ROUNDS; i++) {
+            solve.run();
+        }
+
+        long best = Long.MAX_VALUE;
+        long allocated = 0;
+        double[] solution = null;
+        for (int i = 0; i < ROUNDS; i++) {
+            long allocatedBefore = threads.getCurrentThreadAllocatedBytes();
+            long start = System.nanoTime();
+            solution = solve.run();
+            best = Math.min(best, System.nanoTime() - start);
+            allocated = threads.getCurrentThreadAllocatedBytes() - allocatedBefore;
+        }
+
+        // Both evaluators compute sin and the products in the same order as the lambda
+        String match = Arrays.equals(solution, expected) ? "" : "  differs: " + Arrays.toString(solution);
+        System.out.printf("%-14s %-10s %-12s %14.0f %14.1f%s%n", method, equation, steppers,
+                steps / (best / 1e9), allocated / (double) steps, match);
+    }
+
+    private static double[] solveInPlace(EquationFunction f, NumericalMethods.Stepper stepper) {
+        double x = 0.0;
+        double[] y = INITIAL_Y.clone();
+        double h = STEP_SIZE;
+
+        int expectedSteps = (int) Math.ceil((REACH_POINT - x) / h) + 1;
+        TrajectoryBuffer trajectory = new TrajectoryBuffer(y.length, expectedSteps);
+        NumericalMethods.Workspace workspace = new NumericalMethods.Workspace(y.length);
+
+        while (x < REACH_POINT - 1e-10) {
+            x = stepper.step(f, x, y, h, workspace);
+            trajectory.add(x, y);
+        }
+        return concat(x, y);
+    }
+
+    /**
+     * The solve loop before the in-place steppers,
+     * which copied every step result out and kept the points as boxed rows.
+     */
+    private static double[] solveAllocating(BiFunction<Double, double[], double[]> f, AllocatingStepper stepper) {
+        List<Double> xValues = new ArrayList<>();
+        List<double[]> yValues = new ArrayList<>();
+
+        double x = 0.0;
+        double[] y = INITIAL_Y.clone();
+
+        while (x < REACH_POINT - 1e-10) {
+            double[] result = stepper.step(f, x, y, STEP_SIZE);
+
+            x = result[0];
+            y = new double[result.length - 1];
+            System.arraycopy(result, 1, y, 0, result.length - 1);
+
+            xValues.add(x);
+            yValues.add(y.clone());
+        }
+        return concat(x, y);
+    }
+
+    private static BiFunction<Double, double[], double[]> allocating(EquationFunction f) {
+        return (x, y) -> {
+            double[] dydt = new double[y.length];
+            f.apply(x, y, dydt);
+            return dydt;
+        };
+    }
+
+    /**
+     * The equation function before it was compiled once per solve.
+     */
+    private static BiFunction<Double, double[], double[]> parsedPerCall(String equation, int order) {
+        return (x, y) -> {
+            double[] dydt = new double[order];
+            System.arraycopy(y, 1, dydt, 0, order - 1);
+
+            String expression = equation.replaceAll("y\\[(\\d+)]", "y$1");
+            ExpressionBuilder builder = new ExpressionBuilder(expression).variable("x");
+            for (int i = 0; i < y.length; i++) {
+                builder.variable("y" + i);
+            }
+            Expression compiled = builder.build();
+
+            Map<String, Double> variables = new HashMap<>();
+            variables.put("x", x);
+            for (int i = 0; i < y.length; i++) {
+                variables.put("y" + i, y[i]);
+            }
+            compiled.setVariables(variables);
+
+            dydt[order - 1] = compiled.evaluate();
+            return dydt;
+        };
+    }
+
+    /**
+     * The equation function before the variables were bound by index,
+     * an exp4j expression built once with every variable set by name on each evaluation.
+     */
+    private static EquationFunction boundByName(String equation, int order) {
+        String[] names = new String[order];
+        for (int i = 0; i < order; i++) {
+            names[i] = "y" + i;
+        }
+        Expression expression = new ExpressionBuilder(equation.replaceAll("y\\[(\\d+)]", "y$1"))
+                .variable("x")
+                .variables(names)
+                .build();
+
+        return (x, y, dydt) -> {
+            System.arraycopy(y, 1, dydt, 0, order - 1);
+
+            expression.setVariable("x", x);
+            for (int i = 0; i < order; i++) {
+                expression.setVariable(names[i], y[i]);
+            }
+            dydt[order - 1] = expression.evaluate();
+        };
+    }
+
+    /**
+     * The index-bound expression behind the same binding by name as exp4j:
+     * every variable is boxed into a map and read back from it on each evaluation,
+     * so the difference to the indexed rows is the cost of the binding alone.
+     */
+    private static EquationFunction mapBound(String equation, int order) {
+        String[] names = new String[order];
+        for (int i = 0; i < order; i++) {
+            names[i] = "y" + i;
+        }
+        CompiledEquation expression = CompiledEquation.compile(equation.replaceAll("y\\[(\\d+)]", "y$1"), order);
+        Map<String, Double> variables = new HashMap<>();
+        double[] values = new double[order];
+
+        return (x, y, dydt) -> {
+            System.arraycopy(y, 1, dydt, 0, order - 1);
+
+            variables.put("x", x);
+            for (int i = 0; i < order; i++) {
+                variables.put(names[i], y[i]);
+            }
+            for (int i = 0; i < order; i++) {
+                values[i] = variables.get(names[i]);
+            }
+            dydt[order - 1] = expression.evaluate(variables.get("x"), values);
+        };
+    }
+
+    private static AllocatingStepper allocatingStepper(String method) {
+        return switch (method) {
+            case "euler" -> SolverBenchmark::euler;
+            case "midpoint" -> SolverBenchmark::midpoint;
+            case "heun" -> SolverBenchmark::heun;
+            case "rungeKutta" -> SolverBenchmark::rungeKutta;
+            case "dormandPrince" -> SolverBenchmark::dormandPrince;
+            default -> throw new IllegalArgumentException("Invalid method value: " + method);
+        };
+    }
+
+    // The steppers before the workspace, which built new arrays for every stage
+
+    private static double[] dormandPrince(BiFunction<Double, double[], double[]> f, double x_0, double[] y_0,
+                                          double h) {
+        double[] k1 = multiply(h, f.apply(x_0, y_0));
+        double[] temp = add(y_0, multiply(1.0 / 5.0, k1));
+        double[] k2 = multiply(h, f.apply(x_0 + h / 5.0, temp));
+        temp = add(y_0, add(multiply(3.0 / 40.0, k1), multiply(9.0 / 40.0, k2)));
+        double[] k3 = multiply(h, f.apply(x_0 + h * 3.0 / 10.0, temp));
+        temp = add(y_0, add(add(multiply(44.0 / 45.0, k1), multiply(-56.0 / 15.0, k2)),
+                multiply(32.0 / 9.0, k3)));
+        double[] k4 = multiply(h, f.apply(x_0 + h * 4.0 / 5.0, temp));
+        temp = add(y_0, add(add(multiply(19372.0 / 6561.0, k1),
+                        add(multiply(-25360.0 / 2187.0, k2), multiply(64448.0 / 6561.0, k3))),
+                multiply(-212.0 / 729.0, k4)));
+        double[] k5 = multiply(h, f.apply(x_0 + h * 8.0 / 9.0, temp));
+        temp = add(y_0, add(add(multiply(9017.0 / 3168.0, k1),
+                        add(multiply(-355.0 / 33.0, k2),
+                                add(multiply(46732.0 / 5247.0, k3), multiply(49.0 / 176.0, k4)))),
+                multiply(-5103.0 / 18656.0, k5)));
+        double[] k6 = multiply(h, f.apply(x_0 + h, temp));
+
+        double[] y_next = new double[y_0.length];
+        for (int i = 0; i < y_0.length; i++) {
+            y_next[i] = y_0[i] + (35.0 / 384.0 * k1[i] + 500.0 / 1113.0 * k3[i]
+                        + 125.0 / 192.0 * k4[i] - 2187.0 / 6784.0 * k5[i]
+                        + 11.0 / 84.0 * k6[i]);
+        }
+        return concat(x_0 + h, y_next);
+    }
+
+    private static double[] rungeKutta(BiFunction<Double, double[], double[]> f, double x_0, double[] y_0,
+                                       double h) {
+        double[] k1 = multiply(h, f.apply(x_0, y_0));
+        double[] temp = add(y_0, multiply(0.5, k1));
+        double[] k2 = multiply(h, f.apply(x_0 + h / 2, temp));
+        temp = add(y_0, multiply(0.5, k2));
+        double[] k3 = multiply(h, f.apply(x_0 + h / 2, temp));
+        temp = add(y_0, k3);
+        double[] k4 = multiply(h, f.apply(x_0 + h, temp));
+
+        double[] y_next = new double[y_0.length];
+        for (int i = 0; i < y_0.length; i++) {
+            y_next[i] = y_0[i] + (k1[i] + 2 * k2[i] + 2 * k3[i] + k4[i]) / 6;
+        }
+        return concat(x_0 + h, y_next);
+    }
+
+    private static double[] heun(BiFunction<Double, double[], double[]> f, double x_0, double[] y_0, double h) {
+        double[] k1 = f.apply(x_0, y_0);
+        double[] temp = new double[y_0.length];
+        for (int i = 0; i < y_0.length; i++) {
+            temp[i] = y_0[i] + h * k1[i];
+        }
+        double[] k2 = f.apply(x_0 + h, temp);
+
+        double[] y_next = new double[y_0.length];
+        for (int i = 0; i < y_0.length; i++) {
+            y_next[i] = y_0[i] + (h / 2) * (k1[i] + k2[i]);
+        }
+        return concat(x_0 + h, y_next);
+    }
+
+    private static double[] midpoint(BiFunction<Double, double[], double[]> f, double x_0, double[] y_0,
+                                     double h) {
+        double[] k1 = f.apply(x_0, y_0);
+        double[] temp = new double[y_0.length];
+        for (int i = 0; i < y_0.length; i++) {
+            temp[i] = y_0[i] + (h / 2) * k1[i];
+        }
+        double[] k2 = f.apply(x_0 + h / 2, temp);
+
+        double[] y_next = new double[y_0.length];
+        for (int i = 0; i < y_0.length; i++) {
+            y_next[i] = y_0[i] + h * k2[i];
+        }
+        return concat(x_0 + h, y_next);
+    }
+
+    private static double[] euler(BiFunction<Double, double[], double[]> f, double x_0, double[] y_0, double h) {
+        double[] k1 = f.apply(x_0, y_0);
+
+        double[] y_next = new double[y_0.length];
+        for (int i = 0; i < y_0.length; i++) {
+            y_next[i] = y_0[i] + h * k1[i];
+        }
+        return concat(x_0 + h, y_next);
+    }
+
+    private static double[] multiply(double scalar, double[] array) {
+        double[] result = new double[array.length];
+        for (int i = 0; i < array.length; i++) {
+            result[i] = scalar * array[i];
+        }
+        return result;
+    }
+
+    private static double[] add(double[] array1, double[] array2) {
+        double[] result = new double[array1.length];
+        for (int i = 0; i < array1.length; i++) {
+            result[i] = array1[i] + array2[i];
+        }
+        return result;
+    }
+
+    private static double[] concat(double x, double[] y) {
+        double[] result = new double[y.length + 1];
+        result[0] = x;
+        System.arraycopy(y, 0, result, 1, y.length);
+        return result;
+    }
+
+    private static boolean isAvailable(String className) {
+        try {
+            Class.forName(className, false, SolverBenchmark.class.getClassLoader());
+            return true;
+        } catch (ClassNotFoundException e) {
+            return false;
+        }
+    }
+}